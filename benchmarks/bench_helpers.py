@@ -0,0 +1,249 @@
+"""Micro-benchmarks of the espo_helpers primitives on the tool hot path.
+
+Times `snake_to_camel`, `build_espo_params`, `http_build_query`,
+`EspoAPI.normalize_url` and `EspoAPI.call_api` with representative inputs:
+a create payload with every Lead argument set, deep `where_group` trees and
+`in` filters of 1000 values. `call_api` is fed canned responses by an
+in-memory session, so it measures the header, span, metrics and result dict
+work around a request and not the network.
+
+Each run can be appended to a JSON lines history, with the git commit it
+was taken at, to follow the numbers across hot path refactors.
+
+Usage (from the app folder):
+    python benchmarks/bench_helpers.py
+    python benchmarks/bench_helpers.py --record
+    python benchmarks/bench_helpers.py --show-history --last 10
+
+Without a path the history is benchmarks/history/bench_helpers.jsonl.
+"""
+
+import argparse
+import inspect
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import requests
+from core.utils.logger import logger
+from app.utils.espo_helpers import (
+    EspoAPI,
+    build_espo_params,
+    http_build_query,
+    snake_to_camel,
+)
+from app.tools.create_lead import create_lead_tool
+
+HISTORY = os.path.join(os.path.dirname(__file__), "history", "bench_helpers.jsonl")
+
+
+def wide_create_arguments():
+    """locals() of create_lead_tool with every argument set."""
+    arguments = {}
+    for name in inspect.signature(create_lead_tool).parameters:
+        arguments[name] = f"value of {name}"
+    arguments["opportunity_amount"] = 12000.0
+    arguments["skip_duplicate_check"] = True
+    arguments["custom_fields"] = {f"cField{i}": f"custom {i}" for i in range(50)}
+    return arguments
+
+
+def where_tree(depth: int, fanout: int):
+    """An and/or tree of `depth` levels with `fanout` children per node."""
+    if depth == 0:
+        return {"type": "contains", "attribute": "emailAddress", "value": "@acme"}
+    return {
+        "type": "or" if depth % 2 else "and",
+        "value": [where_tree(depth - 1, fanout) for _ in range(fanout)],
+    }
+
+
+def list_params(where):
+    return {
+        "maxSize": 50,
+        "offset": 100,
+        "orderBy": "createdAt",
+        "order": "desc",
+        "select": "id,name,status,emailAddress,createdAt",
+        "whereGroup": where,
+    }
+
+
+IN_LIST = [f"64f0c1a2b3c4d5e6f{i:06d}" for i in range(1000)]
+
+ARGUMENTS = wide_create_arguments()
+NAMES = list(ARGUMENTS)
+LIST_PARAMS = list_params([])
+WHERE_DEPTH_4 = list_params([where_tree(4, 3)])
+WHERE_DEPTH_8 = list_params([where_tree(8, 2)])
+WHERE_IN = list_params([{"type": "in", "attribute": "id", "value": IN_LIST}])
+
+
+class CannedSession:
+    """Stands in for a tenant requests.Session and returns a stored response."""
+
+    def __init__(self, status: int, body):
+        self.status = status
+        self.content = json.dumps(body).encode()
+
+    def request(self, method, url, **kwargs):
+        response = requests.Response()
+        response.status_code = self.status
+        response._content = self.content
+        response.headers["Content-Type"] = "application/json"
+        response.url = url
+        return response
+
+
+RECORD = {
+    "id": "64f0c1a2b3c4d5e6f",
+    "name": "Acme Corporation",
+    "status": "New",
+    "emailAddress": "info@acme.example.com",
+    "description": "Long-standing customer. " * 20,
+    "createdAt": "2026-10-01 09:30:00",
+}
+
+client = EspoAPI("https://crm.example.com/api/v1", "api-key")
+get_client = EspoAPI(
+    "https://crm.example.com/api/v1", "api-key", session=CannedSession(200, RECORD)
+)
+list_client = EspoAPI(
+    "https://crm.example.com/api/v1",
+    "api-key",
+    session=CannedSession(200, {"total": 50, "list": [RECORD] * 50}),
+)
+error_client = EspoAPI(
+    "https://crm.example.com/api/v1", "api-key", session=CannedSession(404, "")
+)
+
+# name -> (size of the input, fn)
+CASES = {
+    "snake_to_camel": (
+        len(NAMES),
+        lambda: [snake_to_camel(name) for name in NAMES],
+    ),
+    "build_espo_params.wide_create": (
+        len(ARGUMENTS),
+        lambda: build_espo_params(ARGUMENTS),
+    ),
+    "http_build_query.list": (
+        6,
+        lambda: http_build_query(LIST_PARAMS),
+    ),
+    "http_build_query.where_depth_4": (
+        3**4,
+        lambda: http_build_query(WHERE_DEPTH_4),
+    ),
+    "http_build_query.where_depth_8": (
+        2**8,
+        lambda: http_build_query(WHERE_DEPTH_8),
+    ),
+    "http_build_query.in_1000": (
+        len(IN_LIST),
+        lambda: http_build_query(WHERE_IN),
+    ),
+    "normalize_url.relative": (1, lambda: client.normalize_url("Lead/abc123")),
+    "normalize_url.absolute": (
+        1,
+        lambda: client.normalize_url("https://crm.example.com/api/v1/Lead"),
+    ),
+    "call_api.get": (1, lambda: get_client.call_api("GET", "Lead/abc123")),
+    "call_api.list_50": (
+        50,
+        lambda: list_client.call_api("GET", "Lead", params=LIST_PARAMS),
+    ),
+    "call_api.create_wide": (
+        len(ARGUMENTS),
+        lambda: get_client.call_api(
+            "POST", "Lead", params=build_espo_params(ARGUMENTS)
+        ),
+    ),
+    "call_api.error": (1, lambda: error_client.call_api("GET", "Lead/missing")),
+}
+
+
+def measure(fn, repeat: int, min_time: float) -> float:
+    """Return the best time of one call in microseconds."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    number = max(number, int(number * min_time / 0.2))
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number * 1e6
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def show_history(path: str, last: int):
+    with open(path) as f:
+        runs = [json.loads(line) for line in f if line.strip()][-last:]
+    if not runs:
+        return
+
+    print(f"{'case':<34}" + "".join(f"{run['commit'] or '?':>10}" for run in runs))
+    names = dict.fromkeys(name for run in runs for name in run["results"])
+    for name in names:
+        cells = [run["results"].get(name) for run in runs]
+        row = "".join(f"{c['us']:>10.2f}" if c else " " * 10 for c in cells)
+        print(f"{name:<34}{row}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="s per repeat")
+    parser.add_argument("--only", help="substring of the cases to run")
+    parser.add_argument("--record", nargs="?", const=HISTORY, metavar="PATH")
+    parser.add_argument("--show-history", nargs="?", const=HISTORY, metavar="PATH")
+    parser.add_argument("--last", type=int, default=8, help="runs shown")
+    args = parser.parse_args()
+
+    if args.show_history:
+        show_history(args.show_history, args.last)
+        return
+
+    # call_api.error would log a warning on every call
+    logger.setLevel("ERROR")
+
+    results = {}
+    print(f"{'case':<34} {'size':>6} {'us/call':>10}")
+    for name, (size, fn) in CASES.items():
+        if args.only and args.only not in name:
+            continue
+        us = measure(fn, args.repeat, args.min_time)
+        results[name] = {"size": size, "us": us}
+        print(f"{name:<34} {size:>6} {us:>10.2f}")
+
+    if args.record:
+        run = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(args.record)), exist_ok=True)
+        with open(args.record, "a") as f:
+            f.write(json.dumps(run, sort_keys=True) + "\n")
+        print(f"\nRun appended to {args.record}")
+
+
+if __name__ == "__main__":
+    main()
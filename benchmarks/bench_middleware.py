@@ -0,0 +1,79 @@
+"""Throughput of the authentication middleware under concurrent requests.
+
+Compares the pure ASGI AuthenticationMiddleware with an equivalent
+BaseHTTPMiddleware (the previous implementation) in front of a trivial
+endpoint, so the difference is the middleware overhead.
+
+Usage (from the app folder):
+    python benchmarks/bench_middleware.py
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import httpx
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from app.middleware.AuthenticationMiddleware import (
+    AuthenticationMiddleware,
+    get_tenant,
+    tenant_context,
+    tenant_from_headers,
+)
+
+
+class BaseHTTPAuthenticationMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        tenant_context.set(tenant_from_headers(request.scope["headers"]))
+        return await call_next(request)
+
+
+async def endpoint(request):
+    return PlainTextResponse(get_tenant().api_key)
+
+
+async def run(app, requests, concurrency):
+    transport = httpx.ASGITransport(app=app)
+    client = httpx.AsyncClient(transport=transport, base_url="http://bench")
+    async with client:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def send(i):
+            async with semaphore:
+                headers = {"X-API-KEY": f"key-{i}", "X-API-ADDRESS": "http://crm"}
+                response = await client.get("/", headers=headers)
+                assert response.text == f"key-{i}"
+
+        start = time.perf_counter()
+        await asyncio.gather(*(send(i) for i in range(requests)))
+        return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    routes = [Route("/", endpoint)]
+    apps = {
+        "BaseHTTPMiddleware": BaseHTTPAuthenticationMiddleware(
+            Starlette(routes=routes)
+        ),
+        "pure ASGI": AuthenticationMiddleware(Starlette(routes=routes)),
+    }
+
+    for name, app in apps.items():
+        rate = asyncio.run(run(app, args.requests, args.concurrency))
+        print(f"{name:<20} {rate:>10.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
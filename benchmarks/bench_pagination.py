@@ -0,0 +1,79 @@
+"""COUNT queries avoided when list tools page through a result set.
+
+Every list tool traverses the same number of records page by page against
+the EspoCRM stub. Only the first page asks EspoCRM for the total, later
+pages send `X-No-Total`; the stub counts the list requests that computed a
+total, so the report shows how many COUNT(*) queries the traversal saved.
+
+Usage (from the app folder):
+    python benchmarks/bench_pagination.py
+    python benchmarks/bench_pagination.py --records 5000 --page-size 200
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from app.tests.espo_stub import EspoStubServer
+from app.middleware.AuthenticationMiddleware import TenantContext, tenant_context
+from app.tools.list_accounts import list_accounts_tool
+from app.tools.list_calls import list_calls_tool
+from app.tools.list_campaigns import list_campaigns_tool
+from app.tools.list_contacts import list_contacts_tool
+from app.tools.list_emails import list_emails_tool
+from app.tools.list_leads import list_leads_tool
+from app.tools.list_target_lists import list_target_lists_tool
+
+LIST_TOOLS = {
+    "Account": list_accounts_tool,
+    "Call": list_calls_tool,
+    "Campaign": list_campaigns_tool,
+    "Contact": list_contacts_tool,
+    "Email": list_emails_tool,
+    "Lead": list_leads_tool,
+    "TargetList": list_target_lists_tool,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    pages = -(-args.records // args.page_size)
+    print(f"{'tool':<24} {'pages':>6} {'counts':>7} {'avoided':>8} {'ms':>8}")
+
+    with EspoStubServer() as server:
+        tenant_context.set(
+            TenantContext(
+                is_authenticated=True, api_key=server.api_key, api_address=server.url
+            )
+        )
+        for entity_type, list_tool in LIST_TOOLS.items():
+            server.seed(
+                entity_type,
+                [{"name": f"{entity_type} {i}"} for i in range(args.records)],
+            )
+            server.count_queries = 0
+
+            started = time.perf_counter()
+            for page in range(pages):
+                offset = page * args.page_size
+                result = asyncio.run(list_tool(max_size=args.page_size, offset=offset))
+                assert result["ok"], result
+            elapsed = time.perf_counter() - started
+
+            counts = server.count_queries
+            print(
+                f"{list_tool.__name__:<24} {pages:>6} {counts:>7} "
+                f"{pages - counts:>8} {elapsed * 1000:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
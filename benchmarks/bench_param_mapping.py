@@ -0,0 +1,120 @@
+"""Micro-benchmark of tool argument mapping.
+
+Compares the compiled ParamMapper used by the entity engine with the
+`build_espo_params(locals())` path the tools used before, including the
+header and raw attribute handling that had to be done by hand around it.
+
+Usage (from the app folder):
+    python benchmarks/bench_param_mapping.py
+"""
+
+import argparse
+import inspect
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from app.utils.espo_helpers import build_espo_params
+from app.utils.entity_engine import CREATE_HEADER_PARAMS, map_arguments
+from app.tools.create_lead import create_lead_tool
+from app.tools.list_leads import list_leads_tool
+from app.tools.update_lead import update_lead_tool
+
+
+def legacy_create(arguments):
+    arguments = dict(arguments)
+    headers = {}
+    for key, header in CREATE_HEADER_PARAMS.items():
+        value = arguments.pop(key, None)
+        if value is None or value == "":
+            continue
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        headers[header] = str(value)
+    custom_fields = arguments.pop("custom_fields", None)
+    params = build_espo_params(arguments)
+    if custom_fields:
+        params.update(custom_fields)
+    return params, headers
+
+
+def legacy_update(arguments):
+    arguments = dict(arguments)
+    arguments.pop("lead_id")
+    custom_fields = arguments.pop("custom_fields", None)
+    params = build_espo_params(arguments)
+    if custom_fields:
+        params.update(custom_fields)
+    return params
+
+
+def legacy_list(arguments):
+    return build_espo_params(
+        arguments,
+        exclude={"projection", "format", "max_bytes", "max_tokens", "no_total"},
+    )
+
+
+def call_arguments(fn, **values):
+    """Return the locals() a tool would pass when called with `values`."""
+    arguments = {name: None for name in inspect.signature(fn).parameters}
+    arguments.update(values)
+    return arguments
+
+
+CASES = {
+    "create": (
+        call_arguments(
+            create_lead_tool,
+            first_name="John",
+            last_name="Doe",
+            email_address="john@example.com",
+            skip_duplicate_check=True,
+            custom_fields={"cSource": "mcp"},
+        ),
+        legacy_create,
+        lambda arguments: map_arguments("create", arguments),
+    ),
+    "update": (
+        call_arguments(update_lead_tool, lead_id="abc123", status="In Process"),
+        legacy_update,
+        lambda arguments: map_arguments("update", arguments, "lead_id"),
+    ),
+    "list": (
+        call_arguments(list_leads_tool, max_size=20, offset=40, order_by="createdAt"),
+        legacy_list,
+        lambda arguments: map_arguments("list", arguments),
+    ),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'case':<8} {'args':>5} {'legacy [us]':>12} {'mapper [us]':>12} "
+        f"{'speedup':>8}"
+    )
+    for name, (arguments, legacy, compiled) in CASES.items():
+        timings = []
+        for fn in (legacy, compiled):
+            best = min(
+                timeit.repeat(
+                    lambda: fn(arguments), number=args.number, repeat=args.repeat
+                )
+            )
+            timings.append(best / args.number * 1e6)
+
+        print(
+            f"{name:<8} {len(arguments):>5} {timings[0]:>12.2f} {timings[1]:>12.2f} "
+            f"{timings[0] / timings[1]:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Startup import cost of every tool module.
+
+Each module is imported in a fresh interpreter with `python -X importtime`.
+The framework modules every tool shares (pydantic, core.utils.tools) are
+imported first, so the reported cost is what the module itself adds to the
+server startup. The `engine` column shows whether the entity engine (and
+with it requests and the configs) was imported, which should never happen
+before the first tool call.
+
+Usage (from the app folder):
+    python benchmarks/bench_tool_imports.py
+    python benchmarks/bench_tool_imports.py --json import_times.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+ROOT_DIR = os.path.dirname(APP_DIR)
+
+PRELOAD = "import typing, pydantic, core.utils.tools"
+
+
+def tool_modules():
+    tools_dir = os.path.join(APP_DIR, "tools")
+    return sorted(
+        f"app.tools.{name[:-3]}"
+        for name in os.listdir(tools_dir)
+        if name.endswith(".py") and not name.startswith("_")
+    )
+
+
+def measure(module: str, repeat: int = 3) -> dict:
+    code = (
+        f"{PRELOAD}\n"
+        "import sys\n"
+        f"import {module}\n"
+        "print('app.utils.entity_engine' in sys.modules)\n"
+    )
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT_DIR, env.get("PYTHONPATH")]))
+
+    best = None
+    engine_loaded = None
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+            cwd=ROOT_DIR,
+            env=env,
+            check=True,
+        )
+        engine_loaded = proc.stdout.strip() == "True"
+
+        # Lines look like: "import time:   self [us] | cumulative | name"
+        for line in proc.stderr.splitlines():
+            parts = line.split("|")
+            if len(parts) == 3 and parts[2].strip() == module:
+                cumulative = int(parts[1])
+                best = cumulative if best is None else min(best, cumulative)
+
+    return {"module": module, "cumulative_us": best, "engine_loaded": engine_loaded}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    results = [measure(module, args.repeat) for module in tool_modules()]
+
+    print(f"{'module':<40} {'import [us]':>12} {'engine':>8}")
+    for result in results:
+        print(
+            f"{result['module']:<40} {result['cumulative_us']:>12} "
+            f"{'yes' if result['engine_loaded'] else 'no':>8}"
+        )
+    total = sum(result["cumulative_us"] for result in results)
+    # Upper bound: imports shared between tool modules are counted for each one
+    print(f"{'total':<40} {total:>12}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,421 @@
+"""End-to-end latency, throughput and allocations of the entity tools.
+
+Every tool, from create_account_tool to list_emails_tool, runs its full
+path (engine, tool pool, pooled tenant session, HTTP) against the EspoCRM
+stub from tests/espo_stub.py. The stub runs in a child process so only the
+server's own work is measured. Records are wide and realistic (addresses,
+long descriptions, 4 KB HTML email bodies).
+
+Reports per tool latency percentiles and peak allocations per call, and
+throughput of a read/write mix at several concurrency levels. Results can
+be stored as a baseline and later runs compared against it; the comparison
+exits with status 1 when a metric regresses by more than the threshold.
+
+Usage (from the app folder):
+    python benchmarks/bench_tools.py
+    python benchmarks/bench_tools.py --save-baseline
+    python benchmarks/bench_tools.py --compare
+    python benchmarks/bench_tools.py --compare other.json --threshold 0.1
+
+Without a path the baseline is benchmarks/baselines/bench_tools.json.
+"""
+
+import argparse
+import asyncio
+import importlib
+import inspect
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from app.tests.espo_stub import EspoStubProcess
+from app.utils.espo_helpers import EspoAPI, snake_to_camel
+from app.middleware.AuthenticationMiddleware import TenantContext, tenant_context
+
+# (entity type, tool name of one record, tool name of the list)
+ENTITIES = (
+    ("Account", "account", "accounts"),
+    ("Call", "call", "calls"),
+    ("Campaign", "campaign", "campaigns"),
+    ("Contact", "contact", "contacts"),
+    ("Email", "email", "emails"),
+    ("Lead", "lead", "leads"),
+    ("TargetList", "target_list", "target_lists"),
+)
+CUSTOM_ENTITY = "CProject"
+BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "bench_tools.json")
+
+DESCRIPTION = (
+    "Long-standing customer in the advertising sector with several open "
+    "opportunities. Prefers contact by email, quarterly review meetings, "
+    "invoices sent to the finance department. "
+) * 4
+EMAIL_BODY = (
+    "<p>Hello,</p><p>please find the proposal for the next quarter below. "
+    "The figures include the discount agreed during our last call.</p>"
+    "<table><tr><td>Item</td><td>Amount</td></tr></table>"
+) * 16
+
+# Tool arguments filled in when the tool has them
+FIELD_VALUES = {
+    "name": "Acme Corporation",
+    "first_name": "Ada",
+    "last_name": "Lovelace",
+    "salutation_name": "Ms.",
+    "title": "Head of Operations",
+    "website": "https://www.acme.example.com",
+    "description": DESCRIPTION,
+    "email_address": "ada.lovelace@acme.example.com",
+    "phone_number": "+1 555 0100 200",
+    "type": "Customer",
+    "industry": "Advertising",
+    "status": "New",
+    "source": "Web Site",
+    "sic_code": "7311",
+    "billing_address_street": "42 Market Street, Suite 1200",
+    "billing_address_city": "San Francisco",
+    "billing_address_state": "CA",
+    "billing_address_country": "United States",
+    "billing_address_postal_code": "94105",
+    "shipping_address_street": "42 Market Street, Suite 1200",
+    "shipping_address_city": "San Francisco",
+    "shipping_address_country": "United States",
+    "address_street": "7 Harbour Road",
+    "address_city": "Boston",
+    "address_country": "United States",
+    "address_postal_code": "02110",
+    "date_start": "2026-11-29 12:30:00",
+    "date_end": "2026-11-29 13:00:00",
+    "direction": "Outbound",
+    "start_date": "2026-11-01",
+    "end_date": "2026-12-31",
+    "budget": 25000,
+    "opportunity_amount": 12000,
+    "subject": "Proposal for Q1",
+    "body": EMAIL_BODY,
+    "is_html": True,
+    "from_": "John Doe <john@example.com>",
+    "to": "ada.lovelace@acme.example.com",
+    "account_name": "Acme Corporation",
+}
+
+
+def load_tool(name: str):
+    module = importlib.import_module(f"app.tools.{name}")
+    return getattr(module, f"{name}_tool")
+
+
+def tool_arguments(tool) -> dict:
+    names = inspect.signature(tool).parameters
+    arguments = {name: value for name, value in FIELD_VALUES.items() if name in names}
+    if "skip_duplicate_check" in names:
+        arguments["skip_duplicate_check"] = True
+    return arguments
+
+
+def record_from_arguments(arguments: dict, index: int) -> dict:
+    record = {
+        snake_to_camel(name.rstrip("_")): value
+        for name, value in arguments.items()
+        if name != "skip_duplicate_check"
+    }
+    if "name" in record:
+        record["name"] = f"{record['name']} {index}"
+    return record
+
+
+class Bench:
+    """Seeds the stub and builds the benchmark cases.
+
+    Each case is `(name, fn)` where `fn(i)` returns the coroutine of one tool
+    call; delete cases use records seeded for them, one per call.
+    """
+
+    def __init__(self, stub: EspoStubProcess, records: int, deletes: int):
+        self.stub = stub
+        self.client = EspoAPI(stub.url, stub.api_key)
+        self.records = records
+        self.deletes = deletes
+        self.ids = {}
+        self.delete_ids = {}
+
+    def seed(self, entity_type: str, record: dict, count: int):
+        ids = []
+        for index in range(count):
+            result = self.client.call_api(
+                "POST",
+                entity_type,
+                params=record_from_arguments(record, index),
+                extra_headers={"X-Skip-Duplicate-Check": "true"},
+            )
+            assert result["ok"], result
+            ids.append(result["data"]["id"])
+        return ids
+
+    def cases(self):
+        cases = []
+        for entity_type, one, many in ENTITIES:
+            create = load_tool(f"create_{one}")
+            arguments = tool_arguments(create)
+            self.ids[entity_type] = self.seed(entity_type, arguments, self.records)
+            self.delete_ids[entity_type] = self.seed(
+                entity_type, arguments, self.deletes
+            )
+            cases += self.entity_cases(entity_type, one, many, create, arguments)
+
+        list_users = load_tool("list_users")
+        get_user = load_tool("get_user")
+        cases.append(("list_users_tool", lambda i: list_users(max_size=20)))
+        cases.append(("get_user_tool", lambda i: get_user(user_id="1")))
+
+        ids = self.seed(CUSTOM_ENTITY, {"name": "Migration"}, self.records)
+        list_records = load_tool("list_records")
+        get_record = load_tool("get_record")
+        cases.append(
+            (
+                "list_records_tool",
+                lambda i: list_records(entity_type=CUSTOM_ENTITY, max_size=50),
+            )
+        )
+        cases.append(
+            (
+                "get_record_tool",
+                lambda i: get_record(
+                    entity_type=CUSTOM_ENTITY, record_id=ids[i % len(ids)]
+                ),
+            )
+        )
+        return cases
+
+    def entity_cases(self, entity_type, one, many, create, arguments):
+        ids = self.ids[entity_type]
+        delete_ids = self.delete_ids[entity_type]
+        id_param = f"{one}_id"
+        get = load_tool(f"get_{one}")
+        update = load_tool(f"update_{one}")
+        delete = load_tool(f"delete_{one}")
+        list_tool = load_tool(f"list_{many}")
+        # Emails have no description, every entity has a name
+        field = "description" if "description" in tool_arguments(update) else "name"
+
+        return [
+            (f"create_{one}_tool", lambda i: create(**arguments)),
+            (f"get_{one}_tool", lambda i: get(**{id_param: ids[i % len(ids)]})),
+            (
+                f"update_{one}_tool",
+                lambda i: update(**{id_param: ids[i % len(ids)], field: f"Update {i}"}),
+            ),
+            (f"list_{many}_tool", lambda i: list_tool(max_size=50)),
+            (
+                f"delete_{one}_tool",
+                lambda i: delete(**{id_param: delete_ids.pop()}),
+            ),
+        ]
+
+
+def percentile(values, share: float) -> float:
+    ordered = sorted(values)
+    index = min(int(round(share * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def check(result):
+    if not isinstance(result, dict) or not result.get("ok"):
+        raise RuntimeError(f"Tool call failed: {result}")
+
+
+async def measure_latency(fn, iterations: int, offset: int) -> dict:
+    samples = []
+    for i in range(offset, offset + iterations):
+        started = time.perf_counter()
+        result = await fn(i)
+        samples.append(time.perf_counter() - started)
+        check(result)
+
+    return {
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p90_ms": percentile(samples, 0.90) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "mean_ms": statistics.fmean(samples) * 1000,
+    }
+
+
+async def measure_allocations(fn, iterations: int, offset: int) -> float:
+    """Return the mean peak of memory allocated during one call, in KiB."""
+    peaks = []
+    tracemalloc.start()
+    try:
+        for i in range(offset, offset + iterations):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            check(await fn(i))
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+    finally:
+        tracemalloc.stop()
+    return statistics.fmean(peaks) / 1024
+
+
+async def measure_throughput(cases, concurrency: int, duration: float) -> dict:
+    """Run the cases round-robin from `concurrency` tasks for `duration` s.
+
+    The tasks share one event loop, like the sessions of the MCP server.
+    """
+    counter = itertools.count()
+    samples = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            i = next(counter)
+            _, fn = cases[i % len(cases)]
+            started = time.perf_counter()
+            result = await fn(i)
+            samples.append(time.perf_counter() - started)
+            if not isinstance(result, dict) or not result.get("ok"):
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "calls_per_s": len(samples) / elapsed,
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "error_rate": errors / max(len(samples), 1),
+    }
+
+
+# Metric, whether higher is better
+COMPARED = {
+    "latency": (("p50_ms", False), ("p99_ms", False)),
+    "allocations": (("peak_kib", False),),
+    "throughput": (("calls_per_s", True), ("p99_ms", False)),
+}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Print the change of every metric and return the regressions."""
+    regressions = []
+    for section, metrics in COMPARED.items():
+        for name, current in results[section].items():
+            previous = baseline.get(section, {}).get(name)
+            if previous is None:
+                continue
+            for metric, higher_is_better in metrics:
+                old, new = previous.get(metric), current.get(metric)
+                if not old or new is None:
+                    continue
+                change = (new - old) / old
+                worse = -change if higher_is_better else change
+                flag = "REGRESSION" if worse > threshold else ""
+                print(
+                    f"{section:<12} {name:<28} {metric:<12} "
+                    f"{old:>10.2f} -> {new:>10.2f} {change:+7.1%} {flag}"
+                )
+                if flag:
+                    regressions.append((section, name, metric, change))
+    return regressions
+
+
+async def run_cases(cases, args, results: dict):
+    print(f"{'tool':<28} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'KiB':>9}")
+    for name, fn in cases:
+        for i in range(args.warmup):
+            check(await fn(i))
+        latency = await measure_latency(fn, args.iterations, args.warmup)
+        peak = await measure_allocations(
+            fn, args.alloc_iterations, args.warmup + args.iterations
+        )
+        results["latency"][name] = latency
+        results["allocations"][name] = {"peak_kib": peak}
+        print(
+            f"{name:<28} {latency['p50_ms']:>8.2f} {latency['p90_ms']:>8.2f} "
+            f"{latency['p99_ms']:>8.2f} {peak:>9.1f}"
+        )
+
+    # Deletes consume their records, the mix only reads and updates
+    mix = [case for case in cases if not case[0].startswith(("create_", "delete_"))]
+    print(f"\n{'concurrency':<12} {'calls/s':>9} {'p50 ms':>8} {'p99 ms':>8} errors")
+    for level in [int(value) for value in args.concurrency.split(",")]:
+        throughput = await measure_throughput(mix, level, args.duration)
+        results["throughput"][str(level)] = throughput
+        print(
+            f"{level:<12} {throughput['calls_per_s']:>9.1f} "
+            f"{throughput['p50_ms']:>8.2f} {throughput['p99_ms']:>8.2f} "
+            f"{throughput['error_rate']:.2%}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--alloc-iterations", type=int, default=20)
+    parser.add_argument("--records", type=int, default=200, help="seeded per entity")
+    parser.add_argument("--concurrency", default="1,4,16")
+    parser.add_argument("--duration", type=float, default=3.0, help="per level")
+    parser.add_argument("--latency", type=float, default=0.0, help="stub latency")
+    parser.add_argument("--only", help="substring of the tools to run")
+    parser.add_argument("--save-baseline", nargs="?", const=BASELINE, metavar="PATH")
+    parser.add_argument("--compare", nargs="?", const=BASELINE, metavar="PATH")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    per_case = args.warmup + args.iterations + args.alloc_iterations
+    with EspoStubProcess(
+        custom_entities=(CUSTOM_ENTITY,), latency=args.latency
+    ) as stub:
+        tenant_context.set(
+            TenantContext(
+                is_authenticated=True, api_key=stub.api_key, api_address=stub.url
+            )
+        )
+
+        cases = Bench(stub, args.records, per_case).cases()
+        if args.only:
+            cases = [case for case in cases if args.only in case[0]]
+
+        results = {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "iterations": args.iterations,
+                "records": args.records,
+                "stub_latency": args.latency,
+            },
+            "latency": {},
+            "allocations": {},
+            "throughput": {},
+        }
+
+        asyncio.run(run_cases(cases, args, results))
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"\nBaseline written to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {args.compare} (threshold {args.threshold:.0%}):")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s)")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
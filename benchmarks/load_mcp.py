@@ -0,0 +1,457 @@
+"""Load test of one MCP server process with many concurrent tenant sessions.
+
+Opens N MCP sessions (streamable HTTP or SSE) against a running server, each
+with its own X-API-KEY and X-API-ADDRESS on a local EspoCRM stub, and
+replays a weighted mix of tool calls for a while. The number of sessions is
+stepped up; every step reports connect time, throughput, latency
+percentiles, errors by kind, the CPU used by the generator itself and, with
+--server-pid, the CPU, memory, threads and open files of the server process
+read from /proc. Steps stop once one degrades (failed connections, errors
+above --max-error-rate or p99 above --max-p99-ms).
+
+Every session is a separate tenant, so the server also verifies credentials,
+opens a pooled session and keeps caches per session, as in production.
+Start the server first, on the same machine (from the easy mcp root:
+python3 run.py -s fastapi).
+
+Usage (from the app folder):
+    python benchmarks/load_mcp.py --url http://127.0.0.1:8000/mcp
+    python benchmarks/load_mcp.py --sessions 1,10,50,100 --server-pid 4242
+    python benchmarks/load_mcp.py --transport sse --url http://127.0.0.1:8000/sse
+    python benchmarks/load_mcp.py --mix list_leads_tool=3,get_lead_tool=1
+    python benchmarks/load_mcp.py --max-p99-ms 500 --json load.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import httpx
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+from mcp.client.streamable_http import streamable_http_client
+from mcp.shared._httpx_utils import create_mcp_http_client
+from app.tests.espo_stub import EspoStubProcess, tenant_url
+from app.utils.espo_helpers import EspoAPI
+from bench_tools import (
+    ENTITIES,
+    load_tool,
+    percentile,
+    record_from_arguments,
+    tool_arguments,
+)
+
+DEFAULT_MIX = (
+    "list_leads_tool=4,get_lead_tool=3,update_lead_tool=1,"
+    "create_lead_tool=1,list_accounts_tool=1"
+)
+TOOL_NAME = re.compile(r"^(list|get|create|update|delete)_(\w+)_tool$")
+ENTITY_TYPES = {one: entity_type for entity_type, one, _ in ENTITIES}
+PLURALS = {many: one for _, one, many in ENTITIES}
+
+
+def parse_mix(value: str) -> dict:
+    """Parse `tool=weight,...` into a dict, the weight defaults to 1."""
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.strip().partition("=")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class Workload:
+    """Arguments of the tool calls in the mix, on records seeded in the stub.
+
+    get and update calls cycle through `records` seeded records per entity.
+    Delete calls consume their own pool of seeded records; once it is empty
+    they target a missing record and count as `api` errors.
+    """
+
+    def __init__(self, mix: dict, records: int):
+        self.mix = mix
+        self.records = records
+        self.calls = {}
+        self.ids = {}
+        self.delete_ids = {}
+        for name in mix:
+            match = TOOL_NAME.match(name)
+            if not match:
+                raise SystemExit(f"Not an entity tool: {name}")
+            operation, entity = match.groups()
+            one = PLURALS.get(entity) if operation == "list" else entity
+            if one not in ENTITY_TYPES:
+                raise SystemExit(f"Unknown entity of {name}")
+            self.calls[name] = (operation, one)
+
+    def seed(self, client: EspoAPI):
+        for operation, one in self.calls.values():
+            arguments = tool_arguments(load_tool(f"create_{one}"))
+            if operation in ("get", "update") and one not in self.ids:
+                self.ids[one] = self.create(client, one, arguments, self.records)
+            if operation == "delete" and one not in self.delete_ids:
+                self.delete_ids[one] = self.create(
+                    client, one, arguments, self.records
+                )
+
+    def create(self, client, one, arguments, count):
+        ids = []
+        for index in range(count):
+            result = client.call_api(
+                "POST",
+                ENTITY_TYPES[one],
+                params=record_from_arguments(arguments, index),
+                extra_headers={"X-Skip-Duplicate-Check": "true"},
+            )
+            if not result["ok"]:
+                raise SystemExit(f"Seeding {ENTITY_TYPES[one]} failed: {result}")
+            ids.append(result["data"]["id"])
+        return ids
+
+    def arguments(self, name: str, i: int) -> dict:
+        operation, one = self.calls[name]
+        if operation == "list":
+            return {"max_size": 20}
+        if operation == "create":
+            return tool_arguments(load_tool(name[: -len("_tool")]))
+
+        id_param = f"{one}_id"
+        if operation == "delete":
+            pool = self.delete_ids[one]
+            return {id_param: pool.pop() if pool else "missing"}
+
+        ids = self.ids[one]
+        arguments = {id_param: ids[i % len(ids)]}
+        if operation == "update":
+            # Emails have no description, every entity has a name
+            update = tool_arguments(load_tool(f"update_{one}"))
+            field = "description" if "description" in update else "name"
+            arguments[field] = f"Load test {i}"
+        return arguments
+
+
+def result_error(result):
+    """Return the kind of error of a CallToolResult, None when it succeeded."""
+    if result.isError:
+        return "tool_error"
+
+    payload = result.structuredContent
+    if isinstance(payload, dict) and set(payload) == {"result"}:
+        payload = payload["result"]
+    if payload is None and result.content:
+        try:
+            payload = json.loads(getattr(result.content[0], "text", ""))
+        except ValueError:
+            return None
+
+    if isinstance(payload, dict) and payload.get("ok") is False:
+        return payload.get("error_type") or "api"
+    return None
+
+
+@asynccontextmanager
+async def open_session(transport: str, url: str, headers: dict, timeout: float):
+    if transport == "sse":
+        streams = sse_client(url, headers=headers, timeout=timeout)
+        async with streams as (read, write):
+            async with ClientSession(read, write) as session:
+                yield session
+        return
+
+    http_client = create_mcp_http_client(
+        headers=headers, timeout=httpx.Timeout(timeout, read=300)
+    )
+    async with http_client:
+        async with streamable_http_client(url, http_client=http_client) as streams:
+            read, write, _ = streams
+            async with ClientSession(read, write) as session:
+                yield session
+
+
+class ProcSampler:
+    """Samples the CPU time, memory, threads and open files of a process.
+
+    Reads /proc, so it only works on Linux and for a server on this machine.
+    """
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.ticks = os.sysconf("SC_CLK_TCK")
+        self.samples = []
+
+    def cpu_seconds(self) -> float:
+        with open(f"/proc/{self.pid}/stat") as f:
+            # The command name may contain spaces, fields start after it
+            fields = f.read().rpartition(")")[2].split()
+        return (int(fields[11]) + int(fields[12])) / self.ticks
+
+    def sample(self):
+        status = {}
+        with open(f"/proc/{self.pid}/status") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                status[key] = value.split()
+        try:
+            fds = len(os.listdir(f"/proc/{self.pid}/fd"))
+        except PermissionError:
+            fds = None
+        self.samples.append(
+            {
+                "rss_mb": int(status["VmRSS"][0]) / 1024,
+                "threads": int(status["Threads"][0]),
+                "fds": fds,
+            }
+        )
+
+    async def run(self, stop: asyncio.Event, interval: float = 0.5):
+        self.samples = []
+        started, cpu = time.perf_counter(), self.cpu_seconds()
+        while True:
+            self.sample()
+            try:
+                await asyncio.wait_for(stop.wait(), interval)
+                break
+            except asyncio.TimeoutError:
+                pass
+        elapsed = time.perf_counter() - started
+
+        fds = [s["fds"] for s in self.samples if s["fds"] is not None]
+        return {
+            "cpu_percent": (self.cpu_seconds() - cpu) / elapsed * 100,
+            "rss_mb_max": max(s["rss_mb"] for s in self.samples),
+            "threads_max": max(s["threads"] for s in self.samples),
+            "fds_max": max(fds) if fds else None,
+        }
+
+
+class Step:
+    """State of one concurrency step shared by its sessions."""
+
+    def __init__(self, sessions: int, duration: float):
+        self.sessions = sessions
+        self.duration = duration
+        self.arrived = 0
+        self.ready = asyncio.Event()
+        self.deadline = None
+        self.connect = []
+        self.connect_errors = Counter()
+        self.latency = []
+        self.per_tool = defaultdict(list)
+        self.errors = Counter()
+
+    def arrive(self):
+        # Calls start once every session connected (or failed to)
+        self.arrived += 1
+        if self.arrived == self.sessions:
+            self.deadline = time.perf_counter() + self.duration
+            self.ready.set()
+
+
+async def run_session(index, step, workload, tenants, args, rng):
+    address, api_key = tenants[index]
+    headers = {"X-API-KEY": api_key, "X-API-ADDRESS": address}
+    names = list(workload.mix)
+    weights = list(workload.mix.values())
+    read_timeout = timedelta(seconds=args.timeout)
+    connected = False
+
+    try:
+        async with open_session(
+            args.transport, args.url, headers, args.timeout
+        ) as session:
+            started = time.perf_counter()
+            await session.initialize()
+            step.connect.append(time.perf_counter() - started)
+            connected = True
+            step.arrive()
+            await step.ready.wait()
+
+            i = index
+            while time.perf_counter() < step.deadline:
+                name = rng.choices(names, weights)[0]
+                arguments = workload.arguments(name, i)
+                i += step.sessions
+                started = time.perf_counter()
+                try:
+                    result = await session.call_tool(name, arguments, read_timeout)
+                    kind = result_error(result)
+                except Exception as e:
+                    kind = type(e).__name__
+                seconds = time.perf_counter() - started
+                step.latency.append(seconds)
+                step.per_tool[name].append(seconds)
+                if kind:
+                    step.errors[kind] += 1
+                if args.think:
+                    await asyncio.sleep(args.think)
+    except Exception as e:
+        if not connected:
+            step.connect_errors[type(e).__name__] += 1
+            step.arrive()
+        else:
+            step.errors[type(e).__name__] += 1
+
+
+async def run_step(sessions, workload, tenants, args, sampler):
+    step = Step(sessions, args.duration)
+    rng = random.Random(args.seed)
+    tasks = [
+        asyncio.create_task(
+            run_session(
+                i, step, workload, tenants, args, random.Random(rng.random())
+            )
+        )
+        for i in range(sessions)
+    ]
+
+    await step.ready.wait()
+    started, cpu = time.perf_counter(), time.process_time()
+    stop = asyncio.Event()
+    resources = asyncio.create_task(sampler.run(stop)) if sampler else None
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    # A saturated load generator shows up as slow calls too
+    client_cpu = (time.process_time() - cpu) / elapsed * 100
+    stop.set()
+
+    calls = len(step.latency)
+    errors = sum(step.errors.values())
+    result = {
+        "sessions": sessions,
+        "connected": len(step.connect),
+        "connect_errors": dict(step.connect_errors),
+        "connect_p50_ms": (
+            percentile(step.connect, 0.5) * 1000 if step.connect else None
+        ),
+        "calls": calls,
+        "calls_per_s": calls / elapsed,
+        "errors": dict(step.errors),
+        "error_rate": errors / calls if calls else None,
+        "client_cpu_percent": client_cpu,
+        "resources": await resources if resources else None,
+        "tools": {},
+    }
+    for share in (0.5, 0.9, 0.99):
+        key = f"p{int(share * 100)}_ms"
+        result[key] = percentile(step.latency, share) * 1000 if calls else None
+    for name, samples in step.per_tool.items():
+        result["tools"][name] = {
+            "calls": len(samples),
+            "p50_ms": percentile(samples, 0.5) * 1000,
+            "p99_ms": percentile(samples, 0.99) * 1000,
+        }
+    return result
+
+
+def print_step(result):
+    def number(value, spec):
+        if value is None:
+            return format("-", re.match(r">\d+", spec).group())
+        return format(value, spec)
+
+    resources = result["resources"] or {}
+    print(
+        f"{result['sessions']:>8} {result['connected']:>9} "
+        f"{number(result['connect_p50_ms'], '>10.1f')} "
+        f"{result['calls_per_s']:>8.1f} "
+        f"{number(result['p50_ms'], '>8.1f')} {number(result['p90_ms'], '>8.1f')} "
+        f"{number(result['p99_ms'], '>8.1f')} "
+        f"{number(result['error_rate'], '>7.2%')} "
+        f"{result['client_cpu_percent']:>8.0f} "
+        f"{number(resources.get('cpu_percent'), '>6.0f')} "
+        f"{number(resources.get('rss_mb_max'), '>8.1f')} "
+        f"{number(resources.get('threads_max'), '>8d')} "
+        f"{number(resources.get('fds_max'), '>5d')}"
+    )
+    errors = {**result["connect_errors"], **result["errors"]}
+    if errors:
+        print(f"{'':>8} errors: {errors}")
+
+
+def degraded(result, args) -> bool:
+    if result["connected"] < result["sessions"]:
+        return True
+    if args.max_p99_ms and (result["p99_ms"] or 0) > args.max_p99_ms:
+        return True
+    return (result["error_rate"] or 0) > args.max_error_rate
+
+
+async def run(args, stub):
+    steps = [int(value) for value in args.sessions.split(",")]
+    tenants = [
+        (tenant_url(stub.url, f"tenant-{i}"), f"load-key-{i}")
+        for i in range(max(steps))
+    ]
+    workload = Workload(parse_mix(args.mix), args.records)
+    workload.seed(EspoAPI(stub.url, stub.api_key))
+    sampler = ProcSampler(args.server_pid) if args.server_pid else None
+
+    print(
+        f"{'sessions':>8} {'connected':>9} {'connect ms':>10} {'calls/s':>8} "
+        f"{'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'errors':>7} {'client %':>8} "
+        f"{'cpu %':>6} {'rss MB':>8} {'threads':>8} {'fds':>5}"
+    )
+    results = []
+    for sessions in steps:
+        result = await run_step(sessions, workload, tenants, args, sampler)
+        results.append(result)
+        print_step(result)
+        if degraded(result, args):
+            print(f"\nStopped: degraded at {sessions} sessions")
+            break
+        await asyncio.sleep(args.cooldown)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000/mcp")
+    parser.add_argument(
+        "--transport", choices=("streamable-http", "sse"), default="streamable-http"
+    )
+    parser.add_argument("--sessions", default="1,5,10,25,50", help="steps")
+    parser.add_argument("--duration", type=float, default=10.0, help="s per step")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="tool=weight,...")
+    parser.add_argument("--think", type=float, default=0.0, help="s between calls")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--records", type=int, default=200, help="seeded per entity")
+    parser.add_argument("--stub-latency", type=float, default=0.0)
+    parser.add_argument("--server-pid", type=int, help="sample the server in /proc")
+    parser.add_argument("--max-p99-ms", type=float, help="stop above this p99")
+    parser.add_argument("--max-error-rate", type=float, default=0.05)
+    parser.add_argument("--cooldown", type=float, default=1.0, help="s between steps")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", metavar="PATH", help="write the results")
+    args = parser.parse_args()
+
+    keys = [f"load-key-{i}" for i in range(max(map(int, args.sessions.split(","))))]
+    with EspoStubProcess(api_keys=keys, latency=args.stub_latency) as stub:
+        results = asyncio.run(run(args, stub))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            meta = {
+                "url": args.url,
+                "transport": args.transport,
+                "mix": parse_mix(args.mix),
+                "duration": args.duration,
+                "stub_latency": args.stub_latency,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+            }
+            json.dump({"meta": meta, "steps": results}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
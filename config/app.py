@@ -3,6 +3,9 @@ from core.utils.env import EnvConfig
 SERVICES = [
     "core.services.server_info",    # server info html page
     "app.services.default_tools_messages",
+    "app.services.metrics",   # prometheus metrics
+    "app.services.profiler",   # sampling profiler, needs ESPO_ADMIN_TOKEN
+    "app.services.memory",   # tracemalloc diagnostics, needs ESPO_ADMIN_TOKEN
 ]
 
 # Optional, add configuration for the info server
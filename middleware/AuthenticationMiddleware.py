@@ -1,74 +1,150 @@
 # app/middleware/MyMiddleware.py
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from fastapi import Request
-from mcp.server.fastmcp import Context      # Use `ctx: Context` as function param to get mcp context
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+from mcp.server.lowlevel.server import request_ctx
 from core.utils.logger import logger        # Use to add logging capabilities
-from core.utils.state import global_state   # Use to add and read global vars
+from app.utils.credentials import INVALID_CREDENTIALS_MESSAGE, credential_cache
+from app.utils.prewarm import prewarm_tenant
+from app.utils.tracing import current_context, span
 
-class AuthenticationMiddleware(BaseHTTPMiddleware):
-    def __init__(
-        self, app, *args, **kwargs
-    ):
-        super().__init__(app)
+TENANT_STATE_KEY = "espo_tenant"
+TRACE_STATE_KEY = "espo_trace_context"
 
-    async def dispatch(self, request: Request, call_next):
 
-        try:
-            global_state.set(
-                "middleware.AuthenticationMiddleware.is_authenticated", False, True
-            )
-            global_state.set("api_key", "", True)
-            global_state.set("api_address", None, True)
-            api_key = request.headers.get("x-api-key", None)
-
-            if not api_key:
-                global_state.set(
-                    "middleware.AuthenticationMiddleware.error_message",
-                    f"X-API-KEY is a required header parameter. Please create an API key to access the EspoCRM API.",
-                    True,
-                )
-                return await call_next(request)
-
-            api_address = request.headers.get("x-api-address", None)
-
-            if not api_address:
-                global_state.set(
-                    "middleware.AuthenticationMiddleware.error_message",
-                    f"X-API-ADDRESS is a required header parameter. Please provide an API address to access the EspoCRM API.",
-                    True,
-                )
-                return await call_next(request)
-
-            global_state.set(
-                "middleware.AuthenticationMiddleware.is_authenticated", True, True
-            )
-            global_state.set("api_key", api_key, True)
-            global_state.set("api_address", api_address, True)
+@dataclass(frozen=True)
+class TenantContext:
+    """Credentials of the request being served, parsed once by the middleware."""
+
+    is_authenticated: bool = False
+    api_key: str = ""
+    api_address: Optional[str] = None
+    error_message: str = "User has not set API key in headers."
+
+
+ANONYMOUS = TenantContext()
+
+tenant_context: ContextVar[TenantContext] = ContextVar(
+    "espo_tenant_context", default=ANONYMOUS
+)
+
+
+def tenant_from_headers(headers) -> TenantContext:
+    """Build the tenant context from raw ASGI `(name, value)` header pairs."""
+    api_key = None
+    api_address = None
+
+    for name, value in headers:
+        name = name.lower()
+        if name == b"x-api-key":
+            api_key = value.decode("latin-1")
+        elif name == b"x-api-address":
+            api_address = value.decode("latin-1")
+
+    if not api_key:
+        return TenantContext(
+            error_message="X-API-KEY is a required header parameter. Please create an API key to access the EspoCRM API."
+        )
+
+    if not api_address:
+        return TenantContext(
+            error_message="X-API-ADDRESS is a required header parameter. Please provide an API address to access the EspoCRM API."
+        )
+
+    # Known-bad credentials are refused without reaching the CRM
+    if credential_cache.is_known_invalid(api_address, api_key):
+        return TenantContext(error_message=INVALID_CREDENTIALS_MESSAGE)
+
+    return TenantContext(
+        is_authenticated=True, api_key=api_key, api_address=api_address
+    )
+
+
+class AuthenticationMiddleware:
+    """Pure ASGI middleware that sets the tenant context of each request.
+
+    The context is held in a contextvar for code running in the request task
+    and stored in the request scope state, so MCP tools, which run in the
+    session task, read it through the request the MCP server hands over.
+    Nothing is shared between requests.
+    """
 
-            return await call_next(request)
+    def __init__(self, app, *args, **kwargs):
+        self.app = app
 
+    async def __call__(self, scope, receive, send):
+
+        if scope["type"] not in ("http", "websocket"):
+            return await self.app(scope, receive, send)
+
+        try:
+            tenant = tenant_from_headers(scope.get("headers", ()))
         except Exception as e:
             logger.error(f"AuthenticationMiddleware authentication failed: {str(e)}")
-            global_state.set(
-                "middleware.AuthenticationMiddleware.error_message",
-                f"Error trying to set API Key for authentication: {str(e)}",
-                True,
+            tenant = TenantContext(
+                error_message=f"Error trying to set API Key for authentication: {str(e)}"
             )
-            return await call_next(request)
+
+        if tenant.is_authenticated:
+            # New tenants get a pooled connection before their first tool call
+            prewarm_tenant(tenant.api_address, tenant.api_key)
+
+        state = scope.setdefault("state", {})
+        state[TENANT_STATE_KEY] = tenant
+        token = tenant_context.set(tenant)
+        try:
+            attributes = {"espo.authenticated": tenant.is_authenticated}
+            with span("AuthenticationMiddleware", attributes):
+                # Tools run in the MCP session task, they continue the trace from here
+                state[TRACE_STATE_KEY] = current_context()
+                await self.app(scope, receive, send)
+        finally:
+            tenant_context.reset(token)
+
+
+def get_request_state(key: str):
+    """Return a value the middleware stored on the HTTP request of the MCP call.
+
+    Inside an MCP request the HTTP request that carried it wins over
+    contextvars, because the session task may have been started (and its
+    context copied) by an earlier request of the same session.
+    """
+    try:
+        request = request_ctx.get().request
+    except LookupError:
+        return None
+
+    if request is None:
+        return None
+    return request.scope.get("state", {}).get(key)
+
+
+def get_tenant() -> TenantContext:
+    """Return the tenant context of the request being served."""
+    tenant = get_request_state(TENANT_STATE_KEY)
+    if tenant is not None:
+        return tenant
+
+    return tenant_context.get()
+
+
+def get_trace_context():
+    """Return the trace context of the HTTP request of the MCP call, if any."""
+    return get_request_state(TRACE_STATE_KEY)
+
 
 def check_access(returnJsonOnError=False):
 
-    if not global_state.get("middleware.AuthenticationMiddleware.is_authenticated"):
+    tenant = get_tenant()
+
+    if not tenant.is_authenticated:
         logger.error("AuthenticationMiddleware: User has not set API key in headers.")
 
         if returnJsonOnError:
             return {
                 "status": "error",
-                "error": global_state.get(
-                    "middleware.AuthenticationMiddleware.error_message",
-                    "User has not set API key in headers.",
-                ),
+                "error": tenant.error_message,
             }
 
         return "User has not set API key in headers."
@@ -0,0 +1,88 @@
+import asyncio
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from core.utils.logger import logger  # Use to add logging capabilities
+from app.utils.admin import require_admin
+from app.utils.memory import ESPO_TRACEMALLOC_FRAMES, memory_diagnostics
+from app.utils.lazy import lazy_import
+from app.utils.tool_pool import tool_pool
+from app.utils.credentials import credential_cache
+from app.utils.metadata import metadata_cache
+
+# Loaded on the first request, like the tools do, so importing the service
+# does not pull in the engine and the HTTP stack
+espo_helpers = lazy_import("app.utils.espo_helpers")
+dns_cache = lazy_import("app.utils.dns_cache")
+entity_engine = lazy_import("app.utils.entity_engine")
+
+router = APIRouter(prefix="/admin/memory", dependencies=[Depends(require_admin)])
+
+KeyType = Literal["lineno", "filename", "traceback"]
+
+
+def cache_sizes():
+    mappers = entity_engine.compile_param_mapper.cache_info()
+    return {
+        "tool_pool": tool_pool.stats(),
+        "tenant_clients": espo_helpers.client_registry.stats(),
+        "dns_cache": dns_cache.dns_cache.stats(),
+        "credential_cache": credential_cache.stats(),
+        "metadata_cache": metadata_cache.stats(),
+        "param_mappers": {"entries": mappers.currsize, "max_entries": mappers.maxsize},
+    }
+
+
+async def snapshot_or_404(fn, *args):
+    # Snapshots and statistics take a while on a large heap, keep the loop free
+    try:
+        return await asyncio.to_thread(fn, *args)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Unknown snapshot {e}.")
+    except RuntimeError as e:
+        # tracemalloc is not tracing
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.get("")
+async def get_memory():
+    # The metadata cache encodes every tenant's definitions to size them
+    caches = await asyncio.to_thread(cache_sizes)
+    return {"tracemalloc": memory_diagnostics.status(), "caches": caches}
+
+
+@router.post("/start")
+async def start_tracing(frames: int = Query(ESPO_TRACEMALLOC_FRAMES, ge=1, le=100)):
+    logger.info(f"Starting tracemalloc with {frames} frames")
+    return memory_diagnostics.start(frames)
+
+
+@router.post("/stop")
+async def stop_tracing():
+    logger.info("Stopping tracemalloc")
+    return memory_diagnostics.stop()
+
+
+@router.post("/snapshots")
+async def take_snapshot():
+    return {"id": await snapshot_or_404(memory_diagnostics.take_snapshot)}
+
+
+@router.get("/top")
+async def get_top(
+    snapshot: Optional[int] = None,
+    key: KeyType = "lineno",
+    limit: int = Query(20, ge=1, le=500),
+):
+    """Top allocation sites of a stored snapshot, or of the current heap."""
+    return await snapshot_or_404(memory_diagnostics.top, snapshot, key, limit)
+
+
+@router.get("/diff")
+async def get_diff(
+    old: int,
+    new: Optional[int] = None,
+    key: KeyType = "lineno",
+    limit: int = Query(20, ge=1, le=500),
+):
+    """Allocation sites that changed most between two snapshots (or now)."""
+    return await snapshot_or_404(memory_diagnostics.diff, old, new, key, limit)
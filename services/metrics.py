@@ -0,0 +1,78 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+from core.utils.logger import logger  # Use to add logging capabilities
+from app.utils.metrics import CONTENT_TYPE, GaugeFunction, registry
+from app.utils.lazy import lazy_import
+from app.utils.tool_pool import tool_pool
+from app.utils.credentials import credential_cache
+from app.utils.metadata import metadata_cache
+
+# Loaded on the first scrape, like the tools do, so importing the service
+# does not pull in the HTTP stack (requests, urllib3)
+espo_helpers = lazy_import("app.utils.espo_helpers")
+dns_cache = lazy_import("app.utils.dns_cache")
+
+router = APIRouter()
+
+
+def stats_gauges(prefix: str, description: str, stats, keys):
+    for key in keys:
+        registry.register(
+            GaugeFunction(
+                f"{prefix}_{key}",
+                f"{description}: {key.replace('_', ' ')}.",
+                lambda key=key: stats()[key],
+            )
+        )
+
+
+stats_gauges(
+    "espo_tool_pool",
+    "Tool pool",
+    tool_pool.stats,
+    (
+        "workers",
+        "busy",
+        "queued",
+        "max_queue",
+        "saturation",
+        "submitted",
+        "completed",
+        "failed",
+        "rejected",
+        "peak_queued",
+        "wait_seconds_total",
+    ),
+)
+stats_gauges(
+    "espo_tenant_clients",
+    "Tenant client registry",
+    lambda: espo_helpers.client_registry.stats(),
+    ("tenants", "max_tenants", "hits", "misses", "evictions", "reaped"),
+)
+stats_gauges(
+    "espo_dns_cache",
+    "DNS cache",
+    lambda: dns_cache.dns_cache.stats(),
+    ("entries", "hits", "misses"),
+)
+registry.register(
+    GaugeFunction(
+        "espo_credential_cache_entries",
+        "Verified or rejected API key and address pairs cached.",
+        lambda: len(credential_cache),
+    )
+)
+registry.register(
+    GaugeFunction(
+        "espo_metadata_cache_entries",
+        "Tenants with cached EspoCRM metadata.",
+        lambda: len(metadata_cache),
+    )
+)
+
+
+@router.get("/metrics")
+async def get_metrics():
+    logger.debug("Received request for metrics")
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,45 @@
+import asyncio
+from typing import Literal
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import JSONResponse, Response
+from core.utils.logger import logger  # Use to add logging capabilities
+from app.utils.admin import require_admin
+from app.utils.profiler import (
+    ESPO_PROFILE_MAX_SECONDS,
+    ProfilerBusyError,
+    SamplingProfiler,
+)
+
+router = APIRouter()
+
+
+@router.get("/admin/profile", dependencies=[Depends(require_admin)])
+async def get_profile(
+    seconds: float = Query(10, gt=0, le=ESPO_PROFILE_MAX_SECONDS),
+    interval: float = Query(0.01, ge=0.001, le=1),
+    format: Literal["flamegraph", "collapsed", "pstats"] = "flamegraph",
+    idle: bool = False,
+):
+    """Sample the stacks of every thread for `seconds` and return the profile."""
+    logger.info(f"Profiling for {seconds}s every {interval}s ({format})")
+    profiler = SamplingProfiler(interval, include_idle=idle)
+
+    # Sampled from a worker thread, the event loop keeps serving meanwhile
+    try:
+        profile = await asyncio.to_thread(profiler.run, seconds)
+    except ProfilerBusyError as e:
+        return JSONResponse(status_code=409, content={"detail": str(e)})
+
+    if format == "collapsed":
+        return Response(content=profile.collapsed(), media_type="text/plain")
+
+    if format == "pstats":
+        return Response(
+            content=profile.pstats(),
+            media_type="application/octet-stream",
+            headers={
+                "Content-Disposition": 'attachment; filename="espo-profile.pstats"'
+            },
+        )
+
+    return Response(content=profile.flamegraph(), media_type="image/svg+xml")
@@ -3,9 +3,17 @@ import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
+import asyncio
+import json
+import logging
 import pytest
 from core.utils.state import global_state
 from core.utils.env import EnvConfig
+from core.utils.logger import logger
+from app.middleware.AuthenticationMiddleware import TenantContext, tenant_context
+from app.utils.credentials import credential_cache
+from app.utils import espo_helpers
+from app.tests.espo_stub import EspoStubServer
 from app.tools.create_lead import create_lead_tool
 from app.tools.delete_lead import delete_lead_tool
 from app.tools.create_campaign import create_campaign_tool
@@ -23,23 +31,103 @@ from app.tools.create_call import create_call_tool
 from app.tools.list_users import list_users_tool
 
 
+def use_live_crm() -> bool:
+    return str(EnvConfig.get("TEST_LIVE_CRM") or "").lower() in ("1", "true", "yes")
+
+
+@pytest.fixture(scope="session")
+def espo_server():
+    """In-process fake EspoCRM shared by the test session, see espo_stub.py."""
+    with EspoStubServer() as server:
+        yield server
+
+
 @pytest.fixture(scope="module")
-def api_key_setup():
+def api_key_setup(request):
     global_state.set(
         "middleware.AuthenticationMiddleware.is_authenticated", False, True
     )
 
-    api_key = EnvConfig.get("TEST_API_KEY")
-    api_address = EnvConfig.get("TEST_API_ADDRESS")
+    if use_live_crm():
+        api_key = EnvConfig.get("TEST_API_KEY")
+        api_address = EnvConfig.get("TEST_API_ADDRESS")
 
-    assert api_key, "TEST_API_KEY is not set in env file."
-    assert api_address, "TEST_API_ADDRESS is not set in env file."
+        assert api_key, "TEST_API_KEY is not set in env file."
+        assert api_address, "TEST_API_ADDRESS is not set in env file."
+    else:
+        server = request.getfixturevalue("espo_server")
+        api_key, api_address = server.api_key, server.url
 
     global_state.set("middleware.AuthenticationMiddleware.is_authenticated", True, True)
     global_state.set("api_key", api_key, True)
     global_state.set("api_address", api_address, True)
+    token = tenant_context.set(
+        TenantContext(is_authenticated=True, api_key=api_key, api_address=api_address)
+    )
+
+    yield api_key, api_address
+
+    tenant_context.reset(token)
+
+
+class StubResponse:
+    """Stand-in for `requests.Response`, returned by `stub_transport` callables."""
+
+    def __init__(self, payload=None, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.payload = payload
 
-    return api_key, api_address
+    @property
+    def content(self):
+        return json.dumps(self.payload, separators=(",", ":")).encode()
+
+    def json(self):
+        return self.payload
+
+
+@pytest.fixture
+def stub_transport(monkeypatch):
+    """Route EspoCRM requests of pooled tenant sessions to a stub callable.
+
+    The stub is called like `requests.request(method, url, **kwargs)`.
+    """
+
+    def install(stub):
+        def request(session, method, url, **kwargs):
+            return stub(method, url, **kwargs)
+
+        monkeypatch.setattr(espo_helpers.requests.Session, "request", request)
+        return stub
+
+    return install
+
+
+@pytest.fixture
+def stub_tenant():
+    tenant = TenantContext(
+        is_authenticated=True, api_key="stub-key", api_address="http://espo.stub/api/v1"
+    )
+    token = tenant_context.set(tenant)
+    # Stub credentials count as verified, see test_credentials.py for probing
+    credential_cache.store(tenant.api_address, tenant.api_key, True)
+    yield tenant
+    credential_cache.invalidate(tenant.api_address, tenant.api_key)
+    tenant_context.reset(token)
+
+
+@pytest.fixture
+def app_log(caplog):
+    """Capture records of the app logger at DEBUG, whatever its propagation."""
+    level, propagate = logger.level, logger.propagate
+    logger.addHandler(caplog.handler)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    caplog.handler.setLevel(logging.DEBUG)
+    yield caplog
+    logger.removeHandler(caplog.handler)
+    logger.setLevel(level)
+    logger.propagate = propagate
 
 
 @pytest.fixture(scope="module")
@@ -51,7 +139,7 @@ def setup_test_lead():
         "email_address": "test.lead@example.com",
         "skip_duplicate_check": True,
     }
-    result = create_lead_tool(**lead_data)
+    result = asyncio.run(create_lead_tool(**lead_data))
 
     assert isinstance(result, dict)
     assert "status_code" in result and result["status_code"] == 200
@@ -59,7 +147,7 @@ def setup_test_lead():
 
     yield result
 
-    delete = delete_lead_tool(lead_id=result["data"]["id"])
+    delete = asyncio.run(delete_lead_tool(lead_id=result["data"]["id"]))
 
     assert isinstance(delete, dict)
     assert "status_code" in delete and delete["status_code"] == 200
@@ -77,7 +165,7 @@ def setup_test_campaign():
     }
 
     # Create the campaign
-    result = create_campaign_tool(**campaign_data)
+    result = asyncio.run(create_campaign_tool(**campaign_data))
 
     # Basic assertions to ensure creation succeeded
     assert isinstance(result, dict)
@@ -89,7 +177,7 @@ def setup_test_campaign():
     yield result
 
     # Teardown: delete the test campaign
-    delete_result = delete_campaign_tool(campaign_id=result["data"]["id"])
+    delete_result = asyncio.run(delete_campaign_tool(campaign_id=result["data"]["id"]))
 
     # Assertions to ensure deletion succeeded
     assert isinstance(delete_result, dict)
@@ -106,7 +194,7 @@ def setup_test_contact():
         "email_address": "test.lead@example.com",
         "skip_duplicate_check": True,
     }
-    result = create_contact_tool(**contact_data)
+    result = asyncio.run(create_contact_tool(**contact_data))
 
     assert isinstance(result, dict)
     assert "status_code" in result and result["status_code"] == 200
@@ -114,7 +202,7 @@ def setup_test_contact():
 
     yield result
 
-    delete = delete_contact_tool(contact_id=result["data"]["id"])
+    delete = asyncio.run(delete_contact_tool(contact_id=result["data"]["id"]))
 
     assert isinstance(delete, dict)
     assert "status_code" in delete and delete["status_code"] == 200
@@ -131,7 +219,7 @@ def setup_test_account():
         "industry": "Advertising",
         "skip_duplicate_check": True,
     }
-    result = create_account_tool(**account_data)
+    result = asyncio.run(create_account_tool(**account_data))
 
     assert isinstance(result, dict)
     assert "status_code" in result and result["status_code"] == 200
@@ -139,7 +227,7 @@ def setup_test_account():
 
     yield result
 
-    delete = delete_account_tool(account_id=result["data"]["id"])
+    delete = asyncio.run(delete_account_tool(account_id=result["data"]["id"]))
 
     assert isinstance(delete, dict)
     assert "status_code" in delete and delete["status_code"] == 200
@@ -157,7 +245,7 @@ def setup_test_email():
         "is_html": True,
         "status": "Draft",
     }
-    result = create_email_tool(**email_data)
+    result = asyncio.run(create_email_tool(**email_data))
 
     assert isinstance(result, dict)
     assert "status_code" in result and result["status_code"] == 200
@@ -165,7 +253,7 @@ def setup_test_email():
 
     yield result
 
-    delete = delete_email_tool(email_id=result["data"]["id"])
+    delete = asyncio.run(delete_email_tool(email_id=result["data"]["id"]))
 
     assert isinstance(delete, dict)
     assert "status_code" in delete and delete["status_code"] == 200
@@ -178,7 +266,7 @@ def setup_test_target_list():
     target_list_data = {
         "name": "Test Target List",
     }
-    result = create_target_list_tool(**target_list_data)
+    result = asyncio.run(create_target_list_tool(**target_list_data))
 
     assert isinstance(result, dict)
     assert "status_code" in result and result["status_code"] == 200
@@ -186,7 +274,7 @@ def setup_test_target_list():
 
     yield result
 
-    delete = delete_target_list_tool(target_list_id=result["data"]["id"])
+    delete = asyncio.run(delete_target_list_tool(target_list_id=result["data"]["id"]))
 
     assert isinstance(delete, dict)
     assert "status_code" in delete and delete["status_code"] == 200
@@ -196,7 +284,7 @@ def setup_test_target_list():
 @pytest.fixture(scope="module")
 def setup_test_call():
 
-    users = list_users_tool()
+    users = asyncio.run(list_users_tool())
 
     assert isinstance(users, dict)
     assert "data" in users and isinstance(users["data"], dict)
@@ -211,14 +299,14 @@ def setup_test_call():
         "date_end": "2026-11-29 12:34:56",
         "assigned_user_id": users["data"]["list"][0]["id"],
     }
-    result = create_call_tool(**call_data)
+    result = asyncio.run(create_call_tool(**call_data))
     assert isinstance(result, dict)
     assert "status_code" in result and result["status_code"] == 200
     assert "ok" in result and result["ok"] is True
 
     yield result
 
-    delete = delete_call_tool(call_id=result["data"]["id"])
+    delete = asyncio.run(delete_call_tool(call_id=result["data"]["id"]))
 
     assert isinstance(delete, dict)
     assert "status_code" in delete and delete["status_code"] == 200
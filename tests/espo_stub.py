@@ -0,0 +1,739 @@
+"""In-process fake EspoCRM server for tests and benchmarks.
+
+Implements the part of the EspoCRM REST API the tools use, over real HTTP on
+127.0.0.1 so requests go through the same sessions, pools and adapters as in
+production:
+
+- `App/user` (credential probe) and `Metadata` (field definitions)
+- `GET/POST <Entity>`: list with `where`/`whereGroup`, `textFilter`,
+  `select`/`attributeSelect`, `orderBy`/`order`, `offset`, `maxSize` and the
+  `X-No-Total` header, and create with `X-Skip-Duplicate-Check`
+- `GET/PUT/PATCH/DELETE <Entity>/<id>`
+- `GET/POST/DELETE <Entity>/<id>/<link>`: list, relate and unrelate
+
+Latency and failures can be injected, and every request is recorded.
+Several tenants can share one server: extra `api_keys` are accepted and any
+path prefix before `/api/v1` is ignored, see `tenant_url()`.
+`EspoStubProcess` runs the server in a child process, for benchmarks that
+should not measure the stub's own CPU time and allocations.
+
+Usage:
+
+    with EspoStubServer(latency=0.01) as server:
+        client = EspoAPI(server.url, server.api_key)
+        server.fail(503, times=2, path="Account")
+"""
+
+import json
+import multiprocessing
+import random
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+API_PREFIX = "/api/v1"
+STUB_API_KEY = "stub-api-key"
+MAX_SIZE_LIMIT = 200
+DEFAULT_MAX_SIZE = 20
+
+# `total` of a list sent with X-No-Total
+TOTAL_HAS_MORE = -1
+TOTAL_HAS_NO_MORE = -2
+
+# Field definitions served from Metadata: enough for the server's local
+# validation (required fields, max lengths), enums are left open.
+ENTITY_FIELDS = {
+    "Account": {
+        "name": {"type": "varchar", "required": True, "maxLength": 249},
+        "emailAddress": {"type": "email"},
+        "description": {"type": "text"},
+    },
+    "Contact": {
+        "name": {"type": "personName"},
+        "firstName": {"type": "varchar", "maxLength": 100},
+        "lastName": {"type": "varchar", "required": True, "maxLength": 100},
+        "emailAddress": {"type": "email"},
+    },
+    "Lead": {
+        "name": {"type": "personName"},
+        "firstName": {"type": "varchar", "maxLength": 100},
+        "lastName": {"type": "varchar", "required": True, "maxLength": 100},
+        "emailAddress": {"type": "email"},
+    },
+    "Campaign": {"name": {"type": "varchar", "required": True, "maxLength": 255}},
+    "Call": {"name": {"type": "varchar", "required": True, "maxLength": 255}},
+    "Email": {
+        "name": {"type": "varchar", "required": True, "maxLength": 255},
+        "subject": {"type": "varchar"},
+        "body": {"type": "wysiwyg"},
+    },
+    "TargetList": {"name": {"type": "varchar", "required": True, "maxLength": 255}},
+    "User": {
+        "name": {"type": "personName"},
+        "userName": {"type": "varchar", "required": True, "maxLength": 50},
+    },
+}
+
+# Attributes matched by textFilter (prefix, case-insensitive)
+TEXT_FILTER_FIELDS = ("name", "firstName", "lastName", "userName", "emailAddress")
+
+# Attribute compared by the duplicate check on create
+DUPLICATE_KEYS = {"Account": "name", "Contact": "emailAddress", "Lead": "emailAddress"}
+
+PERSON_ENTITIES = {"Contact", "Lead", "User"}
+
+ADMIN_USER = {
+    "id": "1",
+    "userName": "admin",
+    "firstName": "",
+    "lastName": "Admin",
+    "name": "Admin",
+    "type": "admin",
+    "isActive": True,
+    "emailAddress": "admin@example.com",
+}
+
+
+class StubError(Exception):
+    def __init__(self, status: int, reason: str, body: Any = None):
+        super().__init__(reason)
+        self.status = status
+        self.reason = reason
+        self.body = body
+
+
+@dataclass
+class StubRequest:
+    method: str
+    path: str
+    query: Dict[str, Any]
+    headers: Dict[str, str]
+    body: Any = None
+
+
+@dataclass
+class FailureRule:
+    status: Optional[int]
+    times: int
+    method: Optional[str] = None
+    path: Optional[str] = None
+
+    def matches(self, method: str, path: str) -> bool:
+        if self.method and self.method != method:
+            return False
+        return self.path is None or path == self.path or path.startswith(
+            self.path + "/"
+        )
+
+
+@dataclass
+class StubStore:
+    records: Dict[str, "OrderedDict[str, Dict]"] = field(default_factory=dict)
+    links: Dict[Tuple[str, str, str], "OrderedDict[str, str]"] = field(
+        default_factory=dict
+    )
+
+
+def now_string() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def new_id() -> str:
+    return uuid.uuid4().hex[:17]
+
+
+def parse_query(query: str) -> Dict[str, Any]:
+    """Parse a PHP style query string (`where[0][type]=...`) into nested values.
+
+    Inverse of `http_build_query`: dicts whose keys are all indexes become lists.
+    """
+    result: Dict[str, Any] = {}
+
+    for key, value in parse_qsl(query, keep_blank_values=True):
+        path = [key.split("[", 1)[0]] + re.findall(r"\[([^\]]*)\]", key)
+        node = result
+        for index, part in enumerate(path):
+            if part == "":
+                part = str(len(node))
+            if index == len(path) - 1:
+                node[part] = value
+            else:
+                node = node.setdefault(part, {})
+
+    return as_lists(result)
+
+
+def as_lists(value):
+    if not isinstance(value, dict):
+        return value
+    if value and all(key.isdigit() for key in value):
+        return [as_lists(value[key]) for key in sorted(value, key=int)]
+    return {key: as_lists(item) for key, item in value.items()}
+
+
+def coerce(actual, value):
+    """Convert a query string value to the type of the stored attribute."""
+    if isinstance(value, list):
+        return [coerce(actual, item) for item in value]
+    if isinstance(actual, bool):
+        return value in (True, "true", "1", 1)
+    if isinstance(actual, (int, float)) and not isinstance(value, (int, float)):
+        try:
+            return type(actual)(value)
+        except (TypeError, ValueError):
+            return value
+    return value
+
+
+def like_pattern(value: str):
+    return re.compile(
+        "^" + re.escape(str(value)).replace("%", ".*").replace("_", ".") + "$",
+        re.IGNORECASE,
+    )
+
+
+def matches_where(record: Dict, item: Dict) -> bool:
+    """Return whether a record passes one EspoCRM where item."""
+    kind = item.get("type")
+    value = item.get("value")
+
+    if kind in ("or", "and"):
+        items = value if isinstance(value, list) else []
+        check = any if kind == "or" else all
+        return check(matches_where(record, sub) for sub in items)
+    if kind == "not":
+        items = value if isinstance(value, list) else []
+        return not all(matches_where(record, sub) for sub in items)
+
+    actual = record.get(item.get("attribute"))
+    value = coerce(actual, value)
+    text = "" if actual is None else str(actual).lower()
+
+    if kind == "equals":
+        return actual == value
+    if kind == "notEquals":
+        return actual != value
+    if kind == "in":
+        return actual in (value if isinstance(value, list) else [value])
+    if kind == "notIn":
+        return actual not in (value if isinstance(value, list) else [value])
+    if kind == "isNull":
+        return actual is None or actual == ""
+    if kind == "isNotNull":
+        return actual is not None and actual != ""
+    if kind == "isTrue":
+        return actual is True
+    if kind == "isFalse":
+        return not actual
+    if kind == "contains":
+        return str(value).lower() in text
+    if kind == "notContains":
+        return str(value).lower() not in text
+    if kind == "startsWith":
+        return text.startswith(str(value).lower())
+    if kind == "endsWith":
+        return text.endswith(str(value).lower())
+    if kind in ("like", "notLike"):
+        found = actual is not None and bool(like_pattern(value).match(str(actual)))
+        return found if kind == "like" else not found
+    if kind == "arrayAnyOf":
+        wanted = value if isinstance(value, list) else [value]
+        return any(entry in wanted for entry in actual or [])
+
+    comparisons = {
+        "greaterThan": lambda a, b: a > b,
+        "lessThan": lambda a, b: a < b,
+        "greaterThanOrEquals": lambda a, b: a >= b,
+        "lessThanOrEquals": lambda a, b: a <= b,
+    }
+    if kind in comparisons:
+        return actual is not None and comparisons[kind](actual, value)
+    if kind == "between":
+        low, high = value if isinstance(value, list) else (None, None)
+        return actual is not None and low <= actual <= high
+
+    raise StubError(400, f"Unsupported where type '{kind}'.")
+
+
+class EspoStubServer:
+    """Fake EspoCRM holding records in memory, served from a background thread.
+
+    Records keep insertion order; the default list order is newest first like
+    EspoCRM. Links are stored on the side they were related from. `latency`
+    (plus up to `jitter`) seconds are spent on every request and `error_rate`
+    of the requests answer 500; `fail()` queues specific failures.
+    """
+
+    def __init__(
+        self,
+        api_key: str = STUB_API_KEY,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+        api_keys: Iterable[str] = (),
+    ):
+        self.api_keys = {api_key, *api_keys}
+        self.api_key = api_key
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.entity_fields = {name: dict(defs) for name, defs in ENTITY_FIELDS.items()}
+        self.requests: List[StubRequest] = []
+        self.count_queries = 0
+        self._random = random.Random(seed)
+        self._failures: List[FailureRule] = []
+        self._store = StubStore()
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self.reset()
+
+    # Lifecycle
+
+    def start(self) -> "EspoStubServer":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        # A short poll interval keeps stop() fast
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            name="espo-stub",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}{API_PREFIX}"
+
+    def reset(self):
+        """Drop records, links, queued failures and recorded requests."""
+        with self._lock:
+            self._store = StubStore()
+            self._failures.clear()
+            self.requests.clear()
+            self.count_queries = 0
+            self._store.records["User"] = OrderedDict({"1": dict(ADMIN_USER)})
+
+    # Test controls
+
+    def define_entity(self, entity_type: str, fields: Optional[Dict] = None):
+        """Add an entity type (e.g. a custom `CProject`) to Metadata and the API."""
+        with self._lock:
+            self.entity_fields[entity_type] = dict(fields or {})
+
+    def seed(self, entity_type: str, records: List[Dict]) -> List[str]:
+        """Store records as they are (ids are added if missing), return the ids."""
+        ids = []
+        with self._lock:
+            table = self._store.records.setdefault(entity_type, OrderedDict())
+            for record in records:
+                record = {"id": new_id(), **record}
+                table[record["id"]] = record
+                ids.append(record["id"])
+        return ids
+
+    def fail(
+        self,
+        status: Optional[int] = 500,
+        times: int = 1,
+        method: Optional[str] = None,
+        path: Optional[str] = None,
+    ):
+        """Answer the next `times` matching requests with `status`.
+
+        `path` is an action such as `Account` (also matching `Account/<id>`);
+        a `status` of None closes the connection without a response.
+        """
+        with self._lock:
+            self._failures.append(FailureRule(status, times, method, path))
+
+    def records(self, entity_type: str) -> List[Dict]:
+        with self._lock:
+            return [dict(r) for r in self._store.records.get(entity_type, {}).values()]
+
+    # Request handling
+
+    def handle(self, request: StubRequest) -> Tuple[Optional[int], Any]:
+        """Return `(status, body)` of a request, None status drops the connection."""
+        with self._lock:
+            self.requests.append(request)
+            failure = self._take_failure(request.method, request.path)
+
+        delay = self.latency + (self._random.random() * self.jitter)
+        if delay:
+            time.sleep(delay)
+
+        if failure is not None:
+            if failure.status is None:
+                return None, None
+            raise StubError(failure.status, "Injected failure")
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            raise StubError(500, "Injected failure")
+
+        if request.headers.get("x-api-key") not in self.api_keys:
+            raise StubError(401, "Unauthorized")
+
+        try:
+            return 200, self._route(request)
+        except (TypeError, ValueError) as e:
+            raise StubError(400, f"Bad request: {e}")
+
+    def _take_failure(self, method: str, path: str) -> Optional[FailureRule]:
+        for rule in self._failures:
+            if rule.matches(method, path):
+                rule.times -= 1
+                if rule.times <= 0:
+                    self._failures.remove(rule)
+                return rule
+        return None
+
+    def _route(self, request: StubRequest):
+        parts = [part for part in request.path.split("/") if part]
+        method = request.method
+
+        if parts == ["App", "user"] and method == "GET":
+            return {"user": dict(ADMIN_USER), "acl": {}, "preferences": {}}
+
+        if parts == ["Metadata"] and method == "GET":
+            with self._lock:
+                entity_defs = {
+                    name: {"fields": fields}
+                    for name, fields in self.entity_fields.items()
+                }
+            return {"entityDefs": entity_defs}
+
+        if not parts or parts[0] not in self.entity_fields:
+            raise StubError(404, "Not Found")
+
+        entity_type = parts[0]
+        if len(parts) == 1:
+            if method == "GET":
+                return self._list(entity_type, request)
+            if method == "POST":
+                return self._create(entity_type, request)
+        elif len(parts) == 2:
+            if method == "GET":
+                return self._get(entity_type, parts[1])
+            if method in ("PUT", "PATCH"):
+                return self._update(entity_type, parts[1], request.body or {})
+            if method == "DELETE":
+                return self._delete(entity_type, parts[1])
+        elif len(parts) == 3:
+            if method == "GET":
+                return self._list_linked(entity_type, parts[1], parts[2], request)
+            if method in ("POST", "DELETE"):
+                return self._link(entity_type, parts[1], parts[2], request)
+
+        raise StubError(405, "Method Not Allowed")
+
+    def _get(self, entity_type: str, record_id: str) -> Dict:
+        with self._lock:
+            record = self._store.records.get(entity_type, {}).get(record_id)
+        if record is None:
+            raise StubError(404, "Record not found")
+        return dict(record)
+
+    def _create(self, entity_type: str, request: StubRequest) -> Dict:
+        data = request.body if isinstance(request.body, dict) else {}
+        record = {key: value for key, value in data.items() if key != "id"}
+        record.update(id=new_id(), createdAt=now_string(), modifiedAt=now_string())
+        record.setdefault("deleted", False)
+        complete_record(entity_type, record)
+
+        skip = request.headers.get("x-skip-duplicate-check", "").lower() == "true"
+        key = DUPLICATE_KEYS.get(entity_type)
+
+        with self._lock:
+            table = self._store.records.setdefault(entity_type, OrderedDict())
+            if key and not skip and record.get(key):
+                duplicates = [
+                    dict(other)
+                    for other in table.values()
+                    if other.get(key) == record[key]
+                ]
+                if duplicates:
+                    raise StubError(409, "Duplicate", duplicates)
+            table[record["id"]] = record
+            return dict(record)
+
+    def _update(self, entity_type: str, record_id: str, data: Dict) -> Dict:
+        with self._lock:
+            record = self._store.records.get(entity_type, {}).get(record_id)
+            if record is None:
+                raise StubError(404, "Record not found")
+            record.update({key: value for key, value in data.items() if key != "id"})
+            record["modifiedAt"] = now_string()
+            complete_record(entity_type, record, data)
+            return dict(record)
+
+    def _delete(self, entity_type: str, record_id: str) -> bool:
+        with self._lock:
+            if self._store.records.get(entity_type, {}).pop(record_id, None) is None:
+                raise StubError(404, "Record not found")
+        return True
+
+    def _list(self, entity_type: str, request: StubRequest) -> Dict:
+        with self._lock:
+            records = list(self._store.records.get(entity_type, {}).values())
+        return self._page(records, request)
+
+    def _list_linked(self, entity_type, record_id, link, request) -> Dict:
+        self._get(entity_type, record_id)
+        with self._lock:
+            related = self._store.links.get((entity_type, record_id, link), {})
+            records = [
+                self._store.records.get(related_type, {}).get(related_id)
+                for related_id, related_type in related.items()
+            ]
+        return self._page([record for record in records if record], request)
+
+    def _link(self, entity_type, record_id, link, request) -> bool:
+        self._get(entity_type, record_id)
+        body = request.body if isinstance(request.body, dict) else {}
+        ids = body.get("ids") or ([body["id"]] if body.get("id") else [])
+        if not ids:
+            raise StubError(400, "No id given")
+
+        with self._lock:
+            related = self._store.links.setdefault(
+                (entity_type, record_id, link), OrderedDict()
+            )
+            for related_id in ids:
+                if request.method == "DELETE":
+                    related.pop(related_id, None)
+                    continue
+                related_type = self._entity_of(related_id)
+                if related_type is None:
+                    raise StubError(404, "Related record not found")
+                related[related_id] = related_type
+        return True
+
+    def _entity_of(self, record_id: str) -> Optional[str]:
+        for entity_type, table in self._store.records.items():
+            if record_id in table:
+                return entity_type
+        return None
+
+    def _page(self, records: List[Dict], request: StubRequest) -> Dict:
+        params = request.query
+        where = params.get("where", params.get("whereGroup")) or []
+        if isinstance(where, dict):
+            where = [where]
+        records = [
+            record
+            for record in records
+            if all(matches_where(record, item) for item in where)
+        ]
+
+        text_filter = str(params.get("textFilter") or "").lower().rstrip("*")
+        if text_filter:
+            records = [
+                record
+                for record in records
+                if any(
+                    str(record.get(name) or "").lower().startswith(text_filter)
+                    for name in TEXT_FILTER_FIELDS
+                )
+            ]
+
+        order_by = params.get("orderBy") or "createdAt"
+        reverse = str(params.get("order") or "desc").lower() == "desc"
+        # Stable order for equal values (e.g. records created in one second)
+        indexed = list(enumerate(records))
+        indexed.sort(
+            key=lambda pair: (
+                pair[1].get(order_by) is None,
+                str(pair[1].get(order_by) or ""),
+                pair[0],
+            ),
+            reverse=reverse,
+        )
+        records = [record for _, record in indexed]
+
+        offset = int(params.get("offset") or 0)
+        max_size = int(params.get("maxSize") or DEFAULT_MAX_SIZE)
+        if max_size > MAX_SIZE_LIMIT:
+            raise StubError(403, f"Max size should not exceed {MAX_SIZE_LIMIT}.")
+
+        page = records[offset : offset + max_size]
+        select = params.get("attributeSelect", params.get("select"))
+        if select and not isinstance(select, str):
+            # EspoCRM only reads a comma-joined string, select[0]=... is ignored
+            raise StubError(400, "Bad request: select must be a comma-separated list")
+        if select:
+            names = select.split(",")
+            page = [
+                {key: record.get(key) for key in ["id"] + names if key in record}
+                for record in page
+            ]
+        else:
+            page = [dict(record) for record in page]
+
+        if request.headers.get("x-no-total", "").lower() == "true":
+            more = len(records) > offset + max_size
+            total = TOTAL_HAS_MORE if more else TOTAL_HAS_NO_MORE
+        else:
+            with self._lock:
+                self.count_queries += 1
+            total = len(records)
+
+        return {"total": total, "list": page}
+
+
+def complete_record(entity_type: str, record: Dict, changes: Optional[Dict] = None):
+    """Fill in the attributes EspoCRM derives: person names, Email subject/name."""
+    changes = record if changes is None else changes
+
+    if entity_type in PERSON_ENTITIES and (
+        "firstName" in changes or "lastName" in changes or "name" not in record
+    ):
+        parts = [record.get("firstName"), record.get("lastName")]
+        record["name"] = " ".join(part for part in parts if part)
+
+    if entity_type == "Email":
+        if "subject" in changes:
+            record["name"] = changes["subject"]
+        elif "name" in changes:
+            record["subject"] = changes["name"]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, with Nagle every keep-alive
+    # response would wait for the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+
+    def _handle(self):
+        url = urlsplit(self.path)
+        path = url.path
+        # Tenant addresses put a prefix of their own before the API path
+        prefix = path.find(API_PREFIX)
+        if prefix >= 0:
+            path = path[prefix + len(API_PREFIX) :]
+
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            body = None
+
+        request = StubRequest(
+            method=self.command,
+            path=path.strip("/"),
+            query=parse_query(url.query),
+            headers={name.lower(): value for name, value in self.headers.items()},
+            body=body,
+        )
+
+        try:
+            status, payload = self.server.stub.handle(request)
+        except StubError as e:
+            self._send(e.status, e.body, e.reason)
+            return
+
+        if status is None:
+            self.close_connection = True
+            self.connection.close()
+            return
+        self._send(status, payload)
+
+    def _send(self, status: int, payload, reason: Optional[str] = None):
+        content = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        if reason:
+            self.send_header("X-Status-Reason", reason)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, *args):
+        pass
+
+
+def tenant_url(url: str, tenant: str) -> str:
+    """Return a distinct EspoCRM address on the same stub for `tenant`."""
+    base, _, _ = url.rpartition(API_PREFIX)
+    return f"{base}/{tenant}{API_PREFIX}"
+
+
+def serve_in_process(conn, options: Dict, custom_entities: Tuple[str, ...]):
+    with EspoStubServer(**options) as server:
+        for entity_type in custom_entities:
+            server.define_entity(entity_type, {"name": {"type": "varchar"}})
+        conn.send(server.url)
+        # Serve until the parent asks to stop or goes away
+        try:
+            conn.recv()
+        except EOFError:
+            pass
+
+
+class EspoStubProcess:
+    """`EspoStubServer` running in a child process, seeded over its HTTP API.
+
+    Takes the `EspoStubServer` options; `custom_entities` are defined with a
+    single `name` field.
+    """
+
+    def __init__(self, custom_entities: Tuple[str, ...] = (), **options):
+        self.api_key = options.get("api_key", STUB_API_KEY)
+        self.url: Optional[str] = None
+        self._options = options
+        self._custom_entities = tuple(custom_entities)
+        self._conn = None
+        self._process = None
+
+    def start(self) -> "EspoStubProcess":
+        context = multiprocessing.get_context("spawn")
+        self._conn, child = context.Pipe()
+        self._process = context.Process(
+            target=serve_in_process,
+            args=(child, self._options, self._custom_entities),
+            name="espo-stub",
+            daemon=True,
+        )
+        self._process.start()
+        self.url = self._conn.recv()
+        return self
+
+    def stop(self):
+        if self._process is not None:
+            self._conn.send("stop")
+            self._process.join(timeout=5)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
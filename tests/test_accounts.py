@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 from core.utils.state import global_state
@@ -23,7 +24,7 @@ def test_list_leads_tool(api_key_setup, setup_test_account):
     )
     assert is_api_key_set, "No API key set in env file."
 
-    result = list_accounts_tool()
+    result = asyncio.run(list_accounts_tool())
 
     assert isinstance(result, dict)
     assert "data" in result and isinstance(result["data"], dict)
@@ -43,7 +44,7 @@ def test_search_accounts_tool(api_key_setup, setup_test_account):
     assert is_api_key_set, "No API key set in env file."
 
     search_term = "Test"
-    result = list_accounts_tool(text_filter=search_term)
+    result = asyncio.run(list_accounts_tool(text_filter=search_term))
 
     assert isinstance(result, dict)
     assert "data" in result and isinstance(result["data"], dict)
@@ -72,12 +73,12 @@ def test_create_and_delete_account_tool(api_key_setup):
         "industry": "Advertising",
         "skip_duplicate_check": True,
     }
-    result = create_account_tool(**account_data)
+    result = asyncio.run(create_account_tool(**account_data))
 
     assert isinstance(result, dict)
     assert "status_code" in result and result["status_code"] == 200
 
-    delete = delete_account_tool(account_id=result["data"]["id"])
+    delete = asyncio.run(delete_account_tool(account_id=result["data"]["id"]))
 
     assert isinstance(delete, dict)
     assert "status_code" in delete and delete["status_code"] == 200
@@ -92,7 +93,7 @@ def test_get_account_tool(api_key_setup, setup_test_account):
     assert is_api_key_set, "No API key set in env file."
 
     account_id = setup_test_account["data"]["id"]
-    result = get_account_tool(account_id=account_id)
+    result = asyncio.run(get_account_tool(account_id=account_id))
 
     assert isinstance(result, dict)
     assert "status_code" in result and result["status_code"] == 200
@@ -112,15 +113,17 @@ def test_update_account_tool(api_key_setup, setup_test_account):
     industry = "Architecture"
     new_description = "Updated by automated test"
 
-    res = update_account_tool(
-        account_id=account_id, industry=industry, description=new_description
+    res = asyncio.run(
+        update_account_tool(
+            account_id=account_id, industry=industry, description=new_description
+        )
     )
     assert isinstance(res, dict)
     assert "status_code" in res and res["status_code"] == 200
     assert "ok" in res and res["ok"] is True
 
     # Fetch lead to verify updates
-    get_res = get_account_tool(account_id=account_id)
+    get_res = asyncio.run(get_account_tool(account_id=account_id))
     assert isinstance(get_res, dict)
     assert "status_code" in get_res and get_res["status_code"] == 200
     assert "ok" in get_res and get_res["ok"] is True
@@ -140,7 +143,7 @@ def test_filter_by_email(api_key_setup, setup_test_account):
     assert fixture_email, "Fixture did not provide an emailAddress"
 
     where = [{"type": "equals", "attribute": "emailAddress", "value": fixture_email}]
-    result = list_accounts_tool(where_group=where, max_size=50)
+    result = asyncio.run(list_accounts_tool(where_group=where, max_size=50))
 
     assert isinstance(result, dict)
     assert "status_code" in result and result["status_code"] == 200
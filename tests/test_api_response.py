@@ -5,15 +5,14 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..",
 
 import pytest
 from core.utils.state import global_state
-from core.utils.env import EnvConfig
 from app.tools.list_leads import list_leads_tool
 from app.utils.espo_helpers import EspoAPI, build_espo_params
 
 
-def test_api_error_response():
+def test_api_error_response(api_key_setup):
 
     api_key = "invalidapikey"
-    api_address = EnvConfig.get("TEST_API_ADDRESS")
+    _, api_address = api_key_setup
     client = EspoAPI(api_address, api_key)
     result = client.call_api("GET", "Lead")
     assert isinstance(result, dict)
@@ -0,0 +1,117 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from app.utils.budget import (
+    BYTES_PER_TOKEN,
+    TEXT_FIELD_MAX_CHARS,
+    apply_list_budget,
+    apply_record_budget,
+    encoded_size,
+    resolve_budget,
+)
+
+
+def make_list_result(count=100, body_size=2000):
+    records = [
+        {"id": f"email{i}", "status": "Sent", "body": "x" * body_size}
+        for i in range(count)
+    ]
+    return {
+        "status_code": 200,
+        "ok": True,
+        "data": {"total": count, "list": records},
+        "error": None,
+        "error_type": None,
+    }
+
+
+def test_resolve_budget():
+
+    assert resolve_budget() is None
+    assert resolve_budget(max_bytes=1000) == 1000
+    assert resolve_budget(max_tokens=100) == 100 * BYTES_PER_TOKEN
+    assert resolve_budget(max_bytes=1000, max_tokens=100) == 400
+
+
+def test_list_within_budget_is_untouched():
+
+    result = make_list_result(count=2, body_size=10)
+    result = apply_list_budget(result, 10_000)
+
+    assert len(result["data"]["list"]) == 2
+    assert "truncation" not in result
+
+
+def test_list_fitting_budget_keeps_long_text():
+
+    result = make_list_result(count=1, body_size=TEXT_FIELD_MAX_CHARS * 2)
+    result = apply_list_budget(result, 1_000_000)
+
+    assert len(result["data"]["list"][0]["body"]) == TEXT_FIELD_MAX_CHARS * 2
+    assert "truncation" not in result
+
+
+def test_list_budget_counts_truncation_entry():
+
+    full_size = encoded_size(make_list_result(count=20, body_size=40))
+
+    for budget in range(600, full_size, 7):
+        result = apply_list_budget(make_list_result(count=20, body_size=40), budget)
+        assert result["truncation"]["rows_dropped"] > 0
+        assert encoded_size(result) <= budget, budget
+
+
+def test_list_budget_trims_and_drops_rows():
+
+    budget = 20_000
+    result = apply_list_budget(make_list_result(), budget, offset=50)
+
+    rows = result["data"]["list"]
+    truncation = result["truncation"]
+
+    assert encoded_size(result) <= budget
+    assert 0 < len(rows) < 100
+    assert all(len(row["body"]) == TEXT_FIELD_MAX_CHARS + 1 for row in rows)
+    assert truncation["trimmed_fields"] == ["body"]
+    assert truncation["rows_dropped"] == 100 - len(rows)
+    assert truncation["next_offset"] == 50 + len(rows)
+
+
+def test_list_budget_keeps_one_row():
+
+    result = apply_list_budget(make_list_result(), 10)
+
+    assert len(result["data"]["list"]) == 1
+    assert result["truncation"]["next_offset"] == 1
+
+
+def test_record_budget_trims_text():
+
+    result = {
+        "status_code": 200,
+        "ok": True,
+        "data": {"id": "email1", "status": "Sent", "body": "x" * 50_000},
+    }
+    result = apply_record_budget(result, 1_000)
+
+    assert encoded_size(result) <= 1_000
+    assert result["data"]["status"] == "Sent"
+    assert result["truncation"]["trimmed_fields"] == ["body"]
+
+
+def test_record_budget_counts_truncation_entry():
+
+    for budget in range(400, 1_200, 3):
+        result = {"status_code": 200, "ok": True, "data": {"body": "x" * 5_000}}
+        result = apply_record_budget(result, budget)
+        assert encoded_size(result) <= budget, budget
+
+
+def test_error_result_is_untouched():
+
+    error = {"status_code": 404, "ok": False, "data": None, "error": "HTTP 404"}
+
+    assert apply_list_budget(dict(error), 10) == error
+    assert apply_record_budget(dict(error), 10) == error
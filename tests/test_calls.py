@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 from core.utils.state import global_state
@@ -19,7 +20,7 @@ def test_list_calls_tool(api_key_setup, setup_test_call):
     )
     assert is_api_key_set, "No API key set in env file."
 
-    result = list_calls_tool(max_size=2)
+    result = asyncio.run(list_calls_tool(max_size=2))
 
     assert isinstance(result, dict)
     assert "data" in result and isinstance(result["data"], dict)
@@ -39,7 +40,7 @@ def test_search_calls_tool(api_key_setup, setup_test_call):
     assert is_api_key_set, "No API key set in env file."
 
     search_term = "Test"
-    result = list_calls_tool(text_filter=search_term)
+    result = asyncio.run(list_calls_tool(text_filter=search_term))
 
     assert isinstance(result, dict)
     assert "data" in result and isinstance(result["data"], dict)
@@ -61,7 +62,7 @@ def test_create_and_delete_call_tool(api_key_setup):
     )
     assert is_api_key_set, "No API key set in env file."
 
-    users = list_users_tool()
+    users = asyncio.run(list_users_tool())
 
     assert isinstance(users, dict)
     assert "data" in users and isinstance(users["data"], dict)
@@ -76,12 +77,12 @@ def test_create_and_delete_call_tool(api_key_setup):
         "date_end": "2026-11-29 12:34:56",
         "assigned_user_id": users["data"]["list"][0]["id"],
     }
-    result = create_call_tool(**call_data)
+    result = asyncio.run(create_call_tool(**call_data))
 
     assert isinstance(result, dict)
     assert "status_code" in result and result["status_code"] == 200
 
-    delete = delete_call_tool(call_id=result["data"]["id"])
+    delete = asyncio.run(delete_call_tool(call_id=result["data"]["id"]))
 
     assert isinstance(delete, dict)
     assert "status_code" in delete and delete["status_code"] == 200
@@ -96,7 +97,7 @@ def test_get_call_tool(api_key_setup, setup_test_call):
     assert is_api_key_set, "No API key set in env file."
 
     call_id = setup_test_call["data"]["id"]
-    result = get_call_tool(call_id=call_id)
+    result = asyncio.run(get_call_tool(call_id=call_id))
 
     assert isinstance(result, dict)
     assert "status_code" in result and result["status_code"] == 200
@@ -115,13 +116,13 @@ def test_update_call_tool(api_key_setup, setup_test_call):
     call_id = setup_test_call["data"]["id"]
     new_description = "Updated by automated test"
 
-    res = update_call_tool(call_id=call_id, description=new_description)
+    res = asyncio.run(update_call_tool(call_id=call_id, description=new_description))
     assert isinstance(res, dict)
     assert "status_code" in res and res["status_code"] == 200
     assert "ok" in res and res["ok"] is True
 
     # Fetch lead to verify updates
-    get_res = get_call_tool(call_id=call_id)
+    get_res = asyncio.run(get_call_tool(call_id=call_id))
     assert isinstance(get_res, dict)
     assert "status_code" in get_res and get_res["status_code"] == 200
     assert "ok" in get_res and get_res["ok"] is True
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 import time
@@ -31,7 +32,7 @@ def test_list_campaigns_tool(api_key_setup, setup_test_campaign):
     )
     assert is_api_key_set, "No API key set in env file."
 
-    result = list_campaigns_tool(max_size=2)
+    result = asyncio.run(list_campaigns_tool(max_size=2))
     assert isinstance(result, dict)
     assert "data" in result and isinstance(result["data"], dict)
 
@@ -53,7 +54,7 @@ def test_search_campaigns_tool(api_key_setup, setup_test_campaign):
     assert is_api_key_set, "No API key set in env file."
 
     search_term = "Test"
-    result = list_campaigns_tool(text_filter=search_term)
+    result = asyncio.run(list_campaigns_tool(text_filter=search_term))
 
     assert isinstance(result, dict)
     assert "data" in result and isinstance(result["data"], dict)
@@ -84,7 +85,7 @@ def test_filter_campaign_by_name(api_key_setup, setup_test_campaign):
 
     # Build a where_group filter to find campaigns by exact name
     where = [{"type": "equals", "attribute": "name", "value": fixture_name}]
-    result = list_campaigns_tool(where_group=where, max_size=50)
+    result = asyncio.run(list_campaigns_tool(where_group=where, max_size=50))
 
     # Basic response checks
     assert isinstance(result, dict)
@@ -120,12 +121,12 @@ def test_create_and_delete_campaign_tool(api_key_setup):
         "type": "Email",
         "skip_duplicate_check": True,
     }
-    result = create_campaign_tool(**campaign_data)
+    result = asyncio.run(create_campaign_tool(**campaign_data))
 
     assert isinstance(result, dict)
     assert "status_code" in result and result["status_code"] == 200
 
-    delete = delete_campaign_tool(campaign_id=result["data"]["id"])
+    delete = asyncio.run(delete_campaign_tool(campaign_id=result["data"]["id"]))
 
     assert isinstance(delete, dict)
     assert "status_code" in delete and delete["status_code"] == 200
@@ -140,7 +141,7 @@ def test_get_campaign_tool(api_key_setup, setup_test_campaign):
     assert is_api_key_set, "No API key set in env file."
 
     campaign_id = setup_test_campaign["data"]["id"]
-    result = get_campaign_tool(campaign_id=campaign_id)
+    result = asyncio.run(get_campaign_tool(campaign_id=campaign_id))
 
     assert isinstance(result, dict)
     assert "status_code" in result and result["status_code"] == 200
@@ -160,15 +161,17 @@ def test_update_campaign_tool(api_key_setup, setup_test_campaign):
     new_name = "Updated Campaign Name"
     new_description = "Updated by automated test"
 
-    res = update_campaign_tool(
-        campaign_id=campaign_id, name=new_name, description=new_description
+    res = asyncio.run(
+        update_campaign_tool(
+            campaign_id=campaign_id, name=new_name, description=new_description
+        )
     )
     assert isinstance(res, dict)
     assert "status_code" in res and res["status_code"] == 200
     assert "ok" in res and res["ok"] is True
 
     # Fetch campaign to verify updates
-    get_res = get_campaign_tool(campaign_id=campaign_id)
+    get_res = asyncio.run(get_campaign_tool(campaign_id=campaign_id))
     assert isinstance(get_res, dict)
     assert "status_code" in get_res and get_res["status_code"] == 200
     assert "ok" in get_res and get_res["ok"] is True
@@ -0,0 +1,77 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import threading
+import time
+from app.utils.espo_helpers import EspoAPI, TenantClientRegistry
+
+
+def test_registry_reuses_sessions():
+
+    registry = TenantClientRegistry(max_tenants=4)
+
+    session = registry.get_session("http://crm-1/api/v1/")
+    assert registry.get_session("http://crm-1/api/v1") is session
+
+    adapter = session.get_adapter("http://crm-1/api/v1")
+    assert adapter._pool_maxsize == registry.max_connections
+
+    stats = registry.stats()
+    assert stats["tenants"] == 1
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_registry_lru_eviction():
+
+    registry = TenantClientRegistry(max_tenants=3)
+    sessions = {i: registry.get_session(f"http://crm-{i}") for i in range(3)}
+
+    # crm-0 becomes the most recently used, crm-1 is evicted next
+    registry.get_session("http://crm-0")
+    registry.get_session("http://crm-3")
+
+    assert len(registry) == 3
+    assert registry.stats()["evictions"] == 1
+    assert registry.get_session("http://crm-0") is sessions[0]
+    assert registry.get_session("http://crm-1") is not sessions[1]
+    assert registry.stats()["evictions"] == 2
+
+
+def test_registry_reaps_idle_sessions():
+
+    registry = TenantClientRegistry(max_tenants=10, idle_timeout=0.05)
+    for i in range(3):
+        registry.get_session(f"http://crm-{i}")
+
+    time.sleep(0.1)
+    registry.get_session("http://crm-new")
+
+    stats = registry.stats()
+    assert stats["tenants"] == 1
+    assert stats["reaped"] == 3
+    assert stats["evictions"] == 0
+
+
+def test_pool_timeout_returns_busy(espo_server):
+
+    registry = TenantClientRegistry(max_connections=1, pool_timeout=0.1)
+    session = registry.get_session(espo_server.url)
+    client = EspoAPI(espo_server.url, espo_server.api_key, session=session)
+    espo_server.latency = 0.5
+    try:
+        # The only connection is held by the slow request
+        slow = threading.Thread(target=client.call_api, args=("GET", "Account"))
+        slow.start()
+        time.sleep(0.1)
+        result = client.call_api("GET", "Account")
+        slow.join()
+    finally:
+        espo_server.latency = 0.0
+        registry.close_all()
+
+    assert result["ok"] is False
+    assert result["status_code"] is None
+    assert result["error_type"] == "busy"
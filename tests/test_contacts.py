@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 from core.utils.state import global_state
@@ -17,7 +18,7 @@ def test_list_contacts_tool(api_key_setup, setup_test_contact):
     )
     assert is_api_key_set, "No API key set in env file."
 
-    result = list_contacts_tool(max_size=2)
+    result = asyncio.run(list_contacts_tool(max_size=2))
 
     assert isinstance(result, dict)
     assert "data" in result and isinstance(result["data"], dict)
@@ -37,7 +38,7 @@ def test_search_contacts_tool(api_key_setup, setup_test_contact):
     assert is_api_key_set, "No API key set in env file."
 
     search_term = "Test"
-    result = list_contacts_tool(text_filter=search_term)
+    result = asyncio.run(list_contacts_tool(text_filter=search_term))
 
     assert isinstance(result, dict)
     assert "data" in result and isinstance(result["data"], dict)
@@ -65,12 +66,12 @@ def test_create_and_delete_contact_tool(api_key_setup):
         "email_address": "test.lead@example.com",
         "skip_duplicate_check": True,
     }
-    result = create_contact_tool(**contact_data)
+    result = asyncio.run(create_contact_tool(**contact_data))
 
     assert isinstance(result, dict)
     assert "status_code" in result and result["status_code"] == 200
 
-    delete = delete_contact_tool(contact_id=result["data"]["id"])
+    delete = asyncio.run(delete_contact_tool(contact_id=result["data"]["id"]))
 
     assert isinstance(delete, dict)
     assert "status_code" in delete and delete["status_code"] == 200
@@ -85,7 +86,7 @@ def test_get_contact_tool(api_key_setup, setup_test_contact):
     assert is_api_key_set, "No API key set in env file."
 
     contact_id = setup_test_contact["data"]["id"]
-    result = get_contact_tool(contact_id=contact_id)
+    result = asyncio.run(get_contact_tool(contact_id=contact_id))
 
     assert isinstance(result, dict)
     assert "status_code" in result and result["status_code"] == 200
@@ -109,11 +110,13 @@ def test_update_contact_tool(api_key_setup, setup_test_contact):
     new_description = "Updated by automated test"
 
     # Call update tool
-    res = update_contact_tool(
-        contact_id=contact_id,
-        first_name=new_first_name,
-        last_name=new_last_name,
-        description=new_description,
+    res = asyncio.run(
+        update_contact_tool(
+            contact_id=contact_id,
+            first_name=new_first_name,
+            last_name=new_last_name,
+            description=new_description,
+        )
     )
 
     # Validate update call response
@@ -122,7 +125,7 @@ def test_update_contact_tool(api_key_setup, setup_test_contact):
     assert res.get("ok") is True
 
     # Fetch contact to verify changes
-    get_res = get_contact_tool(contact_id=contact_id)
+    get_res = asyncio.run(get_contact_tool(contact_id=contact_id))
     assert isinstance(get_res, dict)
     assert get_res.get("status_code") == 200
     assert get_res.get("ok") is True
@@ -145,7 +148,7 @@ def test_filter_by_email(api_key_setup, setup_test_contact):
     assert fixture_email, "Fixture did not provide an emailAddress"
 
     where = [{"type": "equals", "attribute": "emailAddress", "value": fixture_email}]
-    result = list_contacts_tool(where_group=where, max_size=50)
+    result = asyncio.run(list_contacts_tool(where_group=where, max_size=50))
 
     assert isinstance(result, dict)
     assert "status_code" in result and result["status_code"] == 200
@@ -0,0 +1,206 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import asyncio
+import threading
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from app.utils.credentials import (
+    INVALID,
+    RATE_LIMITED,
+    VALID,
+    CredentialCache,
+    credential_cache,
+)
+from app.middleware.AuthenticationMiddleware import (
+    TenantContext,
+    tenant_context,
+    tenant_from_headers,
+)
+from app.tools.get_account import get_account_tool
+from app.tests.conftest import StubResponse
+
+API_ADDRESS = "http://espo.stub/api/v1"
+
+
+class AuthEspoStub:
+    """Accepts only `good-key` and records every request."""
+
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, method, url, headers=None, **kwargs):
+        self.requests.append(url)
+        if headers["X-Api-Key"] != "good-key":
+            return StubResponse(status_code=401)
+        return StubResponse({"id": "abc123"})
+
+
+@pytest.fixture
+def espo_stub(stub_transport):
+    stub = AuthEspoStub()
+    stub_transport(stub)
+    credential_cache.invalidate()
+    yield stub
+    credential_cache.invalidate()
+
+
+def call_as(api_key):
+    tenant = TenantContext(
+        is_authenticated=True, api_key=api_key, api_address=API_ADDRESS
+    )
+    token = tenant_context.set(tenant)
+    try:
+        return asyncio.run(get_account_tool(account_id="abc123"))
+    finally:
+        tenant_context.reset(token)
+
+
+def test_valid_key_probed_once(espo_stub):
+
+    for _ in range(5):
+        assert call_as("good-key")["ok"] is True
+
+    probes = [url for url in espo_stub.requests if url.endswith("/App/user")]
+    assert len(probes) == 1
+    assert len(espo_stub.requests) == 6
+
+
+def test_invalid_key_fails_fast(espo_stub):
+
+    result = call_as("bad-key")
+    assert result["status_code"] == 401
+    assert result["error_type"] == "auth"
+    assert espo_stub.requests == [f"{API_ADDRESS}/App/user"]
+
+    for _ in range(5):
+        assert call_as("bad-key")["error_type"] == "auth"
+    assert len(espo_stub.requests) == 1
+
+    # The middleware refuses the known-bad pair before any tool runs
+    tenant = tenant_from_headers(
+        [(b"x-api-key", b"bad-key"), (b"x-api-address", API_ADDRESS.encode())]
+    )
+    assert tenant.is_authenticated is False
+
+
+def test_cache_is_bounded_and_drops_expired_pairs():
+
+    cache = CredentialCache(failure_ttl=0, max_entries=3)
+
+    for i in range(10):
+        cache.store(API_ADDRESS, f"key-{i}", VALID)
+    assert len(cache) == 3
+    assert cache.lookup(API_ADDRESS, "key-0") is None
+    assert cache.lookup(API_ADDRESS, "key-9") is VALID
+
+    # Expired pairs are dropped when they are looked up or reach the cold end
+    cache.store(API_ADDRESS, "rejected", INVALID)
+    assert cache.lookup(API_ADDRESS, "rejected") is None
+    assert len(cache) == 2
+
+
+def test_probe_windows_are_bounded():
+
+    class Client:
+        api_key = "guess"
+
+        def __init__(self, url):
+            self.url = url
+
+        def call_api(self, method, action, **kwargs):
+            return {"status_code": None, "ok": False, "error_type": "network"}
+
+    cache = CredentialCache(max_entries=5, probe_window=0.05)
+    for i in range(20):
+        cache.verify(Client(f"http://crm{i}.example.com/api/v1"))
+    assert cache.stats()["probed_addresses"] == 5
+
+    # Windows that are over are dropped on the next probe
+    time.sleep(0.1)
+    cache.verify(Client("http://other.example.com/api/v1"))
+    assert cache.stats()["probed_addresses"] == 1
+
+    limited = CredentialCache(max_probes=0)
+    assert limited.verify(Client(API_ADDRESS)) is RATE_LIMITED
+    assert limited.stats()["probed_addresses"] == 0
+
+
+def test_probe_limit_per_address():
+
+    class Client:
+        url = API_ADDRESS
+
+        def __init__(self, api_key):
+            self.api_key = api_key
+            self.calls = 0
+
+        def call_api(self, method, action, **kwargs):
+            self.calls += 1
+            return {"status_code": 401, "ok": False}
+
+    cache = CredentialCache(max_probes=3)
+    clients = [Client(f"guess-{i}") for i in range(10)]
+    statuses = [cache.verify(client) for client in clients]
+
+    assert statuses == [INVALID] * 3 + [RATE_LIMITED] * 7
+    assert sum(client.calls for client in clients) == 3
+
+    # Over the limit nothing is cached, a valid key is not locked out
+    assert len(cache) == 3
+    assert cache.lookup(API_ADDRESS, "guess-9") is None
+
+
+def test_probe_limit_returns_busy(espo_stub, monkeypatch):
+
+    monkeypatch.setattr(credential_cache, "max_probes", 0)
+
+    result = call_as("good-key")
+    assert result["status_code"] == 429
+    assert result["error_type"] == "busy"
+    assert espo_stub.requests == []
+    assert credential_cache.lookup(API_ADDRESS, "good-key") is None
+
+
+def test_concurrent_calls_share_one_probe():
+
+    release = threading.Event()
+
+    class Client:
+        url = API_ADDRESS
+        api_key = "good-key"
+        calls = 0
+
+        def call_api(self, method, action, **kwargs):
+            Client.calls += 1
+            release.wait(5)
+            return {"status_code": 200, "ok": True}
+
+    cache = CredentialCache()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(cache.verify, Client()) for _ in range(8)]
+        time.sleep(0.05)
+        release.set()
+        statuses = [future.result() for future in futures]
+
+    assert statuses == [VALID] * 8
+    assert Client.calls == 1
+    assert cache.stats()["probing"] == 0
+
+
+def test_network_error_is_not_cached():
+
+    class Client:
+        url = API_ADDRESS
+        api_key = "good-key"
+
+        def call_api(self, method, action, **kwargs):
+            return {"status_code": None, "ok": False, "error_type": "network"}
+
+    cache = CredentialCache()
+
+    assert cache.verify(Client()) is None
+    assert len(cache) == 0
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 from core.utils.state import global_state
@@ -17,7 +18,7 @@ def test_list_emails_tool(api_key_setup, setup_test_email):
     )
     assert is_api_key_set, "No API key set in env file."
 
-    result = list_emails_tool(max_size=2)
+    result = asyncio.run(list_emails_tool(max_size=2))
 
     assert isinstance(result, dict)
     assert "data" in result and isinstance(result["data"], dict)
@@ -37,7 +38,7 @@ def test_search_emails_tool(api_key_setup, setup_test_email):
     assert is_api_key_set, "No API key set in env file."
 
     search_term = "Proposal draft"
-    result = list_emails_tool(text_filter=search_term)
+    result = asyncio.run(list_emails_tool(text_filter=search_term))
 
     assert isinstance(result, dict)
     assert "data" in result and isinstance(result["data"], dict)
@@ -67,12 +68,12 @@ def test_create_and_delete_email_tool(api_key_setup):
         "is_html": True,
         "status": "Draft",
     }
-    result = create_email_tool(**email_data)
+    result = asyncio.run(create_email_tool(**email_data))
 
     assert isinstance(result, dict)
     assert "status_code" in result and result["status_code"] == 200
 
-    delete = delete_email_tool(email_id=result["data"]["id"])
+    delete = asyncio.run(delete_email_tool(email_id=result["data"]["id"]))
 
     assert isinstance(delete, dict)
     assert "status_code" in delete and delete["status_code"] == 200
@@ -87,7 +88,7 @@ def test_get_email_tool(api_key_setup, setup_test_email):
     assert is_api_key_set, "No API key set in env file."
 
     email_id = setup_test_email["data"]["id"]
-    result = get_email_tool(email_id=email_id)
+    result = asyncio.run(get_email_tool(email_id=email_id))
 
     assert isinstance(result, dict)
     assert "status_code" in result and result["status_code"] == 200
@@ -106,13 +107,13 @@ def test_update_email_tool(api_key_setup, setup_test_email):
     email_id = setup_test_email["data"]["id"]
     new_subject = "QA Updated Subject"
 
-    res = update_email_tool(email_id=email_id, subject=new_subject)
+    res = asyncio.run(update_email_tool(email_id=email_id, subject=new_subject))
     assert isinstance(res, dict)
     assert "status_code" in res and res["status_code"] == 200
     assert "ok" in res and res["ok"] is True
 
     # Fetch lead to verify updates
-    get_res = get_email_tool(email_id=email_id)
+    get_res = asyncio.run(get_email_tool(email_id=email_id))
     assert isinstance(get_res, dict)
     assert "status_code" in get_res and get_res["status_code"] == 200
     assert "ok" in get_res and get_res["ok"] is True
@@ -131,7 +132,7 @@ def test_filter_by_email(api_key_setup, setup_test_email):
     assert fixture_email, "Fixture did not provide an emailAddress"
 
     where = [{"type": "equals", "attribute": "to", "value": fixture_email}]
-    result = list_emails_tool(where_group=where, max_size=50)
+    result = asyncio.run(list_emails_tool(where_group=where, max_size=50))
 
     assert isinstance(result, dict)
     assert "status_code" in result and result["status_code"] == 200
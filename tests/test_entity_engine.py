@@ -0,0 +1,148 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import asyncio
+import pytest
+from app.utils.metadata import metadata_cache
+from app.tools.create_email import create_email_tool
+from app.tools.update_account import update_account_tool
+from app.tools.delete_call import delete_call_tool
+from app.tools.list_records import list_records_tool
+from app.tools.create_record import create_record_tool
+from app.tools.get_record import get_record_tool
+from app.tools.update_record import update_record_tool
+from app.tools.delete_record import delete_record_tool
+from app.tests.conftest import StubResponse
+
+METADATA = {
+    "entityDefs": {
+        "Account": {
+            "fields": {"industry": {"type": "enum", "options": ["", "Advertising"]}}
+        },
+        "Email": {"fields": {"name": {"type": "varchar", "required": True}}},
+        "CProject": {"fields": {"name": {"type": "varchar", "required": True}}},
+    }
+}
+
+
+@pytest.fixture
+def espo_requests(stub_transport, stub_tenant):
+    sent = []
+
+    def fake_request(method, url, headers=None, json=None, **kwargs):
+        if url.endswith("/Metadata"):
+            return StubResponse(METADATA)
+        sent.append({"method": method, "url": url, "headers": headers, "json": json})
+        return StubResponse({"id": "abc123", "list": [], "total": 0})
+
+    stub_transport(fake_request)
+    metadata_cache.invalidate()
+    return sent
+
+
+def test_create_sends_headers_and_custom_fields(espo_requests):
+
+    result = asyncio.run(
+        create_email_tool(
+            name="Draft",
+            from_="john@example.com",
+            skip_duplicate_check=True,
+            custom_fields={"cSource": "mcp"},
+        )
+    )
+    assert result["ok"] is True
+
+    request = espo_requests[-1]
+    assert request["method"] == "POST"
+    assert request["url"] == "http://espo.stub/api/v1/Email"
+    assert request["headers"]["X-Skip-Duplicate-Check"] == "true"
+    assert request["json"] == {
+        "name": "Draft",
+        "from": "john@example.com",
+        "cSource": "mcp",
+    }
+
+
+def test_update_validates_locally(espo_requests):
+
+    result = asyncio.run(update_account_tool(account_id="abc123", industry="Space"))
+
+    assert result["ok"] is False
+    assert result["error_type"] == "validation"
+    assert espo_requests == []
+
+    result = asyncio.run(
+        update_account_tool(account_id="abc123", industry="Advertising")
+    )
+
+    assert result["ok"] is True
+    assert espo_requests[-1]["method"] == "PATCH"
+    assert espo_requests[-1]["url"].endswith("/Account/abc123")
+    assert espo_requests[-1]["json"] == {"industry": "Advertising"}
+
+
+def test_delete(espo_requests):
+
+    result = asyncio.run(delete_call_tool(call_id="abc123"))
+
+    assert result["ok"] is True
+    assert espo_requests[-1]["method"] == "DELETE"
+    assert espo_requests[-1]["url"].endswith("/Call/abc123")
+
+
+def test_custom_entity_tools(espo_requests):
+
+    attributes = {"name": "Relaunch"}
+    result = asyncio.run(
+        create_record_tool(entity_type="CProject", attributes=attributes)
+    )
+    assert result["ok"] is True
+    assert espo_requests[-1]["json"] == {"name": "Relaunch"}
+
+    result = asyncio.run(get_record_tool(entity_type="CProject", record_id="abc123"))
+    assert result["ok"] is True
+    assert espo_requests[-1]["url"].endswith("/CProject/abc123")
+
+    result = asyncio.run(list_records_tool(entity_type="CProject", max_size=5))
+    assert result["ok"] is True
+    assert "entityType" not in espo_requests[-1]["url"]
+
+
+def test_generic_tools_on_builtin_entity(espo_requests):
+
+    result = asyncio.run(get_record_tool(entity_type="Account", record_id="abc123"))
+    assert result["ok"] is True
+    assert espo_requests[-1]["url"].split("?")[0].endswith("/Account/abc123")
+
+    attributes = {"industry": "Advertising"}
+    result = asyncio.run(
+        update_record_tool(
+            entity_type="Account", record_id="abc123", attributes=attributes
+        )
+    )
+    assert result["ok"] is True
+    assert espo_requests[-1]["url"].endswith("/Account/abc123")
+    assert espo_requests[-1]["json"] == {"industry": "Advertising"}
+
+    result = asyncio.run(delete_record_tool(entity_type="Account", record_id="abc123"))
+    assert result["ok"] is True
+    assert espo_requests[-1]["url"].endswith("/Account/abc123")
+
+
+def test_unknown_custom_entity(espo_requests):
+
+    result = asyncio.run(list_records_tool(entity_type="CMissing"))
+
+    assert result["ok"] is False
+    assert result["error_type"] == "validation"
+    assert espo_requests == []
+
+
+def test_custom_entity_required_fields(espo_requests):
+
+    result = asyncio.run(create_record_tool(entity_type="CProject", attributes={}))
+
+    assert result["error_type"] == "validation"
+    assert espo_requests == []
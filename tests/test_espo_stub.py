@@ -0,0 +1,171 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import time
+import pytest
+from app.tests.espo_stub import EspoStubServer, parse_query, tenant_url
+from app.utils.espo_helpers import (
+    EspoAPI,
+    TenantClientRegistry,
+    build_list_headers,
+    http_build_query,
+)
+
+
+@pytest.fixture
+def server():
+    with EspoStubServer(seed=1) as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    registry = TenantClientRegistry()
+    yield EspoAPI(server.url, server.api_key, session=registry.get_session(server.url))
+    registry.close_all()
+
+
+def test_parse_query_inverts_http_build_query():
+    params = {
+        "whereGroup": [
+            {"type": "in", "attribute": "status", "value": ["New", "Assigned"]},
+            {"type": "or", "value": [{"type": "isNull", "attribute": "x"}]},
+        ],
+        "maxSize": 5,
+    }
+
+    parsed = parse_query(http_build_query(params))
+
+    assert parsed["whereGroup"][0]["value"] == ["New", "Assigned"]
+    assert parsed["whereGroup"][1]["value"][0]["type"] == "isNull"
+    assert parsed["maxSize"] == "5"
+
+
+def test_crud_round_trip(client):
+    created = client.call_api(
+        "POST", "Contact", params={"firstName": "Ada", "lastName": "Lovelace"}
+    )
+    assert created["ok"] is True
+    record_id = created["data"]["id"]
+    assert created["data"]["name"] == "Ada Lovelace"
+
+    updated = client.call_api("PATCH", f"Contact/{record_id}", params={"title": "Dr"})
+    assert updated["data"]["title"] == "Dr"
+    assert client.call_api("GET", f"Contact/{record_id}")["data"]["title"] == "Dr"
+
+    assert client.call_api("DELETE", f"Contact/{record_id}")["data"] is True
+    assert client.call_api("GET", f"Contact/{record_id}")["status_code"] == 404
+
+
+def test_list_filters_order_and_pages(server, client):
+    server.seed(
+        "Lead",
+        [
+            {"name": f"Lead {i}", "status": "New" if i % 2 else "Assigned", "rank": i}
+            for i in range(10)
+        ],
+    )
+    params = {
+        "where": [{"type": "in", "attribute": "status", "value": ["New"]}],
+        "orderBy": "rank",
+        "order": "asc",
+        "select": "name",
+        "maxSize": 2,
+        "offset": 2,
+    }
+
+    result = client.call_api("GET", "Lead", params=params)
+
+    assert result["data"]["total"] == 5
+    assert result["data"]["list"] == [
+        {"id": result["data"]["list"][0]["id"], "name": "Lead 5"},
+        {"id": result["data"]["list"][1]["id"], "name": "Lead 7"},
+    ]
+
+    search = client.call_api("GET", "Lead", params={"textFilter": "lead 1"})
+    assert [record["name"] for record in search["data"]["list"]] == ["Lead 1"]
+
+    # Like EspoCRM, only a comma-joined select is understood
+    listed = client.call_api("GET", "Lead", params={"select": ["name", "rank"]})
+    assert listed["status_code"] == 400
+
+
+def test_no_total_header(server, client):
+    server.seed("Account", [{"name": f"Account {i}"} for i in range(3)])
+    headers = build_list_headers(no_total=True)
+
+    more = client.call_api("GET", "Account", {"maxSize": 2}, extra_headers=headers)
+    last = client.call_api(
+        "GET", "Account", {"maxSize": 2, "offset": 2}, extra_headers=headers
+    )
+
+    assert (more["data"]["total"], last["data"]["total"]) == (-1, -2)
+    assert server.count_queries == 0
+    assert client.call_api("GET", "Account", {"maxSize": 201})["status_code"] == 403
+
+
+def test_relate_and_unrelate(server, client):
+    (account_id,) = server.seed("Account", [{"name": "Acme"}])
+    (contact_id,) = server.seed("Contact", [{"name": "Ada", "lastName": "Ada"}])
+    link = f"Account/{account_id}/contacts"
+
+    assert client.call_api("POST", link, params={"id": contact_id})["data"] is True
+    related = client.call_api("GET", link)["data"]
+    assert [record["id"] for record in related["list"]] == [contact_id]
+
+    client.call_api("DELETE", link, params={"id": contact_id})
+    assert client.call_api("GET", link)["data"]["total"] == 0
+    assert client.call_api("POST", link, params={"id": "missing"})["status_code"] == 404
+
+
+def test_duplicate_check(client):
+    params = {"name": "Acme"}
+    client.call_api("POST", "Account", params=params)
+
+    duplicate = client.call_api("POST", "Account", params=params)
+    skip = {"X-Skip-Duplicate-Check": "true"}
+    skipped = client.call_api("POST", "Account", params=params, extra_headers=skip)
+
+    assert duplicate["status_code"] == 409
+    assert skipped["ok"] is True
+
+
+def test_auth_and_unknown_entity(server):
+    assert EspoAPI(server.url, "bad").call_api("GET", "Account")["status_code"] == 401
+    client = EspoAPI(server.url, server.api_key)
+    assert client.call_api("GET", "CProject")["status_code"] == 404
+
+    server.define_entity("CProject", {"name": {"type": "varchar"}})
+    assert client.call_api("GET", "CProject")["ok"] is True
+
+
+def test_tenants_share_the_store():
+    with EspoStubServer(api_keys=("key-1", "key-2")) as server:
+        first = EspoAPI(tenant_url(server.url, "tenant-1"), "key-1")
+        second = EspoAPI(tenant_url(server.url, "tenant-2"), "key-2")
+        assert first.url != second.url
+
+        created = first.call_api("POST", "Account", params={"name": "Acme"})
+        assert second.call_api("GET", f"Account/{created['data']['id']}")["ok"]
+        assert second.call_api("GET", "App/user")["ok"] is True
+        assert EspoAPI(server.url, "key-3").call_api("GET", "App/user")[
+            "status_code"
+        ] == 401
+
+
+def test_injected_failures_and_latency(server, client):
+    server.fail(503, times=2, path="Account")
+    server.fail(None, method="GET", path="Call")
+
+    assert client.call_api("GET", "Account/abc")["status_code"] == 503
+    assert client.call_api("GET", "Account")["status_code"] == 503
+    assert client.call_api("GET", "Account")["ok"] is True
+    assert client.call_api("GET", "Call")["error_type"] == "network"
+
+    server.latency = 0.05
+    started = time.perf_counter()
+    client.call_api("GET", "Account")
+    assert time.perf_counter() - started >= 0.05
+    assert server.requests[-1].path == "Account"
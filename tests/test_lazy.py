@@ -0,0 +1,57 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import subprocess
+from app.utils.lazy import lazy_import
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+def test_lazy_import_loads_on_first_access():
+
+    module = lazy_import("json")
+    assert module.is_loaded is False
+
+    assert module.dumps({"a": 1}) == '{"a": 1}'
+    assert module.is_loaded is True
+
+
+def run_python(code: str):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT_DIR, env.get("PYTHONPATH")]))
+
+    return subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env
+    )
+
+
+def test_tool_import_does_not_load_engine():
+
+    code = (
+        "import sys\n"
+        "import app.tools.list_accounts as tool\n"
+        "assert 'app.utils.entity_engine' not in sys.modules\n"
+        "assert 'requests' not in sys.modules\n"
+        "assert tool.entity_engine.is_loaded is False\n"
+    )
+    proc = run_python(code)
+
+    assert proc.returncode == 0, proc.stderr
+
+
+def test_service_import_does_not_load_engine():
+
+    code = (
+        "import sys\n"
+        "import app.services.metrics\n"
+        "import app.services.memory as memory\n"
+        "assert 'app.utils.entity_engine' not in sys.modules\n"
+        "assert 'requests' not in sys.modules\n"
+        "assert 'urllib3' not in sys.modules\n"
+        "assert 'param_mappers' in memory.cache_sizes()\n"
+    )
+    proc = run_python(code)
+
+    assert proc.returncode == 0, proc.stderr
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 from core.utils.state import global_state
@@ -17,7 +18,7 @@ def test_list_leads_tool(api_key_setup, setup_test_lead):
     )
     assert is_api_key_set, "No API key set in env file."
 
-    result = list_leads_tool(max_size=2)
+    result = asyncio.run(list_leads_tool(max_size=2))
 
     assert isinstance(result, dict)
     assert "data" in result and isinstance(result["data"], dict)
@@ -37,7 +38,7 @@ def test_search_leads_tool(api_key_setup, setup_test_lead):
     assert is_api_key_set, "No API key set in env file."
 
     search_term = "Test"
-    result = list_leads_tool(text_filter=search_term)
+    result = asyncio.run(list_leads_tool(text_filter=search_term))
 
     assert isinstance(result, dict)
     assert "data" in result and isinstance(result["data"], dict)
@@ -65,12 +66,12 @@ def test_create_and_delete_lead_tool(api_key_setup):
         "email_address": "test.lead@example.com",
         "skip_duplicate_check": True,
     }
-    result = create_lead_tool(**lead_data)
+    result = asyncio.run(create_lead_tool(**lead_data))
 
     assert isinstance(result, dict)
     assert "status_code" in result and result["status_code"] == 200
 
-    delete = delete_lead_tool(lead_id=result["data"]["id"])
+    delete = asyncio.run(delete_lead_tool(lead_id=result["data"]["id"]))
 
     assert isinstance(delete, dict)
     assert "status_code" in delete and delete["status_code"] == 200
@@ -85,7 +86,7 @@ def test_get_lead_tool(api_key_setup, setup_test_lead):
     assert is_api_key_set, "No API key set in env file."
 
     lead_id = setup_test_lead["data"]["id"]
-    result = get_lead_tool(lead_id=lead_id)
+    result = asyncio.run(get_lead_tool(lead_id=lead_id))
 
     assert isinstance(result, dict)
     assert "status_code" in result and result["status_code"] == 200
@@ -105,15 +106,15 @@ def test_update_lead_tool(api_key_setup, setup_test_lead):
     new_title = "QA Updated Title"
     new_description = "Updated by automated test"
 
-    res = update_lead_tool(
-        lead_id=lead_id, title=new_title, description=new_description
+    res = asyncio.run(
+        update_lead_tool(lead_id=lead_id, title=new_title, description=new_description)
     )
     assert isinstance(res, dict)
     assert "status_code" in res and res["status_code"] == 200
     assert "ok" in res and res["ok"] is True
 
     # Fetch lead to verify updates
-    get_res = get_lead_tool(lead_id=lead_id)
+    get_res = asyncio.run(get_lead_tool(lead_id=lead_id))
     assert isinstance(get_res, dict)
     assert "status_code" in get_res and get_res["status_code"] == 200
     assert "ok" in get_res and get_res["ok"] is True
@@ -133,7 +134,7 @@ def test_filter_by_email(api_key_setup, setup_test_lead):
     assert fixture_email, "Fixture did not provide an emailAddress"
 
     where = [{"type": "equals", "attribute": "emailAddress", "value": fixture_email}]
-    result = list_leads_tool(where_group=where, max_size=50)
+    result = asyncio.run(list_leads_tool(where_group=where, max_size=50))
 
     assert isinstance(result, dict)
     assert "status_code" in result and result["status_code"] == 200
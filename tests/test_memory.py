@@ -0,0 +1,95 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import tracemalloc
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+from app.utils import admin
+from app.utils.memory import MemoryDiagnostics
+from app.services.memory import router
+
+HEADERS = {"X-Admin-Token": "secret"}
+
+
+def allocate_rows():
+    return [{"id": str(i), "name": "x" * 200} for i in range(2000)]
+
+
+@pytest.fixture
+def diagnostics():
+    diagnostics = MemoryDiagnostics(max_snapshots=2)
+    diagnostics.start(5)
+    yield diagnostics
+    diagnostics.stop()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(admin, "ESPO_ADMIN_TOKEN", "secret")
+    app = FastAPI()
+    app.include_router(router)
+    yield TestClient(app)
+    tracemalloc.stop()
+
+
+def test_diff_finds_allocation_site(diagnostics):
+    before = diagnostics.take_snapshot()
+    rows = allocate_rows()
+    after = diagnostics.take_snapshot()
+
+    diff = diagnostics.diff(before, after)
+    assert any(
+        "test_memory.py" in entry["location"] and entry["size_diff_bytes"] > 400_000
+        for entry in diff
+    )
+    assert diagnostics.top(after, "filename", limit=1)[0]["size_bytes"] > 0
+    assert len(rows) == 2000
+
+
+def test_old_snapshots_are_dropped(diagnostics):
+    first = diagnostics.take_snapshot()
+    diagnostics.take_snapshot()
+    diagnostics.take_snapshot()
+
+    with pytest.raises(KeyError):
+        diagnostics.get_snapshot(first)
+    assert len(diagnostics.status()["snapshots"]) == 2
+
+
+def test_snapshot_needs_tracing():
+    diagnostics = MemoryDiagnostics()
+    assert diagnostics.status()["tracing"] is False
+    with pytest.raises(RuntimeError):
+        diagnostics.take_snapshot()
+
+
+def test_memory_endpoints(client):
+    assert client.get("/admin/memory").status_code == 403
+
+    status = client.get("/admin/memory", headers=HEADERS).json()
+    assert status["tracemalloc"]["tracing"] is False
+    assert "entries" in status["caches"]["metadata_cache"]
+    assert "probing" in status["caches"]["credential_cache"]
+    assert "tenants" in status["caches"]["tenant_clients"]
+
+    assert client.post("/admin/memory/snapshots", headers=HEADERS).status_code == 409
+
+    started = client.post("/admin/memory/start?frames=3", headers=HEADERS).json()
+    assert started["tracing"] is True and started["frames"] == 3
+
+    old = client.post("/admin/memory/snapshots", headers=HEADERS).json()["id"]
+    rows = allocate_rows()
+    top = client.get("/admin/memory/top?limit=5", headers=HEADERS).json()
+    assert len(top) == 5
+    diff = client.get(f"/admin/memory/diff?old={old}", headers=HEADERS).json()
+    assert diff[0]["size_diff_bytes"] > 0
+    assert len(rows) == 2000
+
+    assert client.get("/admin/memory/diff?old=999", headers=HEADERS).status_code == 404
+
+    stopped = client.post("/admin/memory/stop", headers=HEADERS).json()
+    assert stopped["tracing"] is False
+    assert [entry["id"] for entry in stopped["snapshots"]][-1] == old
@@ -0,0 +1,147 @@
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from app.utils.metadata import MetadataCache, validate_params
+
+ACCOUNT_FIELDS = {
+    "name": {"type": "varchar", "required": True, "maxLength": 249},
+    "type": {"type": "enum", "options": ["", "Customer", "Investor", "Partner"]},
+    "industry": {"type": "enum", "options": ["", "Advertising", "Architecture"]},
+    "sicCode": {"type": "varchar", "maxLength": 40},
+    "assignedUser": {"type": "link", "required": True},
+}
+
+
+class StubClient:
+    def __init__(self, url="http://espo.stub/api/v1", ok=True):
+        self.url = url
+        self.ok = ok
+        self.calls = 0
+
+    def call_api(self, method, action, **kwargs):
+        self.calls += 1
+        if not self.ok:
+            return {"status_code": 403, "ok": False, "data": None}
+        return {
+            "status_code": 200,
+            "ok": True,
+            "data": {"entityDefs": {"Account": {"fields": ACCOUNT_FIELDS}}},
+        }
+
+
+def test_valid_params():
+
+    params = {"name": "Acme", "type": "Customer", "industry": "Advertising"}
+    assert validate_params(ACCOUNT_FIELDS, params, create=True) == []
+
+
+def test_invalid_enum():
+
+    errors = validate_params(ACCOUNT_FIELDS, {"industry": "Space"})
+
+    assert len(errors) == 1
+    assert "industry" in errors[0] and "Advertising" in errors[0]
+
+
+def test_max_length():
+
+    errors = validate_params(ACCOUNT_FIELDS, {"sicCode": "1" * 41})
+
+    assert errors == ["`sicCode` exceeds max length of 40 characters."]
+
+
+def test_required_only_on_create():
+
+    assert validate_params(ACCOUNT_FIELDS, {"type": "Customer"}) == []
+    assert validate_params(ACCOUNT_FIELDS, {"type": "Customer"}, create=True) == [
+        "`name` is required."
+    ]
+
+
+def test_required_alias():
+
+    fields = {"name": {"type": "varchar", "required": True}}
+
+    errors = validate_params(
+        fields, {"subject": "Hello"}, create=True, aliases={"name": ("subject",)}
+    )
+    assert errors == []
+
+
+def test_unknown_params_are_ignored():
+
+    params = {"cCustomScore": 95, "customFields": {}}
+    assert validate_params(ACCOUNT_FIELDS, params) == []
+
+
+def test_cache_is_per_tenant_with_ttl():
+
+    cache = MetadataCache(ttl=300)
+    first = StubClient()
+    other = StubClient(url="http://other.stub/api/v1")
+
+    assert cache.get_fields(first, "Account") == ACCOUNT_FIELDS
+    assert cache.get_fields(first, "Account") == ACCOUNT_FIELDS
+    assert cache.get_fields(other, "Account") == ACCOUNT_FIELDS
+    assert first.calls == 1
+    assert other.calls == 1
+    assert len(cache) == 2
+
+    expired = MetadataCache(ttl=0)
+    expired.get_fields(first, "Account")
+    expired.get_fields(first, "Account")
+    assert first.calls == 3
+
+
+def test_unavailable_metadata_disables_validation():
+
+    cache = MetadataCache()
+    client = StubClient(ok=False)
+
+    assert cache.get_fields(client, "Account") is None
+    assert cache.get_fields(client, "Account") is None
+    assert client.calls == 1
+
+
+def test_cache_keeps_least_recently_used_tenants():
+
+    cache = MetadataCache(max_tenants=2)
+    first = StubClient(url="http://first.stub/api/v1")
+    second = StubClient(url="http://second.stub/api/v1")
+    third = StubClient(url="http://third.stub/api/v1")
+
+    cache.get_fields(first, "Account")
+    cache.get_fields(second, "Account")
+    cache.get_fields(first, "Account")
+    cache.get_fields(third, "Account")
+    assert len(cache) == 2
+
+    cache.get_fields(first, "Account")
+    cache.get_fields(second, "Account")
+    assert first.calls == 1
+    assert second.calls == 2
+
+
+def test_concurrent_misses_share_one_fetch():
+
+    release = threading.Event()
+
+    class SlowClient(StubClient):
+        def call_api(self, method, action, **kwargs):
+            release.wait(5)
+            return super().call_api(method, action, **kwargs)
+
+    cache = MetadataCache()
+    client = SlowClient()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(cache.get_fields, client, "Account") for _ in range(8)]
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert results == [ACCOUNT_FIELDS] * 8
+    assert client.calls == 1
@@ -0,0 +1,130 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import asyncio
+import pytest
+import requests
+from functools import partial
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.utils import metrics
+from app.utils.metrics import Counter, Histogram, normalize_endpoint
+from app.services.metrics import router
+from app.tools.get_contact import get_contact_tool
+from app.tests.conftest import StubResponse
+
+CONTACT = {"id": "5f3d1e2c3b4a59876"}
+
+
+@pytest.fixture
+def espo_stub(stub_transport, stub_tenant):
+    return stub_transport(lambda method, url, **kwargs: StubResponse(CONTACT))
+
+
+class BrokenBodyResponse(StubResponse):
+    """Headers arrived, the connection drops while the body is read."""
+
+    closed = False
+
+    @property
+    def content(self):
+        raise requests.exceptions.ChunkedEncodingError("Connection broken")
+
+    def close(self):
+        self.closed = True
+
+
+def test_normalize_endpoint():
+
+    assert normalize_endpoint("Account") == "Account"
+    assert normalize_endpoint("Account/5f3d1e2c3b4a59876") == "Account/{id}"
+    assert normalize_endpoint("Account/abc/contacts") == "Account/{id}/*"
+    assert normalize_endpoint("Lead/action/convert") == "Lead/action/*"
+    assert normalize_endpoint("CProject/abc/tasks/x") == "custom/{id}/*"
+    assert normalize_endpoint("CProject") == "custom"
+    assert normalize_endpoint("App/user") == "App/user"
+    assert normalize_endpoint("Metadata") == "Metadata"
+    assert normalize_endpoint("http://crm/api/v1/Call/x1?select=a") == "Call/{id}"
+
+
+def test_counter_and_histogram_render():
+
+    counter = Counter("test_total", "Test counter.", ("kind",))
+    counter.inc('a"b')
+    histogram = Histogram("test_seconds", "Test histogram.", buckets=(0.1, 1))
+    histogram.observe(0.5)
+    histogram.observe(2)
+
+    assert counter.render()[-1] == 'test_total{kind="a\\"b"} 1'
+    assert histogram.render()[2:] == [
+        'test_seconds_bucket{le="0.1"} 0',
+        'test_seconds_bucket{le="1"} 1',
+        'test_seconds_bucket{le="+Inf"} 2',
+        "test_seconds_sum 2.5",
+        "test_seconds_count 2",
+    ]
+
+
+def test_tool_call_metrics(espo_stub):
+
+    labels = ("get_contact_tool", "get", "Contact")
+    calls = metrics.tool_calls.value(*labels, "")
+    requests = metrics.api_requests.value("GET", "Contact/{id}", 200)
+
+    result = asyncio.run(get_contact_tool(contact_id="5f3d1e2c3b4a59876"))
+
+    assert result["ok"] is True
+    assert metrics.tool_calls.value(*labels, "") == calls + 1
+    assert metrics.tool_duration.count(*labels) >= 1
+    assert metrics.api_requests.value("GET", "Contact/{id}", 200) == requests + 1
+
+    # The label is the tool's name, whoever calls it
+    asyncio.run(partial(get_contact_tool, contact_id="5f3d1e2c3b4a59876")())
+    assert metrics.tool_calls.value(*labels, "") == calls + 2
+
+
+def test_body_read_error_is_a_network_error(stub_transport, stub_tenant):
+
+    response = BrokenBodyResponse(CONTACT)
+    stub_transport(lambda method, url, **kwargs: response)
+    labels = ("GET", "Contact/{id}", "")
+    requests_before = metrics.api_requests.value(*labels)
+
+    result = asyncio.run(get_contact_tool(contact_id="5f3d1e2c3b4a59876"))
+
+    assert result["ok"] is False
+    assert result["status_code"] is None
+    assert result["error_type"] == "network"
+    assert response.closed is True
+    assert metrics.api_requests.value(*labels) == requests_before + 1
+
+
+def test_metrics_service(espo_stub):
+
+    asyncio.run(get_contact_tool(contact_id="5f3d1e2c3b4a59876"))
+
+    app = FastAPI()
+    app.include_router(router)
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert "# TYPE espo_tool_duration_seconds histogram" in body
+    assert 'espo_api_response_bytes_count{method="GET",endpoint="Contact/{id}"}' in body
+    assert "espo_tool_pool_busy 0" in body
+    assert "5f3d1e2c3b4a59876" not in body
+
+
+def test_render_mixed_label_types():
+
+    counter = Counter("test_status_total", "Test counter.", ("status",))
+    counter.inc(200)
+    counter.inc("")
+
+    assert counter.render()[2:] == [
+        'test_status_total{status=""} 1',
+        'test_status_total{status="200"} 1',
+    ]
@@ -0,0 +1,85 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import asyncio
+import pytest
+from app.utils.espo_helpers import build_list_headers
+from app.tools.list_accounts import list_accounts_tool
+from app.tools.list_calls import list_calls_tool
+from app.tools.list_campaigns import list_campaigns_tool
+from app.tools.list_contacts import list_contacts_tool
+from app.tools.list_emails import list_emails_tool
+from app.tools.list_leads import list_leads_tool
+from app.tools.list_target_lists import list_target_lists_tool
+from app.tools.list_users import list_users_tool
+from app.tests.conftest import StubResponse
+
+TOTAL_RECORDS = 1000
+PAGE_SIZE = 50
+
+
+class CountingEspoStub:
+    """Stand-in for `requests.request` that counts list COUNT(*) queries."""
+
+    def __init__(self):
+        self.requests = 0
+        self.count_queries = 0
+
+    def __call__(self, method, url, headers=None, **kwargs):
+        self.requests += 1
+        headers = headers or {}
+        payload = {"list": [{"id": str(i)} for i in range(PAGE_SIZE)]}
+
+        if headers.get("X-No-Total") == "true":
+            payload["total"] = -1
+        else:
+            self.count_queries += 1
+            payload["total"] = TOTAL_RECORDS
+
+        return StubResponse(payload)
+
+
+@pytest.fixture
+def espo_stub(stub_transport, stub_tenant):
+    stub = CountingEspoStub()
+    stub_transport(stub)
+    return stub
+
+
+def test_build_list_headers():
+
+    assert build_list_headers() == {}
+    assert build_list_headers(0) == {}
+    assert build_list_headers(50) == {"X-No-Total": "true"}
+    assert build_list_headers(0, True) == {"X-No-Total": "true"}
+    assert build_list_headers(50, False) == {"X-No-Total": "false"}
+
+
+@pytest.mark.parametrize(
+    "list_tool",
+    [
+        list_accounts_tool,
+        list_calls_tool,
+        list_campaigns_tool,
+        list_contacts_tool,
+        list_emails_tool,
+        list_leads_tool,
+        list_target_lists_tool,
+        list_users_tool,
+    ],
+)
+def test_traversal_counts_total_once(espo_stub, list_tool):
+
+    pages = TOTAL_RECORDS // PAGE_SIZE
+
+    first = asyncio.run(list_tool(max_size=PAGE_SIZE, offset=0))
+    assert first["data"]["total"] == TOTAL_RECORDS
+
+    for page in range(1, pages):
+        result = asyncio.run(list_tool(max_size=PAGE_SIZE, offset=page * PAGE_SIZE))
+        assert result["ok"] is True
+
+    assert espo_stub.requests == pages
+    assert espo_stub.count_queries == 1
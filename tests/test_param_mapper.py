@@ -0,0 +1,57 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from app.utils.espo_helpers import ParamMapper, build_espo_params
+from app.utils.entity_engine import compile_param_mapper, map_arguments
+
+
+def test_param_mapper_matches_build_espo_params():
+
+    arguments = {"first_name": "John", "last_name": None, "do_not_call": False}
+    params, headers, control = ParamMapper(arguments).map(arguments)
+
+    assert params == build_espo_params(arguments)
+    assert headers == {}
+    assert control == {}
+
+
+def test_param_mapper_kinds():
+
+    mapper = ParamMapper(
+        ("from_", "skip_check", "custom_fields", "format", "entity_type"),
+        aliases={"from_": "from"},
+        headers={"skip_check": "X-Skip-Duplicate-Check"},
+        raw=("custom_fields",),
+        control=("format",),
+        exclude=("entity_type",),
+    )
+
+    params, headers, control = mapper.map(
+        {
+            "from_": "john@example.com",
+            "skip_check": True,
+            "custom_fields": {"cSource": "mcp"},
+            "format": "columnar",
+            "entity_type": "Email",
+        }
+    )
+
+    assert params == {"from": "john@example.com", "cSource": "mcp"}
+    assert headers == {"X-Skip-Duplicate-Check": "true"}
+    assert control == {"format": "columnar"}
+
+
+def test_map_arguments_compiles_once():
+
+    compile_param_mapper.cache_clear()
+    arguments = {"lead_id": "abc123", "first_name": "John", "custom_fields": None}
+
+    for _ in range(3):
+        record_id, params, headers, control = map_arguments("update", arguments, "lead_id")
+
+    assert record_id == "abc123"
+    assert params == {"firstName": "John"}
+    assert compile_param_mapper.cache_info().misses == 1
+    assert compile_param_mapper.cache_info().hits == 2
@@ -0,0 +1,181 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import socket
+import time
+import pytest
+import requests
+from collections import OrderedDict
+from app.utils import prewarm
+from app.utils.credentials import credential_cache
+from urllib.parse import urlsplit
+from app.utils import dns_cache
+from app.utils.dns_cache import CachedDNSHTTPConnection, DNSCache
+from app.utils.espo_helpers import client_registry
+from app.middleware.AuthenticationMiddleware import tenant_from_headers
+from app.tests.conftest import StubResponse
+
+API_ADDRESS = "http://espo.prewarm/api/v1"
+
+
+@pytest.fixture
+def espo_stub(stub_transport, monkeypatch):
+    requests = []
+
+    def stub(method, url, **kwargs):
+        requests.append(url)
+        return StubResponse({"user": {"id": "1"}})
+
+    stub_transport(stub)
+    monkeypatch.setattr(prewarm, "PREWARM_CONNECTIONS", True)
+    credential_cache.invalidate()
+    yield requests
+    credential_cache.invalidate()
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_new_tenant_is_prewarmed_once(espo_stub):
+
+    headers = [(b"x-api-key", b"new-key"), (b"x-api-address", API_ADDRESS.encode())]
+    tenant = tenant_from_headers(headers)
+
+    assert prewarm.prewarm_tenant(tenant.api_address, tenant.api_key) is True
+    assert wait_for(lambda: not prewarm._pending)
+    assert credential_cache.lookup(API_ADDRESS, "new-key")
+    assert espo_stub == [f"{API_ADDRESS}/App/user"]
+
+    # The verified connection joined the registry
+    hits = client_registry.stats()["hits"]
+    client_registry.get_session(API_ADDRESS)
+    assert client_registry.stats()["hits"] == hits + 1
+
+    # Known pairs are not prewarmed again
+    assert prewarm.prewarm_tenant(API_ADDRESS, "new-key") is False
+    assert len(espo_stub) == 1
+
+
+def test_unknown_address_does_not_take_a_registry_slot(stub_transport, monkeypatch):
+
+    def unreachable(method, url, **kwargs):
+        unreachable.calls += 1
+        raise requests.exceptions.ConnectionError("Name or service not known")
+
+    unreachable.calls = 0
+    stub_transport(unreachable)
+    monkeypatch.setattr(prewarm, "PREWARM_CONNECTIONS", True)
+    monkeypatch.setattr(prewarm, "_failed", OrderedDict())
+    address = "http://unreachable.example.com/api/v1"
+    tenants = client_registry.stats()["tenants"]
+
+    assert prewarm.prewarm_tenant(address, "some-key") is True
+    assert wait_for(lambda: not prewarm._pending)
+    assert client_registry.stats()["tenants"] == tenants
+
+    # The address got no answer, it is not probed again for a while
+    assert prewarm.prewarm_tenant(address, "other-key") is False
+    assert unreachable.calls == 1
+
+
+def test_rate_limited_address_is_not_prewarmed(espo_stub, monkeypatch):
+
+    monkeypatch.setattr(credential_cache, "max_probes", 0)
+
+    assert prewarm.prewarm_tenant(API_ADDRESS, "guessed-key") is False
+    assert espo_stub == []
+
+
+def test_dns_cache_expiry():
+
+    lookups = []
+
+    def resolver(host, port, family, type):
+        lookups.append(host)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", port))]
+
+    cache = DNSCache(ttl=0.05, resolver=resolver)
+
+    assert cache.resolve("crm.example.com", 443) == ("10.0.0.1",)
+    assert cache.resolve("crm.example.com", 443) == ("10.0.0.1",)
+    assert lookups == ["crm.example.com"]
+
+    time.sleep(0.1)
+    cache.resolve("crm.example.com", 443)
+    assert len(lookups) == 2
+
+    # Addresses are not looked up, failures are left to urllib3
+    assert cache.resolve("127.0.0.1", 80) == ("127.0.0.1",)
+    assert cache.stats() == {"entries": 1, "ttl": 0.05, "hits": 1, "misses": 2}
+
+
+def test_dns_cache_failure_not_cached():
+
+    def resolver(host, port, family, type):
+        raise socket.gaierror("unknown host")
+
+    cache = DNSCache(resolver=resolver)
+
+    assert cache.resolve("missing.example.com", 443) == ("missing.example.com",)
+    assert cache.stats()["entries"] == 0
+
+
+def test_dns_cache_keeps_every_address():
+
+    def resolver(host, port, family, type):
+        return [
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", port)),
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.2", port)),
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", port)),
+        ]
+
+    cache = DNSCache(resolver=resolver)
+
+    assert cache.resolve("crm.example.com", 443) == ("10.0.0.1", "10.0.0.2")
+
+
+def test_dns_cache_is_bounded():
+
+    def resolver(host, port, family, type):
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", port))]
+
+    cache = DNSCache(resolver=resolver, max_entries=2)
+    for host in ("a.example.com", "b.example.com", "a.example.com", "c.example.com"):
+        cache.resolve(host, 443)
+
+    assert cache.stats()["entries"] == 2
+    cache.resolve("a.example.com", 443)
+    assert cache.stats()["hits"] == 2
+
+
+def test_connection_falls_back_to_next_address(espo_server, monkeypatch):
+
+    lookups = []
+
+    def resolver(host, port, family, type):
+        lookups.append(host)
+        # The stub only listens on 127.0.0.1, the first address refuses
+        return [
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.2", port)),
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", port)),
+        ]
+
+    cache = DNSCache(resolver=resolver)
+    monkeypatch.setattr(dns_cache, "dns_cache", cache)
+
+    connection = CachedDNSHTTPConnection("crm.stub", urlsplit(espo_server.url).port)
+    try:
+        connection.connect()
+        assert connection.sock.getpeername()[0] == "127.0.0.1"
+    finally:
+        connection.close()
+
+    # The failed address dropped the entry, the next connection looks it up again
+    assert cache.stats()["entries"] == 0
+    assert lookups == ["crm.stub"]
@@ -0,0 +1,114 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import pstats
+import threading
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+from app.utils import admin
+from app.utils.profiler import ProfilerBusyError, SamplingProfiler
+from app.utils.espo_helpers import http_build_query
+from app.services.profiler import router
+
+
+def busy_encoding(stop):
+    params = {"where": [{"type": "equals", "attribute": "name", "value": "x"}] * 20}
+    while not stop.is_set():
+        http_build_query(params)
+
+
+@pytest.fixture
+def busy_thread():
+    stop = threading.Event()
+    thread = threading.Thread(target=busy_encoding, args=(stop,), name="busy")
+    thread.start()
+    yield thread
+    stop.set()
+    thread.join()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(admin, "ESPO_ADMIN_TOKEN", "secret")
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def test_samples_busy_thread(busy_thread, tmp_path):
+    profile = SamplingProfiler(interval=0.002).run(0.2)
+
+    assert profile.samples > 0
+    collapsed = profile.collapsed()
+    assert "<thread busy>;" in collapsed
+    assert "http_build_query (" in collapsed
+
+    path = tmp_path / "profile.pstats"
+    path.write_bytes(profile.pstats())
+    stats = pstats.Stats(str(path))
+    names = {name for _, _, name in stats.stats}
+    assert {"busy_encoding", "http_build_query"} <= names
+
+    assert profile.flamegraph().startswith("<svg")
+
+
+def test_idle_threads_are_skipped():
+    stop = threading.Event()
+    thread = threading.Thread(target=stop.wait, name="idle")
+    thread.start()
+    try:
+        quiet = SamplingProfiler(interval=0.002).run(0.05)
+        noisy = SamplingProfiler(interval=0.002, include_idle=True).run(0.05)
+    finally:
+        stop.set()
+        thread.join()
+
+    assert "<thread idle>" not in quiet.collapsed()
+    assert "<thread idle>" in noisy.collapsed()
+
+
+def test_one_profile_at_a_time():
+    profiler = SamplingProfiler()
+    SamplingProfiler._running.acquire()
+    try:
+        with pytest.raises(ProfilerBusyError):
+            profiler.run(0.01)
+    finally:
+        SamplingProfiler._running.release()
+
+
+def test_endpoint_needs_admin_token(client, monkeypatch):
+    assert client.get("/admin/profile?seconds=0.01").status_code == 403
+    assert (
+        client.get(
+            "/admin/profile?seconds=0.01", headers={"X-Admin-Token": "wrong"}
+        ).status_code
+        == 403
+    )
+
+    monkeypatch.setattr(admin, "ESPO_ADMIN_TOKEN", "")
+    response = client.get(
+        "/admin/profile?seconds=0.01", headers={"X-Admin-Token": "secret"}
+    )
+    assert response.status_code == 404
+
+
+def test_endpoint_formats(client, busy_thread):
+    headers = {"X-Admin-Token": "secret"}
+
+    svg = client.get("/admin/profile?seconds=0.05&interval=0.005", headers=headers)
+    assert svg.status_code == 200
+    assert svg.headers["content-type"] == "image/svg+xml"
+
+    collapsed = client.get(
+        "/admin/profile?seconds=0.05&interval=0.005&format=collapsed", headers=headers
+    )
+    assert "<thread busy>" in collapsed.text
+
+    dump = client.get("/admin/profile?seconds=0.05&format=pstats", headers=headers)
+    assert dump.headers["content-type"] == "application/octet-stream"
+
+    assert client.get("/admin/profile?seconds=3600", headers=headers).status_code == 422
@@ -0,0 +1,130 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import asyncio
+import pytest
+from urllib.parse import parse_qs, urlsplit
+from app.tools.get_email import get_email_tool
+from app.tools.list_accounts import list_accounts_tool
+from app.utils.projections import (
+    PROFILE_FULL,
+    PROFILE_SUMMARY,
+    build_select_params,
+    default_profile,
+    projection_config,
+    resolve_attribute_select,
+)
+from app.tests.conftest import StubResponse
+
+
+def test_default_profiles():
+
+    assert default_profile("Account", "list") == PROFILE_SUMMARY
+    assert default_profile("Account", "get") == PROFILE_FULL
+
+
+def test_explicit_attribute_select_wins():
+
+    select = resolve_attribute_select("Account", ["name"], PROFILE_SUMMARY)
+    assert select == ["name"]
+
+
+def test_summary_profile_is_lean():
+
+    select = resolve_attribute_select("Email", None, None)
+
+    assert "id" in select
+    assert "status" in select
+    assert "body" not in select
+    assert "bodyPlain" not in select
+
+
+def test_full_profile_sends_no_select():
+
+    assert resolve_attribute_select("Email", None, PROFILE_FULL) is None
+    assert build_select_params("Email") == {}
+
+
+def test_custom_profile(monkeypatch):
+
+    profiles = projection_config["entities"]["Account"]["profiles"]
+    monkeypatch.setitem(profiles, "names", ("id", "name"))
+
+    assert resolve_attribute_select("Account", None, "names") == ["id", "name"]
+    assert build_select_params("Account", projection="names") == {"select": "id,name"}
+
+
+def test_unknown_profile():
+
+    with pytest.raises(ValueError):
+        resolve_attribute_select("Account", None, "doesNotExist")
+
+    # Entities without profiles fall back to every attribute by default
+    assert resolve_attribute_select("CCustomEntity", None, None) is None
+    assert resolve_attribute_select("CCustomEntity", None, PROFILE_SUMMARY) is None
+
+
+@pytest.fixture
+def recorded_urls(stub_transport, stub_tenant):
+    urls = []
+
+    def fake_request(method, url, **kwargs):
+        urls.append(url)
+        return StubResponse({"id": "email123", "status": "Sent"})
+
+    stub_transport(fake_request)
+    return urls
+
+
+def test_get_tool_attribute_select(recorded_urls):
+
+    result = asyncio.run(
+        get_email_tool(email_id="email123", attribute_select=["status"])
+    )
+    assert result["ok"] is True
+
+    query = parse_qs(urlsplit(recorded_urls[-1]).query)
+    assert query == {"select": ["status"]}
+
+
+def test_get_tool_projection(recorded_urls):
+
+    asyncio.run(get_email_tool(email_id="email123"))
+    assert urlsplit(recorded_urls[-1]).query == ""
+
+    asyncio.run(get_email_tool(email_id="email123", projection=PROFILE_SUMMARY))
+    select = parse_qs(urlsplit(recorded_urls[-1]).query)["select"][0].split(",")
+    assert "status" in select and "body" not in select
+
+
+def test_get_tool_unknown_projection(recorded_urls):
+
+    result = asyncio.run(get_email_tool(email_id="email123", projection="bogus"))
+
+    assert result["ok"] is False
+    assert result["error_type"] == "validation"
+    assert recorded_urls == []
+
+
+def test_list_tool_projection(recorded_urls):
+
+    asyncio.run(list_accounts_tool())
+    query = parse_qs(urlsplit(recorded_urls[-1]).query)
+    assert "attributeSelect[0]" not in query
+    assert "name" in query["select"][0].split(",")
+
+    asyncio.run(list_accounts_tool(attribute_select=["name", "website"]))
+    query = parse_qs(urlsplit(recorded_urls[-1]).query)
+    assert query["select"] == ["name,website"]
+
+
+def test_list_tool_unknown_projection(recorded_urls):
+
+    result = asyncio.run(list_accounts_tool(projection="doesNotExist"))
+
+    assert result["ok"] is False
+    assert result["error_type"] == "validation"
+    assert "Available: full, summary" in result["error"]
+    assert recorded_urls == []
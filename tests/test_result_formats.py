@@ -0,0 +1,99 @@
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import asyncio
+import pytest
+from app.tools.list_leads import list_leads_tool
+from app.utils.result_formats import (
+    FORMAT_COLUMNAR,
+    apply_list_format,
+    decode_columnar,
+    encode_columnar,
+)
+
+
+def make_records(count=200):
+    return [
+        {
+            "id": f"id{i:05d}",
+            "name": f"Account {i}",
+            "status": ["New", "Assigned", "Converted"][i % 3],
+            "assignedUserName": ["Admin", "Jane Doe"][i % 2],
+            "amount": i * 10,
+            "description": None if i % 5 else f"Note {i}",
+        }
+        for i in range(count)
+    ]
+
+
+def test_columnar_round_trip():
+
+    records = make_records()
+    encoded = encode_columnar(records)
+
+    assert encoded["columns"][0] == "id"
+    assert len(encoded["rows"]) == len(records)
+    assert decode_columnar(encoded) == records
+
+
+def test_low_cardinality_columns_are_dictionary_encoded():
+
+    encoded = encode_columnar(make_records())
+
+    assert encoded["dictionaries"]["status"] == ["New", "Assigned", "Converted"]
+    assert encoded["dictionaries"]["assignedUserName"] == ["Admin", "Jane Doe"]
+    assert "id" not in encoded["dictionaries"]
+    assert "name" not in encoded["dictionaries"]
+    assert "amount" not in encoded["dictionaries"]
+
+
+def test_missing_attributes_are_none():
+
+    encoded = encode_columnar([{"id": "a"}, {"id": "b", "name": "B"}])
+
+    assert encoded["columns"] == ["id", "name"]
+    assert decode_columnar(encoded) == [
+        {"id": "a", "name": None},
+        {"id": "b", "name": "B"},
+    ]
+
+
+def test_columnar_result_is_smaller():
+
+    records = make_records()
+    result = {"status_code": 200, "ok": True, "data": {"total": 200, "list": records}}
+    records_bytes = len(json.dumps(result))
+
+    result = apply_list_format(result, FORMAT_COLUMNAR)
+    columnar_bytes = len(json.dumps(result))
+
+    assert result["data"]["total"] == 200
+    assert "list" not in result["data"]
+    assert columnar_bytes < records_bytes * 0.6
+
+
+def test_apply_list_format_passthrough():
+
+    error = {"status_code": 401, "ok": False, "data": "", "error": "HTTP 401"}
+
+    assert apply_list_format(error, FORMAT_COLUMNAR) is error
+    assert apply_list_format({"data": {"list": []}}, None) == {"data": {"list": []}}
+
+    with pytest.raises(ValueError):
+        apply_list_format({"data": {"list": []}}, "xml")
+
+
+def test_list_tool_unknown_format(stub_transport, stub_tenant):
+
+    sent = []
+    stub_transport(lambda method, url, **kwargs: sent.append(url))
+
+    result = asyncio.run(list_leads_tool(format="xml"))
+
+    assert result["ok"] is False
+    assert result["error_type"] == "validation"
+    assert "Available: records, columnar" in result["error"]
+    assert sent == []
@@ -0,0 +1,98 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import asyncio
+import pytest
+from app.utils import slow_calls
+from app.utils.slow_calls import log_slow_call, phase, track_call
+from app.utils.espo_helpers import EspoAPI, TenantClientRegistry
+from app.tools.list_accounts import list_accounts_tool
+from app.tests.conftest import StubResponse
+
+ACCOUNTS = {"total": 1, "list": [{"id": "a1"}]}
+
+
+@pytest.fixture
+def slow_crm(espo_server):
+    espo_server.latency = 0.05
+    yield espo_server
+    espo_server.latency = 0.0
+
+
+def slow_call_records(app_log):
+    return [
+        record
+        for record in app_log.records
+        if getattr(record, "event", None) == "slow_call"
+    ]
+
+
+def test_phases_add_up_into_the_parent_call(app_log, monkeypatch):
+    monkeypatch.setattr(slow_calls, "ESPO_SLOW_CALL_MS", 0)
+
+    with track_call() as outer:
+        with track_call() as inner:
+            with phase("decode"):
+                pass
+            inner.add_request("GET", "Account", 200, 0.2, 100, 1)
+        assert log_slow_call("api", inner) is False
+
+    assert outer.phases["decode"] == inner.phases["decode"]
+    assert (outer.api_calls, outer.retries, outer.response_bytes) == (1, 1, 100)
+    assert log_slow_call("tool", outer, tool="t") is True
+    assert slow_call_records(app_log)[-1].fields["slowest_request"] == "GET Account"
+
+
+def test_phase_without_tracked_call_is_a_no_op():
+    with phase("decode"):
+        pass
+
+
+def test_slow_tool_call_record(app_log, stub_transport, stub_tenant, monkeypatch):
+    stub_transport(lambda method, url, **kwargs: StubResponse(ACCOUNTS))
+    monkeypatch.setattr(slow_calls, "ESPO_SLOW_CALL_MS", 0)
+
+    asyncio.run(list_accounts_tool(max_size=1))
+
+    records = slow_call_records(app_log)
+    assert len(records) == 1
+    fields = records[0].fields
+    assert fields["kind"] == "tool"
+    assert fields["tool"] == "list_accounts_tool"
+    assert fields["entity"] == "Account"
+    assert fields["host"] == "espo.stub"
+    assert fields["api_calls"] == 1
+    assert fields["response_bytes"] == len(StubResponse(ACCOUNTS).content)
+    assert fields["slowest_request"] == "GET Account"
+    for name in ("param_build", "query_encode", "download", "decode"):
+        assert f"{name}_ms" in fields
+
+
+def test_fast_calls_are_not_logged(app_log, stub_transport, stub_tenant):
+    stub_transport(lambda method, url, **kwargs: StubResponse(ACCOUNTS))
+
+    asyncio.run(list_accounts_tool(max_size=1))
+
+    assert slow_call_records(app_log) == []
+
+
+def test_slow_api_request_connection_phases(app_log, slow_crm, monkeypatch):
+    monkeypatch.setattr(slow_calls, "ESPO_SLOW_CALL_MS", 40)
+    registry = TenantClientRegistry()
+    session = registry.get_session(slow_crm.url)
+    client = EspoAPI(slow_crm.url, slow_crm.api_key, session=session)
+
+    try:
+        result = client.call_api("GET", "Account")
+    finally:
+        registry.close_all()
+
+    assert result["ok"] is True
+    fields = slow_call_records(app_log)[-1].fields
+    assert fields["kind"] == "api"
+    assert fields["endpoint"] == "Account"
+    assert fields["host"] == "127.0.0.1"
+    assert fields["ttfb_ms"] >= 40
+    assert "connect_ms" in fields
@@ -0,0 +1,88 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import asyncio
+import logging
+from core.utils.logger import logger
+from app.utils import entity_engine, structured_log
+from app.utils.structured_log import log_event, summarize
+from app.tools.list_accounts import list_accounts_tool
+from app.tests.conftest import StubResponse
+
+
+def test_disabled_level_does_no_work(monkeypatch):
+
+    def fail(*args, **kwargs):
+        raise AssertionError("summarized a field of a disabled event")
+
+    level = logger.level
+    logger.setLevel(logging.INFO)
+    monkeypatch.setattr(structured_log, "summarize", fail)
+    try:
+        assert log_event(logging.DEBUG, "tool.result", result={"ok": True}) is False
+    finally:
+        logger.setLevel(level)
+
+
+def test_result_is_summarized_by_rows_and_size(app_log):
+
+    rows = [{"id": str(i), "name": f"Account {i}"} for i in range(200)]
+    result = {
+        "status_code": 200,
+        "ok": True,
+        "data": {"total": 1000, "list": rows},
+        "error": None,
+        "error_type": None,
+    }
+
+    assert log_event(logging.DEBUG, "tool.result", entity="Account", result=result)
+
+    record = app_log.records[-1]
+    assert record.event == "tool.result"
+    summary = record.fields["result"]
+    assert summary["rows"] == 200
+    assert summary["total"] == 1000
+    assert summary["bytes"] > 5000
+    message = record.getMessage()
+    assert message.startswith("tool.result entity=Account result=")
+    assert "Account 199" not in message
+
+
+def test_summarize_keeps_small_values():
+
+    assert summarize({"name": "Acme", "max_size": 5, "select": None}) == {
+        "name": "Acme",
+        "max_size": 5,
+    }
+    assert summarize("x" * 1000) == "<1000 chars>"
+    assert summarize(["a", "b"]).startswith("<2 items, ")
+
+
+def test_sampling(app_log, monkeypatch):
+
+    monkeypatch.setattr(structured_log.random, "random", lambda: 0.5)
+    assert log_event(logging.DEBUG, "tool.result", 0.1, entity="Account") is False
+
+    monkeypatch.setattr(structured_log.random, "random", lambda: 0.05)
+    assert log_event(logging.DEBUG, "tool.result", 0.1, entity="Account") is True
+    assert app_log.records[-1].fields == {"entity": "Account", "sample_rate": 0.1}
+
+
+def test_list_tool_logs_summary(app_log, stub_transport, stub_tenant, monkeypatch):
+
+    rows = [{"id": str(i), "name": f"Account {i}"} for i in range(50)]
+    stub_transport(
+        lambda method, url, **kwargs: StubResponse({"total": 50, "list": rows})
+    )
+    monkeypatch.setattr(entity_engine, "ESPO_LOG_SAMPLE_RATE", 1.0)
+
+    result = asyncio.run(list_accounts_tool(max_size=50))
+
+    assert result["ok"] is True
+    events = [record for record in app_log.records if getattr(record, "event", None)]
+    assert events[-1].event == "tool.result"
+    assert events[-1].fields["operation"] == "list"
+    assert events[-1].fields["arguments"]["max_size"] == 50
+    assert events[-1].fields["result"]["rows"] == 50
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 from core.utils.state import global_state
@@ -17,7 +18,7 @@ def test_list_target_lists_tool(api_key_setup, setup_test_target_list):
     )
     assert is_api_key_set, "No API key set in env file."
 
-    result = list_target_lists_tool(max_size=2)
+    result = asyncio.run(list_target_lists_tool(max_size=2))
 
     assert isinstance(result, dict)
     assert "data" in result and isinstance(result["data"], dict)
@@ -37,7 +38,7 @@ def test_search_target_lists_tool(api_key_setup, setup_test_target_list):
     assert is_api_key_set, "No API key set in env file."
 
     search_term = "Test"
-    result = list_target_lists_tool(text_filter=search_term)
+    result = asyncio.run(list_target_lists_tool(text_filter=search_term))
 
     assert isinstance(result, dict)
     assert "data" in result and isinstance(result["data"], dict)
@@ -64,12 +65,12 @@ def test_create_and_delete_target_list_tool(api_key_setup):
         "description": "sample target list",
         "skip_duplicate_check": True,
     }
-    result = create_target_list_tool(**target_list_data)
+    result = asyncio.run(create_target_list_tool(**target_list_data))
 
     assert isinstance(result, dict)
     assert "status_code" in result and result["status_code"] == 200
 
-    delete = delete_target_list_tool(target_list_id=result["data"]["id"])
+    delete = asyncio.run(delete_target_list_tool(target_list_id=result["data"]["id"]))
 
     assert isinstance(delete, dict)
     assert "status_code" in delete and delete["status_code"] == 200
@@ -84,7 +85,7 @@ def test_get_target_list_tool(api_key_setup, setup_test_target_list):
     assert is_api_key_set, "No API key set in env file."
 
     target_list_id = setup_test_target_list["data"]["id"]
-    result = get_target_list_tool(target_list_id=target_list_id)
+    result = asyncio.run(get_target_list_tool(target_list_id=target_list_id))
 
     assert isinstance(result, dict)
     assert "status_code" in result and result["status_code"] == 200
@@ -103,13 +104,15 @@ def test_update_target_list_tool(api_key_setup, setup_test_target_list):
     target_list_id = setup_test_target_list["data"]["id"]
     new_name = "QA Updated Name"
 
-    res = update_target_list_tool(target_list_id=target_list_id, name=new_name)
+    res = asyncio.run(
+        update_target_list_tool(target_list_id=target_list_id, name=new_name)
+    )
     assert isinstance(res, dict)
     assert "status_code" in res and res["status_code"] == 200
     assert "ok" in res and res["ok"] is True
 
     # Fetch lead to verify updates
-    get_res = get_target_list_tool(target_list_id=target_list_id)
+    get_res = asyncio.run(get_target_list_tool(target_list_id=target_list_id))
     assert isinstance(get_res, dict)
     assert "status_code" in get_res and get_res["status_code"] == 200
     assert "ok" in get_res and get_res["ok"] is True
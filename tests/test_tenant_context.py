@@ -0,0 +1,90 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import asyncio
+import random
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from app.middleware.AuthenticationMiddleware import (
+    AuthenticationMiddleware,
+    check_access,
+    get_tenant,
+)
+from app.utils import prewarm
+from app.utils.espo_helpers import get_request_client
+
+
+@pytest.fixture(autouse=True)
+def no_prewarm(monkeypatch):
+    # The fake CRM addresses below do not exist
+    monkeypatch.setattr(prewarm, "PREWARM_CONNECTIONS", False)
+
+
+def read_credentials():
+    # Runs in a worker thread like a synchronous tool
+    client = get_request_client()
+    return {"api_key": client.api_key, "url": client.url}
+
+
+async def endpoint(request):
+    await asyncio.sleep(random.random() / 100)
+    if check_access(True):
+        return JSONResponse(check_access(True), status_code=401)
+    credentials = await asyncio.to_thread(read_credentials)
+    await asyncio.sleep(random.random() / 100)
+    credentials["tenant_key"] = get_tenant().api_key
+    return JSONResponse(credentials)
+
+
+def build_app():
+    app = Starlette(routes=[Route("/", endpoint)])
+    return AuthenticationMiddleware(app)
+
+
+async def send_requests(count):
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+
+        async def send(i):
+            headers = {
+                "X-API-KEY": f"key-{i}",
+                "X-API-ADDRESS": f"http://crm-{i}/api/v1",
+            }
+            response = await client.get("/", headers=headers)
+            return i, response.json()
+
+        return await asyncio.gather(*(send(i) for i in range(count)))
+
+
+def test_no_credential_bleed_under_concurrency():
+
+    for i, credentials in asyncio.run(send_requests(200)):
+        assert credentials == {
+            "api_key": f"key-{i}",
+            "url": f"http://crm-{i}/api/v1",
+            "tenant_key": f"key-{i}",
+        }
+
+
+def test_missing_headers():
+
+    async def send():
+        transport = httpx.ASGITransport(app=build_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            return await c.get("/", headers={"X-API-KEY": "key"})
+
+    response = asyncio.run(send())
+
+    assert response.status_code == 401
+    assert "X-API-ADDRESS" in response.json()["error"]
+
+
+def test_no_tenant_outside_requests():
+
+    assert get_tenant().is_authenticated is False
+    assert check_access() == "User has not set API key in headers."
@@ -0,0 +1,101 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import asyncio
+import contextvars
+import threading
+import time
+import pytest
+from app.utils.tool_pool import ToolPool, ToolPoolSaturatedError
+
+request_var = contextvars.ContextVar("request_var", default=None)
+
+
+def test_run_returns_result_with_caller_context():
+
+    pool = ToolPool(workers=2, max_queue=10, max_per_tenant=2)
+    token = request_var.set("caller")
+
+    try:
+        assert pool.run("tenant", lambda x: (x, request_var.get()), 1) == (1, "caller")
+    finally:
+        request_var.reset(token)
+
+    with pytest.raises(ValueError):
+        pool.run("tenant", int, "not a number")
+
+    stats = pool.stats()
+    assert stats["completed"] == 1
+    assert stats["failed"] == 1
+    assert stats["busy"] == 0
+
+
+def test_tenant_fairness():
+
+    pool = ToolPool(workers=4, max_queue=100, max_per_tenant=2)
+    release = threading.Event()
+    finished = []
+
+    def slow(name):
+        release.wait(5)
+        finished.append(name)
+
+    flood = [pool.submit("noisy", slow, f"noisy-{i}") for i in range(20)]
+    time.sleep(0.05)
+
+    # The noisy tenant holds only its share of the workers
+    assert pool.stats()["busy"] == 2
+
+    quiet = pool.submit("quiet", lambda: finished.append("quiet"))
+    quiet.result(timeout=5)
+    assert finished == ["quiet"]
+
+    release.set()
+    for future in flood:
+        future.result(timeout=5)
+
+
+def test_saturation_rejects():
+
+    pool = ToolPool(workers=1, max_queue=2, max_per_tenant=1)
+    release = threading.Event()
+
+    running = pool.submit("tenant", release.wait, 5)
+    time.sleep(0.05)
+    queued = [pool.submit("tenant", lambda: None) for _ in range(2)]
+
+    with pytest.raises(ToolPoolSaturatedError):
+        pool.submit("tenant", lambda: None)
+
+    assert pool.stats()["rejected"] == 1
+    assert pool.stats()["peak_queued"] == 2
+
+    release.set()
+    running.result(timeout=5)
+    for future in queued:
+        future.result(timeout=5)
+
+
+def test_run_async_keeps_event_loop_free():
+
+    pool = ToolPool(workers=1, max_queue=10, max_per_tenant=1)
+    release = threading.Event()
+
+    def blocking():
+        release.wait(5)
+        return request_var.get()
+
+    async def caller():
+        request_var.set("caller")
+        call = asyncio.ensure_future(pool.run_async("tenant", blocking))
+        await asyncio.sleep(0.05)
+
+        # The worker is blocked, the loop still runs this coroutine
+        assert not call.done()
+        release.set()
+        return await call
+
+    assert asyncio.run(caller()) == "caller"
+    assert pool.stats()["completed"] == 1
@@ -0,0 +1,88 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import asyncio
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+pytest.importorskip("opentelemetry.sdk")
+
+from app.utils import prewarm
+from app.utils.tracing import REQUEST_ID_HEADER, use_in_memory_exporter
+from app.utils.espo_helpers import EspoAPI, TenantClientRegistry
+from app.middleware.AuthenticationMiddleware import AuthenticationMiddleware
+from app.tools.get_contact import get_contact_tool
+from app.tests.conftest import StubResponse
+
+
+@pytest.fixture
+def exporter():
+    return use_in_memory_exporter()
+
+
+def spans_by_name(exporter):
+    return {span.name: span for span in exporter.get_finished_spans()}
+
+
+def test_tool_spans_and_request_id(exporter, stub_transport, stub_tenant):
+    sent = []
+
+    def stub(method, url, headers=None, **kwargs):
+        sent.append(headers)
+        return StubResponse({"id": "c1"})
+
+    stub_transport(stub)
+    asyncio.run(get_contact_tool(contact_id="c1"))
+
+    spans = spans_by_name(exporter)
+    tool = spans["tool get_contact_tool"]
+    call = spans["EspoAPI.call_api"]
+
+    assert call.parent.span_id == tool.context.span_id
+    assert spans["decode"].parent.span_id == call.context.span_id
+    assert call.attributes["espo.endpoint"] == "Contact/{id}"
+    assert call.attributes["http.status_code"] == 200
+    assert tool.attributes["espo.entity"] == "Contact"
+
+    trace_id = format(call.context.trace_id, "032x")
+    assert sent[-1][REQUEST_ID_HEADER] == trace_id
+    assert trace_id in sent[-1]["traceparent"]
+
+
+def test_connection_phase_spans(exporter, espo_server):
+
+    session = TenantClientRegistry().get_session(espo_server.url)
+    client = EspoAPI(espo_server.url, espo_server.api_key, session=session)
+
+    assert client.call_api("GET", "Account")["ok"] is True
+    assert client.call_api("GET", "Account")["ok"] is True
+
+    names = [span.name for span in exporter.get_finished_spans()]
+    # The second call reuses the pooled connection
+    assert names.count("connect") == 1
+    assert names.count("send") == 2
+    assert names.count("wait") == 2
+    assert names.count("download") == 2
+
+
+def test_middleware_span(exporter, monkeypatch):
+    monkeypatch.setattr(prewarm, "PREWARM_CONNECTIONS", False)
+
+    async def endpoint(request):
+        return PlainTextResponse("ok")
+
+    async def send():
+        app = AuthenticationMiddleware(Starlette(routes=[Route("/", endpoint)]))
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            return await c.get("/", headers={"X-API-KEY": "k"})
+
+    assert asyncio.run(send()).text == "ok"
+
+    span = spans_by_name(exporter)["AuthenticationMiddleware"]
+    assert span.attributes["espo.authenticated"] is False
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 import pytest
@@ -17,7 +18,7 @@ def test_list_users_tool(api_key_setup):
     )
     assert is_api_key_set, "No API key set in env file."
 
-    result = list_users_tool(max_size=2)
+    result = asyncio.run(list_users_tool(max_size=2))
 
     assert isinstance(result, dict)
     assert "data" in result and isinstance(result["data"], dict)
@@ -37,7 +38,7 @@ def test_search_leads_tool(api_key_setup):
     assert is_api_key_set, "No API key set in env file."
 
     search_term = "admin"
-    result = list_users_tool(text_filter=search_term)
+    result = asyncio.run(list_users_tool(text_filter=search_term))
 
     assert isinstance(result, dict)
     assert "data" in result and isinstance(result["data"], dict)
@@ -55,7 +56,7 @@ def test_get_user_tool(api_key_setup):
     assert is_api_key_set, "No API key set in env file."
 
     search_term = "admin"
-    result = list_users_tool(text_filter=search_term)
+    result = asyncio.run(list_users_tool(text_filter=search_term))
 
     assert isinstance(result, dict)
     assert "data" in result and isinstance(result["data"], dict)
@@ -65,7 +66,7 @@ def test_get_user_tool(api_key_setup):
     assert data["total"] >= 1
 
     fixture_id = data["list"][0]["id"]
-    get_result = get_user_tool(user_id=fixture_id)
+    get_result = asyncio.run(get_user_tool(user_id=fixture_id))
     assert isinstance(get_result, dict)
     assert "status_code" in get_result and get_result["status_code"] == 200
     assert "ok" in get_result and get_result["ok"] is True
@@ -1,15 +1,14 @@
 from typing import Dict, Any, List, Optional, Annotated
-from core.utils.logger import logger
-from core.utils.state import global_state
-from app.utils.espo_helpers import EspoAPI, build_espo_params
-from app.middleware.AuthenticationMiddleware import check_access
 from pydantic import Field
 from core.utils.tools import doc_tag, doc_name
+from app.utils.lazy import lazy_import
+
+entity_engine = lazy_import("app.utils.entity_engine")
 
 
 @doc_tag("Calls")
 @doc_name("Create Call")
-def create_call_tool(
+async def create_call_tool(
     name: Annotated[
         Optional[str], Field(description="A one-line string. <= 255 characters")
     ] = None,
@@ -166,36 +165,4 @@ def create_call_tool(
     - A structured dict containing the API response with keys:
       `status_code`, `ok`, `data`, `error`, and `error_type`.
     """
-    logger.info(f"Request received to create call with params: {locals()}")
-
-    # Check api key and address are set in headers
-    auth_response = check_access(True)
-    if auth_response:
-        return auth_response
-
-    # Exclude header-only params from request body
-    params = build_espo_params(
-        locals(),
-        exclude={"duplicate_source_id", "skip_duplicate_check", "auth_response"},
-    )
-
-    extra_headers = {}
-    if duplicate_source_id:
-        extra_headers["X-Duplicate-Source-Id"] = str(duplicate_source_id)
-    if skip_duplicate_check is not None:
-        extra_headers["X-Skip-Duplicate-Check"] = (
-            "true" if skip_duplicate_check else "false"
-        )
-
-    api_key = global_state.get("api_key")
-    api_address = global_state.get("api_address")
-    client = EspoAPI(api_address, api_key)
-
-    result = client.call_api(
-        "POST",
-        "Call",
-        params=params,
-        extra_headers=extra_headers if extra_headers else None,
-    )
-    logger.debug(f"EspoCRM create call result: {result}")
-    return result
+    return await entity_engine.create_record("Call", locals(), tool="create_call_tool")
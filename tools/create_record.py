@@ -0,0 +1,57 @@
+from typing import Dict, Any, Optional, Annotated
+from pydantic import Field
+from core.utils.tools import doc_tag, doc_name
+from app.utils.lazy import lazy_import
+
+entity_engine = lazy_import("app.utils.entity_engine")
+
+
+@doc_tag("Records")
+@doc_name("Create Record")
+async def create_record_tool(
+    entity_type: Annotated[
+        str,
+        Field(
+            description="EspoCRM entity type, including custom entities (e.g. CProject)."
+        ),
+    ],
+    attributes: Annotated[
+        Dict[str, Any],
+        Field(description="Record attributes using EspoCRM names (e.g. name, cStage)"),
+    ],
+    duplicate_source_id: Annotated[
+        Optional[str],
+        Field(
+            description="Record ID being duplicated, sent as X-Duplicate-Source-Id header"
+        ),
+    ] = None,
+    skip_duplicate_check: Annotated[
+        Optional[bool],
+        Field(
+            description="Skip duplicate check, sent as X-Skip-Duplicate-Check header"
+        ),
+    ] = None,
+) -> Dict:
+    """
+    Create a record of any EspoCRM entity type.
+
+    Use this tool for custom entities and entity types without dedicated tools. The
+    entity type is checked against the EspoCRM metadata of the instance and the
+    attributes are validated locally (enum options, max lengths, required fields).
+
+    Args:
+    - `entity_type` (str): EspoCRM entity type, e.g. `CProject` or `Opportunity`.
+    - `attributes` (Dict[str, Any]): Attributes to set, using EspoCRM attribute names.
+    - `duplicate_source_id` (Optional[str]): Record ID being duplicated. Sent as header `X-Duplicate-Source-Id`.
+    - `skip_duplicate_check` (Optional[bool]): Skip duplicate check, sent as header `X-Skip-Duplicate-Check`.
+
+    Example Request:
+    - create_record_tool(entity_type="CProject", attributes={"name": "Website relaunch", "cStage": "Planning"})
+
+    Returns:
+    - A structured dict containing the API response with keys:
+    `status_code`, `ok`, `data`, `error`, and `error_type`.
+    """
+    return await entity_engine.create_record(
+        entity_type, locals(), tool="create_record_tool"
+    )
@@ -1,15 +1,14 @@
 from typing import Dict, Annotated
-from core.utils.logger import logger
-from core.utils.state import global_state
-from app.utils.espo_helpers import EspoAPI
-from app.middleware.AuthenticationMiddleware import check_access
 from pydantic import Field
 from core.utils.tools import doc_tag, doc_name
+from app.utils.lazy import lazy_import
+
+entity_engine = lazy_import("app.utils.entity_engine")
 
 
 @doc_tag("Calls")
 @doc_name("Delete Call")
-def delete_call_tool(
+async def delete_call_tool(
     call_id: Annotated[str, Field(description="ID of the Call record to delete")],
 ) -> Dict:
     """
@@ -25,18 +24,6 @@ def delete_call_tool(
     - A structured dict containing the API response with keys:
     `status_code`, `ok`, `data`, `error`, and `error_type`.
     """
-    logger.info(f"Request received to delete call with id={call_id}")
-
-    # Verify API configuration and access
-    auth_response = check_access(True)
-    if auth_response:
-        return auth_response
-
-    api_key = global_state.get("api_key")
-    api_address = global_state.get("api_address")
-    client = EspoAPI(api_address, api_key)
-
-    # Use canonical instance method which returns a structured dict
-    result = client.call_api("DELETE", f"Call/{call_id}")
-    logger.debug(f"EspoCRM delete call result: {result}")
-    return result
+    return await entity_engine.delete_record(
+        "Call", locals(), "call_id", tool="delete_call_tool"
+    )
@@ -1,15 +1,14 @@
 from typing import Dict, Annotated
-from core.utils.logger import logger
-from core.utils.state import global_state
-from app.utils.espo_helpers import EspoAPI
-from app.middleware.AuthenticationMiddleware import check_access
 from pydantic import Field
 from core.utils.tools import doc_tag, doc_name
+from app.utils.lazy import lazy_import
+
+entity_engine = lazy_import("app.utils.entity_engine")
 
 
 @doc_tag("Campaigns")
 @doc_name("Delete Campaign")
-def delete_campaign_tool(
+async def delete_campaign_tool(
     campaign_id: Annotated[
         str, Field(description="ID of the Campaign record to delete")
     ],
@@ -27,18 +26,6 @@ def delete_campaign_tool(
     - A structured dict containing the API response with keys:
       `status_code`, `ok`, `data`, `error`, and `error_type`.
     """
-    logger.info(f"Request received to delete campaign with id={campaign_id}")
-
-    # Verify API configuration and access
-    auth_response = check_access(True)
-    if auth_response:
-        return auth_response
-
-    api_key = global_state.get("api_key")
-    api_address = global_state.get("api_address")
-    client = EspoAPI(api_address, api_key)
-
-    # Call EspoCRM DELETE endpoint for the campaign
-    result = client.call_api("DELETE", f"Campaign/{campaign_id}")
-    logger.debug(f"EspoCRM delete campaign result: {result}")
-    return result
+    return await entity_engine.delete_record(
+        "Campaign", locals(), "campaign_id", tool="delete_campaign_tool"
+    )
@@ -0,0 +1,36 @@
+from typing import Dict, Annotated
+from pydantic import Field
+from core.utils.tools import doc_tag, doc_name
+from app.utils.lazy import lazy_import
+
+entity_engine = lazy_import("app.utils.entity_engine")
+
+
+@doc_tag("Records")
+@doc_name("Delete Record")
+async def delete_record_tool(
+    entity_type: Annotated[
+        str,
+        Field(
+            description="EspoCRM entity type, including custom entities (e.g. CProject)."
+        ),
+    ],
+    record_id: Annotated[str, Field(description="ID of the record to delete")],
+) -> Dict:
+    """
+    Remove a record of any EspoCRM entity type.
+
+    Args:
+    - `entity_type` (str): EspoCRM entity type, e.g. `CProject` or `Opportunity`.
+    - `record_id` (str): ID of the record to remove.
+
+    Example Request:
+    - delete_record_tool(entity_type="CProject", record_id="abc123")
+
+    Returns:
+    - A structured dict containing the API response with keys:
+    `status_code`, `ok`, `data`, `error`, and `error_type`.
+    """
+    return await entity_engine.delete_record(
+        entity_type, locals(), "record_id", tool="delete_record_tool"
+    )
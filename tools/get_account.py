@@ -1,18 +1,41 @@
-from typing import Dict, Annotated
-from core.utils.logger import logger
-from core.utils.state import global_state
-from app.utils.espo_helpers import EspoAPI
-from app.middleware.AuthenticationMiddleware import check_access
+from typing import Dict, Optional, List, Annotated
 from core.utils.tools import doc_tag, doc_name
+from app.utils.lazy import lazy_import
 from pydantic import Field
 
+entity_engine = lazy_import("app.utils.entity_engine")
+
 
 @doc_tag("Accounts")
 @doc_name("Read Account")
-def get_account_tool(
+async def get_account_tool(
     account_id: Annotated[
         str, Field(description="ID of the Account record to retrieve")
     ],
+    attribute_select: Annotated[
+        Optional[List[str]],
+        Field(
+            description="Attributes to return, sent as EspoCRM 'select'. Use to keep the response small."
+        ),
+    ] = None,
+    projection: Annotated[
+        Optional[str],
+        Field(
+            description="Projection profile used when attribute_select is omitted: 'full' (default), 'summary' or a custom profile."
+        ),
+    ] = None,
+    max_bytes: Annotated[
+        Optional[int],
+        Field(
+            description="Response size budget in bytes. Long text fields are trimmed to fit."
+        ),
+    ] = None,
+    max_tokens: Annotated[
+        Optional[int],
+        Field(
+            description="Response size budget in tokens (about 4 bytes each). Same as max_bytes."
+        ),
+    ] = None,
 ) -> Dict:
     """
     Read a single Account record by ID from EspoCRM.
@@ -23,6 +46,10 @@ def get_account_tool(
 
     Args:
     - `account_id` (str): The ID of the Account record to fetch.
+    - `attribute_select` (Optional[List[str]]): Attributes to return, sent as EspoCRM `select`.
+    - `projection` (Optional[str]): Projection profile used when `attribute_select` is omitted ('full', 'summary' or custom).
+    - `max_bytes` (Optional[int]): Response size budget in bytes. When exceeded, long text fields are trimmed and listed in `truncation`.
+    - `max_tokens` (Optional[int]): Response size budget in tokens (about 4 bytes per token).
 
     Example Request:
     - Fetch an account by ID:
@@ -32,20 +59,6 @@ def get_account_tool(
     - A structured dict containing the API response with keys:
     `status_code`, `ok`, `data`, `error`, and `error_type`.
     """
-    logger.info(f"Request received to fetch account id={account_id}")
-
-    # Core: verify API key and access permissions
-    auth_response = check_access(True)
-    if auth_response:
-        return auth_response
-
-    # Core: initialize API client
-    api_key = global_state.get("api_key")
-    api_address = global_state.get("api_address")
-    client = EspoAPI(api_address, api_key)
-
-    # Core: call EspoCRM API to read Account
-    result = client.call_api("GET", f"Account/{account_id}")
-    logger.debug(f"EspoCRM get account result: {result}")
-
-    return result
+    return await entity_engine.get_record(
+        "Account", locals(), "account_id", tool="get_account_tool"
+    )
@@ -1,18 +1,41 @@
-from typing import Dict, Any, Optional, Annotated
-from core.utils.logger import logger
-from core.utils.state import global_state
-from app.utils.espo_helpers import EspoAPI
-from app.middleware.AuthenticationMiddleware import check_access
+from typing import Dict, Any, Optional, List, Annotated
 from pydantic import Field
 from core.utils.tools import doc_tag, doc_name
+from app.utils.lazy import lazy_import
+
+entity_engine = lazy_import("app.utils.entity_engine")
 
 
 @doc_tag("Contacts")
 @doc_name("Read Contact")
-def get_contact_tool(
+async def get_contact_tool(
     contact_id: Annotated[
         str, Field(description="The ID of the Contact record to retrieve")
     ],
+    attribute_select: Annotated[
+        Optional[List[str]],
+        Field(
+            description="Attributes to return, sent as EspoCRM 'select'. Use to keep the response small."
+        ),
+    ] = None,
+    projection: Annotated[
+        Optional[str],
+        Field(
+            description="Projection profile used when attribute_select is omitted: 'full' (default), 'summary' or a custom profile."
+        ),
+    ] = None,
+    max_bytes: Annotated[
+        Optional[int],
+        Field(
+            description="Response size budget in bytes. Long text fields are trimmed to fit."
+        ),
+    ] = None,
+    max_tokens: Annotated[
+        Optional[int],
+        Field(
+            description="Response size budget in tokens (about 4 bytes each). Same as max_bytes."
+        ),
+    ] = None,
 ) -> Dict:
     """
     Read an existing Contact record in EspoCRM.
@@ -21,6 +44,10 @@ def get_contact_tool(
 
     Args:
     - `contact_id` (str): The ID of the Contact record.
+    - `attribute_select` (Optional[List[str]]): Attributes to return, sent as EspoCRM `select`.
+    - `projection` (Optional[str]): Projection profile used when `attribute_select` is omitted ('full', 'summary' or custom).
+    - `max_bytes` (Optional[int]): Response size budget in bytes. When exceeded, long text fields are trimmed and listed in `truncation`.
+    - `max_tokens` (Optional[int]): Response size budget in tokens (about 4 bytes per token).
 
     Example Requests:
     - Read a contact by ID: read_contact_tool(contact_id="abc123")
@@ -29,15 +56,6 @@ def get_contact_tool(
     - A structured dict containing the API response with keys:
       `status_code`, `ok`, `data`, `error`, and `error_type`.
     """
-    logger.info(f"Request received to read Contact with id: {contact_id}")
-    auth_response = check_access(True)
-    if auth_response:
-        return auth_response
-
-    api_key = global_state.get("api_key")
-    api_address = global_state.get("api_address")
-    client = EspoAPI(api_address, api_key)
-
-    result = client.call_api("GET", f"Contact/{contact_id}")
-    logger.debug(f"EspoCRM read contact result: {result}")
-    return result
+    return await entity_engine.get_record(
+        "Contact", locals(), "contact_id", tool="get_contact_tool"
+    )
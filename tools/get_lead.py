@@ -1,22 +1,49 @@
-from typing import Dict, Annotated
-from core.utils.logger import logger
-from core.utils.state import global_state
-from app.utils.espo_helpers import EspoAPI
-from app.middleware.AuthenticationMiddleware import check_access
+from typing import Dict, Optional, List, Annotated
 from core.utils.tools import doc_tag, doc_name
+from app.utils.lazy import lazy_import
 from pydantic import Field
 
+entity_engine = lazy_import("app.utils.entity_engine")
+
 
 @doc_tag("Leads")
 @doc_name("Read Lead")
-def get_lead_tool(
+async def get_lead_tool(
     lead_id: Annotated[str, Field(description="ID of the Lead record to retrieve")],
+    attribute_select: Annotated[
+        Optional[List[str]],
+        Field(
+            description="Attributes to return, sent as EspoCRM 'select'. Use to keep the response small."
+        ),
+    ] = None,
+    projection: Annotated[
+        Optional[str],
+        Field(
+            description="Projection profile used when attribute_select is omitted: 'full' (default), 'summary' or a custom profile."
+        ),
+    ] = None,
+    max_bytes: Annotated[
+        Optional[int],
+        Field(
+            description="Response size budget in bytes. Long text fields are trimmed to fit."
+        ),
+    ] = None,
+    max_tokens: Annotated[
+        Optional[int],
+        Field(
+            description="Response size budget in tokens (about 4 bytes each). Same as max_bytes."
+        ),
+    ] = None,
 ) -> Dict:
     """
     Get a single Lead record by ID from EspoCRM.
 
     Args:
     - `lead_id` (str): The ID of the Lead to fetch.
+    - `attribute_select` (Optional[List[str]]): Attributes to return, sent as EspoCRM `select`.
+    - `projection` (Optional[str]): Projection profile used when `attribute_select` is omitted ('full', 'summary' or custom).
+    - `max_bytes` (Optional[int]): Response size budget in bytes. When exceeded, long text fields are trimmed and listed in `truncation`.
+    - `max_tokens` (Optional[int]): Response size budget in tokens (about 4 bytes per token).
 
     Example Request:
     - get_lead_tool(lead_id="abc123")
@@ -25,18 +52,6 @@ def get_lead_tool(
     - A structured dict containing the API response with keys:
       `status_code`, `ok`, `data`, `error`, and `error_type`.
     """
-    logger.info(f"Request received to fetch lead id={lead_id}")
-
-    # Verify API configuration and access
-    auth_response = check_access(True)
-    if auth_response:
-        return auth_response
-
-    api_key = global_state.get("api_key")
-    api_address = global_state.get("api_address")
-    client = EspoAPI(api_address, api_key)
-
-    # Use the canonical instance method which returns a structured dict
-    result = client.call_api("GET", f"Lead/{lead_id}")
-    logger.debug(f"EspoCRM get lead result: {result}")
-    return result
+    return await entity_engine.get_record(
+        "Lead", locals(), "lead_id", tool="get_lead_tool"
+    )
@@ -0,0 +1,67 @@
+from typing import Dict, Optional, List, Annotated
+from pydantic import Field
+from core.utils.tools import doc_tag, doc_name
+from app.utils.lazy import lazy_import
+
+entity_engine = lazy_import("app.utils.entity_engine")
+
+
+@doc_tag("Records")
+@doc_name("Read Record")
+async def get_record_tool(
+    entity_type: Annotated[
+        str,
+        Field(
+            description="EspoCRM entity type, including custom entities (e.g. CProject)."
+        ),
+    ],
+    record_id: Annotated[str, Field(description="ID of the record to retrieve")],
+    attribute_select: Annotated[
+        Optional[List[str]],
+        Field(
+            description="Attributes to return, sent as EspoCRM 'select'. Use to keep the response small."
+        ),
+    ] = None,
+    projection: Annotated[
+        Optional[str],
+        Field(
+            description="Projection profile used when attribute_select is omitted: 'full' (default), 'summary' or a custom profile."
+        ),
+    ] = None,
+    max_bytes: Annotated[
+        Optional[int],
+        Field(
+            description="Response size budget in bytes. Long text fields are trimmed to fit."
+        ),
+    ] = None,
+    max_tokens: Annotated[
+        Optional[int],
+        Field(
+            description="Response size budget in tokens (about 4 bytes each). Same as max_bytes."
+        ),
+    ] = None,
+) -> Dict:
+    """
+    Read a single record of any EspoCRM entity type by ID.
+
+    Use this tool for custom entities and entity types without dedicated tools. The
+    entity type is checked against the EspoCRM metadata of the instance.
+
+    Args:
+    - `entity_type` (str): EspoCRM entity type, e.g. `CProject` or `Opportunity`.
+    - `record_id` (str): The ID of the record to fetch.
+    - `attribute_select` (Optional[List[str]]): Attributes to return, sent as EspoCRM `select`.
+    - `projection` (Optional[str]): Projection profile used when `attribute_select` is omitted ('full', 'summary' or custom).
+    - `max_bytes` (Optional[int]): Response size budget in bytes. When exceeded, long text fields are trimmed and listed in `truncation`.
+    - `max_tokens` (Optional[int]): Response size budget in tokens (about 4 bytes per token).
+
+    Example Request:
+    - get_record_tool(entity_type="CProject", record_id="abc123")
+
+    Returns:
+    - A structured dict containing the API response with keys:
+    `status_code`, `ok`, `data`, `error`, and `error_type`.
+    """
+    return await entity_engine.get_record(
+        entity_type, locals(), "record_id", tool="get_record_tool"
+    )
@@ -1,15 +1,14 @@
 from typing import Optional, Dict, Any, List, Annotated
-from core.utils.logger import logger
-from core.utils.state import global_state
-from app.utils.espo_helpers import EspoAPI, build_espo_params
-from app.middleware.AuthenticationMiddleware import check_access
 from pydantic import Field
 from core.utils.tools import doc_tag, doc_name
+from app.utils.lazy import lazy_import
+
+entity_engine = lazy_import("app.utils.entity_engine")
 
 
 @doc_tag("Accounts")
 @doc_name("List Accounts")
-def list_accounts_tool(
+async def list_accounts_tool(
     # Core query controls
     attribute_select: Annotated[
         Optional[List[str]],
@@ -17,6 +16,12 @@ def list_accounts_tool(
             description="Attributes to return. Use to limit fields and improve performance."
         ),
     ] = None,
+    projection: Annotated[
+        Optional[str],
+        Field(
+            description="Projection profile used when attribute_select is omitted: 'summary' (default), 'full' or a custom profile."
+        ),
+    ] = None,
     bool_filter_list: Annotated[
         Optional[List[str]],
         Field(description="Boolean filter flags (e.g. ['onlyMy'])."),
@@ -54,7 +59,25 @@ def list_accounts_tool(
     no_total: Annotated[
         Optional[bool],
         Field(
-            description="Disable total count. Sent as header 'X-No-Total' (true/false)."
+            description="Disable total count. Sent as header 'X-No-Total' (true/false). Defaults to true on pages after the first."
+        ),
+    ] = None,
+    max_bytes: Annotated[
+        Optional[int],
+        Field(
+            description="Response size budget in bytes. Long text fields are trimmed and trailing rows dropped to fit."
+        ),
+    ] = None,
+    max_tokens: Annotated[
+        Optional[int],
+        Field(
+            description="Response size budget in tokens (about 4 bytes each). Same as max_bytes."
+        ),
+    ] = None,
+    format: Annotated[
+        Optional[str],
+        Field(
+            description="Result format: 'records' (default) or 'columnar' ({columns, rows, dictionaries}) to cut response size."
         ),
     ] = None,
 ) -> Dict:
@@ -67,6 +90,7 @@ def list_accounts_tool(
 
     Args:
     - `attribute_select` (Optional[List[str]]): Attributes to include in the response.
+    - `projection` (Optional[str]): Projection profile used when `attribute_select` is omitted ('summary', 'full' or custom).
     - `bool_filter_list` (Optional[List[str]]): Boolean filters (e.g. ['onlyMy']).
     - `max_size` (Optional[int]): Maximum number of records to return (0–200).
     - `offset` (Optional[int]): Pagination offset (0-based).
@@ -75,7 +99,10 @@ def list_accounts_tool(
     - `primary_filter` (Optional[str]): Primary filter (customers, resellers, partners, recentlyCreated).
     - `text_filter` (Optional[str]): Text search query (supports '*').
     - `where_group` (Optional[List[Dict[str, Any]]]): Advanced deepObject filters.
-    - `no_total` (Optional[bool]): Disable total count calculation.
+    - `no_total` (Optional[bool]): Disable total count calculation. Defaults to true when `offset` > 0.
+    - `max_bytes` (Optional[int]): Response size budget in bytes. When exceeded, long text fields are trimmed, trailing rows dropped and `truncation.next_offset` tells where to continue.
+    - `max_tokens` (Optional[int]): Response size budget in tokens (about 4 bytes per token).
+    - `format` (Optional[str]): 'records' (default) or 'columnar'. Columnar returns `columns`, `rows` and `dictionaries` for low-cardinality fields.
 
     Example Requests:
     - List first 50 accounts with selected fields:
@@ -91,30 +118,6 @@ def list_accounts_tool(
     - A structured dict containing:
       `total`, `list`, `status_code`, `ok`, `error`, and `error_type`.
     """
-    logger.debug(f"Request received to list accounts with params: {locals()}")
-
-    # Check API key and access
-    auth_response = check_access(True)
-    if auth_response:
-        return auth_response
-
-    # Build query params (exclude header-only values)
-    params = build_espo_params(locals(), exclude={"auth_response", "no_total"})
-
-    # Optional headers
-    extra_headers = {}
-    if no_total is not None:
-        extra_headers["X-No-Total"] = "true" if no_total else "false"
-
-    api_key = global_state.get("api_key")
-    api_address = global_state.get("api_address")
-    client = EspoAPI(api_address, api_key)
-
-    result = client.call_api(
-        "GET",
-        "Account",
-        params=params,
-        extra_headers=extra_headers if extra_headers else None,
+    return await entity_engine.list_records(
+        "Account", locals(), tool="list_accounts_tool"
     )
-    logger.debug(f"EspoCRM list accounts result: {result}")
-    return result
@@ -1,21 +1,26 @@
 from typing import Dict, Any, List, Optional, Union, Annotated
-from core.utils.logger import logger
-from core.utils.state import global_state
-from app.utils.espo_helpers import EspoAPI, build_espo_params
-from app.middleware.AuthenticationMiddleware import check_access
 from pydantic import Field
 from core.utils.tools import doc_tag, doc_name
+from app.utils.lazy import lazy_import
+
+entity_engine = lazy_import("app.utils.entity_engine")
 
 
 @doc_tag("Contacts")
 @doc_name("List Contacts")
-def list_contacts_tool(
+async def list_contacts_tool(
     attribute_select: Annotated[
         Optional[List[str]],
         Field(
             description="Attributes to return. Only select necessary ones to improve performance"
         ),
     ] = None,
+    projection: Annotated[
+        Optional[str],
+        Field(
+            description="Projection profile used when attribute_select is omitted: 'summary' (default), 'full' or a custom profile."
+        ),
+    ] = None,
     bool_filter_list: Annotated[
         Optional[List[str]], Field(description="Bool filters. Allowed value: onlyMy")
     ] = None,
@@ -53,7 +58,27 @@ def list_contacts_tool(
     ] = None,
     x_no_total: Annotated[
         Optional[bool],
-        Field(description="Disable calculation of total number of records"),
+        Field(
+            description="Disable calculation of total number of records. Defaults to true on pages after the first"
+        ),
+    ] = None,
+    max_bytes: Annotated[
+        Optional[int],
+        Field(
+            description="Response size budget in bytes. Long text fields are trimmed and trailing rows dropped to fit."
+        ),
+    ] = None,
+    max_tokens: Annotated[
+        Optional[int],
+        Field(
+            description="Response size budget in tokens (about 4 bytes each). Same as max_bytes."
+        ),
+    ] = None,
+    format: Annotated[
+        Optional[str],
+        Field(
+            description="Result format: 'records' (default) or 'columnar' ({columns, rows, dictionaries}) to cut response size."
+        ),
     ] = None,
 ) -> Dict:
     """
@@ -63,6 +88,7 @@ def list_contacts_tool(
 
     Args:
     - `attribute_select` (Optional[List[str]]): Attributes to return. Allowed values: salutationName, firstName, lastName, middleName, name, accountAnyId, title, description, emailAddressIsOptedOut, emailAddressIsInvalid, emailAddress, emailAddressData, phoneNumberIsOptedOut, phoneNumberIsInvalid, phoneNumber, phoneNumberData, doNotCall, addressStreet, addressCity, addressState, addressCountry, addressPostalCode, accountId, accountName, accountsIds, accountsColumns, accountsNames, accountRole, accountIsInactive, accountType, opportunityRole, acceptanceStatus, acceptanceStatusMeetings, acceptanceStatusCalls, campaignId, campaignName, createdAt, modifiedAt, createdById, createdByName, modifiedById, modifiedByName, assignedUserId, assignedUserName, teamsIds, teamsNames, targetListsIds, targetListsNames, targetListId, targetListName, portalUserId, portalUserName, hasPortalUser, originalLeadId, originalLeadName, targetListIsOptedOut, originalEmailId, originalEmailName, addressMap, streamUpdatedAt
+    - `projection` (Optional[str]): Projection profile used when `attribute_select` is omitted ('summary', 'full' or custom).
     - `bool_filter_list` (Optional[List[str]]): Boolean filters. Allowed: onlyMy
     - `max_size` (Optional[int]): Max records to return (0-200)
     - `offset` (Optional[int]): Pagination offset
@@ -74,7 +100,10 @@ def list_contacts_tool(
     - `type_filter` (Optional[str]): Record type
     - `date_time` (Optional[bool]): Set true for date-time fields
     - `time_zone` (Optional[str]): Time zone for date-time fields
-    - `x_no_total` (Optional[bool]): Disable total count calculation
+    - `x_no_total` (Optional[bool]): Disable total count calculation. Defaults to true when `offset` > 0
+    - `max_bytes` (Optional[int]): Response size budget in bytes. When exceeded, long text fields are trimmed, trailing rows dropped and `truncation.next_offset` tells where to continue.
+    - `max_tokens` (Optional[int]): Response size budget in tokens (about 4 bytes per token).
+    - `format` (Optional[str]): 'records' (default) or 'columnar'. Columnar returns `columns`, `rows` and `dictionaries` for low-cardinality fields.
 
     Example Requests:
     - List first 50 contacts: list_contacts_tool(max_size=50)
@@ -84,26 +113,6 @@ def list_contacts_tool(
     Returns:
     - A structured dict containing the API response with keys: `status_code`, `ok`, `data`, `error`, `error_type`, `total`.
     """
-    logger.info(f"Request received to list contacts with params: {locals()}")
-    auth_response = check_access(True)
-    if auth_response:
-        return auth_response
-
-    params = build_espo_params(locals(), exclude={"auth_response"})
-    extra_headers = {}
-
-    if x_no_total is not None:
-        extra_headers["X-No-Total"] = "true" if x_no_total else "false"
-
-    api_key = global_state.get("api_key")
-    api_address = global_state.get("api_address")
-    client = EspoAPI(api_address, api_key)
-
-    result = client.call_api(
-        "GET",
-        "Contact",
-        params=params,
-        extra_headers=extra_headers if extra_headers else None,
+    return await entity_engine.list_records(
+        "Contact", locals(), tool="list_contacts_tool"
     )
-    logger.debug(f"EspoCRM list contacts result: {result}")
-    return result
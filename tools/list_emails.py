@@ -1,21 +1,26 @@
 from typing import Optional, Dict, Any, List, Annotated
-from core.utils.logger import logger
-from core.utils.state import global_state
-from app.utils.espo_helpers import EspoAPI, build_espo_params
-from app.middleware.AuthenticationMiddleware import check_access
 from pydantic import Field
 from core.utils.tools import doc_tag, doc_name
+from app.utils.lazy import lazy_import
+
+entity_engine = lazy_import("app.utils.entity_engine")
 
 
 @doc_tag("Emails")
 @doc_name("List Emails")
-def list_emails_tool(
+async def list_emails_tool(
     attribute_select: Annotated[
         Optional[List[str]],
         Field(
             description="List of Email attributes to return. Select only necessary fields to improve performance."
         ),
     ] = None,
+    projection: Annotated[
+        Optional[str],
+        Field(
+            description="Projection profile used when attribute_select is omitted: 'summary' (default), 'full' or a custom profile."
+        ),
+    ] = None,
     max_size: Annotated[
         Optional[int],
         Field(
@@ -41,12 +46,31 @@ def list_emails_tool(
     primary_filter: Annotated[
         Optional[str], Field(description="Primary filter if needed.")
     ] = None,
+    max_bytes: Annotated[
+        Optional[int],
+        Field(
+            description="Response size budget in bytes. Long text fields are trimmed and trailing rows dropped to fit."
+        ),
+    ] = None,
+    max_tokens: Annotated[
+        Optional[int],
+        Field(
+            description="Response size budget in tokens (about 4 bytes each). Same as max_bytes."
+        ),
+    ] = None,
+    format: Annotated[
+        Optional[str],
+        Field(
+            description="Result format: 'records' (default) or 'columnar' ({columns, rows, dictionaries}) to cut response size."
+        ),
+    ] = None,
 ) -> Dict:
     """
     List Email records from EspoCRM with optional filtering, sorting, and pagination.
 
     Args:
     - `attribute_select` (Optional[List[str]]): Attributes to include in the response.
+    - `projection` (Optional[str]): Projection profile used when `attribute_select` is omitted ('summary', 'full' or custom).
     - `max_size` (Optional[int]): Maximum number of records to return (0–200).
     - `offset` (Optional[int]): Pagination offset (0-based).
     - `order` (Optional[str]): Sort direction, 'asc' or 'desc'.
@@ -54,6 +78,9 @@ def list_emails_tool(
     - `text_filter` (Optional[str]): Text search query, supports wildcard '*'.
     - `where_group` (Optional[List[Dict[str, Any]]]): Advanced deepObject filters.
     - `primary_filter` (Optional[str]): Primary filter to apply.
+    - `max_bytes` (Optional[int]): Response size budget in bytes. When exceeded, long text fields are trimmed, trailing rows dropped and `truncation.next_offset` tells where to continue.
+    - `max_tokens` (Optional[int]): Response size budget in tokens (about 4 bytes per token).
+    - `format` (Optional[str]): 'records' (default) or 'columnar'. Columnar returns `columns`, `rows` and `dictionaries` for low-cardinality fields.
 
     Example Requests:
     - List first 50 emails with selected attributes:
@@ -66,21 +93,4 @@ def list_emails_tool(
     Returns:
     - A dictionary containing emails data and metadata.
     """
-    logger.debug(f"Request received to list emails with params: {locals()}")
-
-    # Check API key and access
-    auth_response = check_access(True)
-    if auth_response:
-        return auth_response
-
-    # Build query parameters
-    params = build_espo_params(locals(), exclude={"auth_response"})
-
-    api_key = global_state.get("api_key")
-    api_address = global_state.get("api_address")
-    client = EspoAPI(api_address, api_key)
-
-    # Call EspoCRM API
-    result = client.call_api("GET", "Email", params=params)
-    logger.debug(f"EspoCRM list emails result: {result}")
-    return result
+    return await entity_engine.list_records("Email", locals(), tool="list_emails_tool")
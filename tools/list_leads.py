@@ -1,21 +1,26 @@
 from typing import Optional, Dict, Any, List, Annotated
-from core.utils.logger import logger
-from core.utils.state import global_state
-from app.utils.espo_helpers import EspoAPI, build_espo_params
-from app.middleware.AuthenticationMiddleware import check_access
 from pydantic import Field
 from core.utils.tools import doc_tag, doc_name
+from app.utils.lazy import lazy_import
+
+entity_engine = lazy_import("app.utils.entity_engine")
 
 
 @doc_tag("Leads")
 @doc_name("List Leads")
-def list_leads_tool(
+async def list_leads_tool(
     attribute_select: Annotated[
         Optional[List[str]],
         Field(
             description="List of attributes to return. Use to limit fields and improve performance."
         ),
     ] = None,
+    projection: Annotated[
+        Optional[str],
+        Field(
+            description="Projection profile used when attribute_select is omitted: 'summary' (default), 'full' or a custom profile."
+        ),
+    ] = None,
     bool_filter_list: Annotated[
         Optional[List[str]],
         Field(description="Boolean filter flags (e.g. ['onlyMy'])."),
@@ -43,6 +48,24 @@ def list_leads_tool(
         Optional[List[Dict[str, Any]]],
         Field(description="Advanced where group (deepObject) filters."),
     ] = None,
+    max_bytes: Annotated[
+        Optional[int],
+        Field(
+            description="Response size budget in bytes. Long text fields are trimmed and trailing rows dropped to fit."
+        ),
+    ] = None,
+    max_tokens: Annotated[
+        Optional[int],
+        Field(
+            description="Response size budget in tokens (about 4 bytes each). Same as max_bytes."
+        ),
+    ] = None,
+    format: Annotated[
+        Optional[str],
+        Field(
+            description="Result format: 'records' (default) or 'columnar' ({columns, rows, dictionaries}) to cut response size."
+        ),
+    ] = None,
 ) -> Dict:
     """
     List leads from EspoCRM with optional filtering, sorting, and pagination.
@@ -52,6 +75,7 @@ def list_leads_tool(
 
     Args:
     - `attribute_select` (Optional[List[str]]): Attributes to include in the response to improve performance.
+    - `projection` (Optional[str]): Projection profile used when `attribute_select` is omitted ('summary', 'full' or custom).
     - `bool_filter_list` (Optional[List[str]]): Boolean filters such as `['onlyMy']`.
     - `max_size` (Optional[int]): Maximum number of records to return (0–200). Overrides page_size if provided.
     - `offset` (Optional[int]): Pagination offset (0-based). If not set, computed from page and page_size.
@@ -60,6 +84,9 @@ def list_leads_tool(
     - `primary_filter` (Optional[str]): Primary filter to use. Allowed: `'actual'`, `'active'`, `'converted'`.
     - `text_filter` (Optional[str]): Text search query. Supports wildcard `*`.
     - `where_group` (Optional[List[Dict[str, Any]]]): Advanced deepObject filters for complex queries.
+    - `max_bytes` (Optional[int]): Response size budget in bytes. When exceeded, long text fields are trimmed, trailing rows dropped and `truncation.next_offset` tells where to continue.
+    - `max_tokens` (Optional[int]): Response size budget in tokens (about 4 bytes per token).
+    - `format` (Optional[str]): 'records' (default) or 'columnar'. Columnar returns `columns`, `rows` and `dictionaries` for low-cardinality fields.
 
     Example Requests:
     - Fetch first 50 leads with only selected attributes:
@@ -72,18 +99,4 @@ def list_leads_tool(
     Returns:
     - A dictionary containing leads data and metadata.
     """
-    logger.debug(f"Request received to list leads with params: {locals()}")
-
-    # Check api key and address are set in headers
-    auth_response = check_access(True)
-    if auth_response:
-        return auth_response
-
-    params = build_espo_params(locals(), exclude={"auth_response"})
-
-    api_key = global_state.get("api_key")
-    api_address = global_state.get("api_address")
-    client = EspoAPI(api_address, api_key)
-    result = client.call_api("GET", "Lead", params=params)
-    logger.debug(f"EspoCRM list leads result: {result}")
-    return result
+    return await entity_engine.list_records("Lead", locals(), tool="list_leads_tool")
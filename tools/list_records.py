@@ -0,0 +1,124 @@
+from typing import Optional, Dict, Any, List, Annotated
+from pydantic import Field
+from core.utils.tools import doc_tag, doc_name
+from app.utils.lazy import lazy_import
+
+entity_engine = lazy_import("app.utils.entity_engine")
+
+
+@doc_tag("Records")
+@doc_name("List Records")
+async def list_records_tool(
+    entity_type: Annotated[
+        str,
+        Field(
+            description="EspoCRM entity type, including custom entities (e.g. CProject)."
+        ),
+    ],
+    attribute_select: Annotated[
+        Optional[List[str]],
+        Field(
+            description="Attributes to return. Use to limit fields and improve performance."
+        ),
+    ] = None,
+    projection: Annotated[
+        Optional[str],
+        Field(
+            description="Projection profile used when attribute_select is omitted: 'summary' (default), 'full' or a custom profile."
+        ),
+    ] = None,
+    bool_filter_list: Annotated[
+        Optional[List[str]],
+        Field(description="Boolean filter flags (e.g. ['onlyMy'])."),
+    ] = None,
+    max_size: Annotated[
+        Optional[int],
+        Field(description="Maximum number of records to return (>=0 <=200)."),
+    ] = None,
+    offset: Annotated[
+        Optional[int],
+        Field(description="Pagination offset (>=0)."),
+    ] = None,
+    order: Annotated[
+        Optional[str],
+        Field(description="Sort direction: 'asc' or 'desc'."),
+    ] = None,
+    order_by: Annotated[
+        Optional[str],
+        Field(description="Attribute/field to order by."),
+    ] = None,
+    primary_filter: Annotated[
+        Optional[str],
+        Field(
+            description="Primary filter defined for the entity type (e.g. recentlyCreated)."
+        ),
+    ] = None,
+    text_filter: Annotated[
+        Optional[str],
+        Field(description="Text filter query (supports wildcard *)."),
+    ] = None,
+    where_group: Annotated[
+        Optional[List[Dict[str, Any]]],
+        Field(description="Advanced where group (deepObject) filters."),
+    ] = None,
+    no_total: Annotated[
+        Optional[bool],
+        Field(
+            description="Disable total count. Sent as header 'X-No-Total' (true/false). Defaults to true on pages after the first."
+        ),
+    ] = None,
+    max_bytes: Annotated[
+        Optional[int],
+        Field(
+            description="Response size budget in bytes. Long text fields are trimmed and trailing rows dropped to fit."
+        ),
+    ] = None,
+    max_tokens: Annotated[
+        Optional[int],
+        Field(
+            description="Response size budget in tokens (about 4 bytes each). Same as max_bytes."
+        ),
+    ] = None,
+    format: Annotated[
+        Optional[str],
+        Field(
+            description="Result format: 'records' (default) or 'columnar' ({columns, rows, dictionaries}) to cut response size."
+        ),
+    ] = None,
+) -> Dict:
+    """
+    List records of any EspoCRM entity type with filtering, sorting, and pagination.
+
+    Use this tool for custom entities and entity types without dedicated tools. The
+    entity type is checked against the EspoCRM metadata of the instance.
+
+    Args:
+    - `entity_type` (str): EspoCRM entity type, e.g. `CProject` or `Opportunity`.
+    - `attribute_select` (Optional[List[str]]): Attributes to include in the response.
+    - `projection` (Optional[str]): Projection profile used when `attribute_select` is omitted ('summary', 'full' or custom).
+    - `bool_filter_list` (Optional[List[str]]): Boolean filters (e.g. ['onlyMy']).
+    - `max_size` (Optional[int]): Maximum number of records to return (0–200).
+    - `offset` (Optional[int]): Pagination offset (0-based).
+    - `order` (Optional[str]): Sort direction ('asc' or 'desc').
+    - `order_by` (Optional[str]): Field to sort by.
+    - `primary_filter` (Optional[str]): Primary filter defined for the entity type.
+    - `text_filter` (Optional[str]): Text search query (supports '*').
+    - `where_group` (Optional[List[Dict[str, Any]]]): Advanced deepObject filters.
+    - `no_total` (Optional[bool]): Disable total count calculation. Defaults to true when `offset` > 0.
+    - `max_bytes` (Optional[int]): Response size budget in bytes. When exceeded, long text fields are trimmed, trailing rows dropped and `truncation.next_offset` tells where to continue.
+    - `max_tokens` (Optional[int]): Response size budget in tokens (about 4 bytes per token).
+    - `format` (Optional[str]): 'records' (default) or 'columnar'. Columnar returns `columns`, `rows` and `dictionaries` for low-cardinality fields.
+
+    Example Requests:
+    - List the first 20 records of a custom entity:
+      list_records_tool(entity_type="CProject", max_size=20)
+    - Search opportunities by name:
+      list_records_tool(entity_type="Opportunity", text_filter="Acme*")
+
+    Returns:
+    - A structured dict containing:
+      `total`, `list`, `status_code`, `ok`, `error`, and `error_type`.
+    """
+    return await entity_engine.list_records(
+        entity_type, locals(), tool="list_records_tool"
+    )
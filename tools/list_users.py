@@ -1,21 +1,26 @@
 from typing import Dict, Any, List, Optional, Annotated
-from core.utils.logger import logger
-from core.utils.state import global_state
-from app.utils.espo_helpers import EspoAPI, build_espo_params
-from app.middleware.AuthenticationMiddleware import check_access
 from pydantic import Field
 from core.utils.tools import doc_tag, doc_name
+from app.utils.lazy import lazy_import
+
+entity_engine = lazy_import("app.utils.entity_engine")
 
 
 @doc_tag("Users")
 @doc_name("List Users")
-def list_users_tool(
+async def list_users_tool(
     attribute_select: Annotated[
         Optional[List[str]],
         Field(
             description="List of User attributes to return. Select only necessary ones to improve performance."
         ),
     ] = None,
+    projection: Annotated[
+        Optional[str],
+        Field(
+            description="Projection profile used when attribute_select is omitted: 'summary' (default), 'full' or a custom profile."
+        ),
+    ] = None,
     bool_filter_list: Annotated[
         Optional[List[str]],
         Field(description="Boolean filter flags, e.g., ['onlyMyTeam']"),
@@ -45,7 +50,27 @@ def list_users_tool(
     ] = None,
     x_no_total: Annotated[
         Optional[bool],
-        Field(description="Disable calculation of total records if True"),
+        Field(
+            description="Disable calculation of total records if True. Defaults to true on pages after the first"
+        ),
+    ] = None,
+    max_bytes: Annotated[
+        Optional[int],
+        Field(
+            description="Response size budget in bytes. Long text fields are trimmed and trailing rows dropped to fit."
+        ),
+    ] = None,
+    max_tokens: Annotated[
+        Optional[int],
+        Field(
+            description="Response size budget in tokens (about 4 bytes each). Same as max_bytes."
+        ),
+    ] = None,
+    format: Annotated[
+        Optional[str],
+        Field(
+            description="Result format: 'records' (default) or 'columnar' ({columns, rows, dictionaries}) to cut response size."
+        ),
     ] = None,
 ) -> Dict:
     """
@@ -53,6 +78,7 @@ def list_users_tool(
 
     Args:
     - `attribute_select` (Optional[List[str]]): List of User fields to include in the response.
+    - `projection` (Optional[str]): Projection profile used when `attribute_select` is omitted ('summary', 'full' or custom).
     - `bool_filter_list` (Optional[List[str]]): Boolean filters such as `['onlyMyTeam']`.
     - `max_size` (Optional[int]): Maximum number of records to return (0-200).
     - `offset` (Optional[int]): Pagination offset (0-based).
@@ -61,7 +87,10 @@ def list_users_tool(
     - `primary_filter` (Optional[str]): Primary filter value.
     - `text_filter` (Optional[str]): Text search query. Supports wildcard '*'.
     - `where_group` (Optional[List[Dict[str, Any]]]): Deep object filters for complex queries.
-    - `x_no_total` (Optional[bool]): Disable total count calculation if True.
+    - `x_no_total` (Optional[bool]): Disable total count calculation if True. Defaults to true when `offset` > 0.
+    - `max_bytes` (Optional[int]): Response size budget in bytes. When exceeded, long text fields are trimmed, trailing rows dropped and `truncation.next_offset` tells where to continue.
+    - `max_tokens` (Optional[int]): Response size budget in tokens (about 4 bytes per token).
+    - `format` (Optional[str]): 'records' (default) or 'columnar'. Columnar returns `columns`, `rows` and `dictionaries` for low-cardinality fields.
 
     Example Requests:
     - List all users:
@@ -74,24 +103,4 @@ def list_users_tool(
     Returns:
     - A dictionary with the API response containing keys: `status_code`, `ok`, `data`, `error`, `error_type`.
     """
-    logger.info(f"Request received to list users with params: {locals()}")
-
-    # Check API key and access
-    auth_response = check_access(True)
-    if auth_response:
-        return auth_response
-
-    # Build query parameters
-    params = build_espo_params(locals(), exclude={"x_no_total", "auth_response"})
-
-    api_key = global_state.get("api_key")
-    api_address = global_state.get("api_address")
-    client = EspoAPI(api_address, api_key)
-
-    # Add header to disable total if requested
-    headers = {"X-No-Total": "true"} if x_no_total else None
-
-    # Call EspoCRM API
-    result = client.call_api("GET", "User", params=params, extra_headers=headers)
-    logger.debug(f"EspoCRM list users result: {result}")
-    return result
+    return await entity_engine.list_records("User", locals(), tool="list_users_tool")
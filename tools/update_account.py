@@ -1,15 +1,14 @@
 from typing import Dict, Any, List, Optional, Annotated
-from core.utils.logger import logger
-from core.utils.state import global_state
-from app.utils.espo_helpers import EspoAPI, build_espo_params
-from app.middleware.AuthenticationMiddleware import check_access
 from pydantic import Field
 from core.utils.tools import doc_tag, doc_name
+from app.utils.lazy import lazy_import
+
+entity_engine = lazy_import("app.utils.entity_engine")
 
 
 @doc_tag("Accounts")
 @doc_name("Update Account")
-def update_account_tool(
+async def update_account_tool(
     account_id: str,
     name: Annotated[
         Optional[str], Field(description="Account name (<=249 chars)")
@@ -144,26 +143,6 @@ def update_account_tool(
     Returns:
     - A structured dict containing: status_code, ok, data, error, error_type.
     """
-    logger.info(
-        f"Request received to update account {account_id} with params: {locals()}"
+    return await entity_engine.update_record(
+        "Account", locals(), "account_id", tool="update_account_tool"
     )
-
-    # Core: check access
-    auth_response = check_access(True)
-    if auth_response:
-        return auth_response
-
-    # Core: build params
-    params = build_espo_params(locals(), exclude={"account_id", "auth_response"})
-
-    if custom_fields:
-        params.update(custom_fields)
-
-    api_key = global_state.get("api_key")
-    api_address = global_state.get("api_address")
-    client = EspoAPI(api_address, api_key)
-
-    # Core: call API
-    result = client.call_api("PATCH", f"Account/{account_id}", params=params)
-    logger.debug(f"EspoCRM update account result: {result}")
-    return result
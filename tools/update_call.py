@@ -1,15 +1,14 @@
 from typing import Dict, Any, List, Optional, Annotated
-from core.utils.logger import logger
-from core.utils.state import global_state
-from app.utils.espo_helpers import EspoAPI, build_espo_params
-from app.middleware.AuthenticationMiddleware import check_access
 from pydantic import Field
 from core.utils.tools import doc_tag, doc_name
+from app.utils.lazy import lazy_import
+
+entity_engine = lazy_import("app.utils.entity_engine")
 
 
 @doc_tag("Calls")
 @doc_name("Update Call")
-def update_call_tool(
+async def update_call_tool(
     call_id: str,
     name: Annotated[
         Optional[str], Field(description="A one-line string. <= 255 characters")
@@ -138,22 +137,6 @@ def update_call_tool(
     - A structured dict containing the API response with keys:
       `status_code`, `ok`, `data`, `error`, and `error_type`.
     """
-    logger.info(f"Request received to update call {call_id} with params: {locals()}")
-
-    # Check API configuration and access
-    auth_response = check_access(True)
-    if auth_response:
-        return auth_response
-
-    params = build_espo_params(locals(), exclude={"call_id", "auth_response"})
-
-    if custom_fields:
-        params.update(custom_fields)
-
-    api_key = global_state.get("api_key")
-    api_address = global_state.get("api_address")
-    client = EspoAPI(api_address, api_key)
-
-    result = client.call_api("PATCH", f"Call/{call_id}", params=params)
-    logger.debug(f"EspoCRM update call result: {result}")
-    return result
+    return await entity_engine.update_record(
+        "Call", locals(), "call_id", tool="update_call_tool"
+    )
@@ -1,15 +1,14 @@
 from typing import Dict, Any, List, Optional, Annotated
-from core.utils.logger import logger
-from core.utils.state import global_state
-from app.utils.espo_helpers import EspoAPI, build_espo_params
-from app.middleware.AuthenticationMiddleware import check_access
 from pydantic import Field
 from core.utils.tools import doc_tag, doc_name
+from app.utils.lazy import lazy_import
+
+entity_engine = lazy_import("app.utils.entity_engine")
 
 
 @doc_tag("Campaigns")
 @doc_name("Update Campaign")
-def update_campaign_tool(
+async def update_campaign_tool(
     campaign_id: str,
     name: Annotated[
         Optional[str], Field(description="Campaign name (<=255 chars)")
@@ -108,27 +107,6 @@ def update_campaign_tool(
     - A structured dict containing the API response with keys:
       `status_code`, `ok`, `data`, `error`, and `error_type`.
     """
-    logger.info(
-        f"Request received to update campaign {campaign_id} with params: {locals()}"
+    return await entity_engine.update_record(
+        "Campaign", locals(), "campaign_id", tool="update_campaign_tool"
     )
-
-    # Verify API configuration and access
-    auth_response = check_access(True)
-    if auth_response:
-        return auth_response
-
-    # Build params excluding path/id and internal vars
-    params = build_espo_params(locals(), exclude={"campaign_id", "auth_response"})
-
-    # Merge custom fields if provided
-    if custom_fields:
-        params.update(custom_fields)
-
-    api_key = global_state.get("api_key")
-    api_address = global_state.get("api_address")
-    client = EspoAPI(api_address, api_key)
-
-    # Call EspoCRM PATCH endpoint for the campaign
-    result = client.call_api("PATCH", f"Campaign/{campaign_id}", params=params)
-    logger.debug(f"EspoCRM update campaign result: {result}")
-    return result
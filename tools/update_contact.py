@@ -1,15 +1,14 @@
 from typing import Dict, Any, Optional, List, Annotated
-from core.utils.logger import logger
-from core.utils.state import global_state
-from app.utils.espo_helpers import EspoAPI, build_espo_params
-from app.middleware.AuthenticationMiddleware import check_access
 from pydantic import Field
 from core.utils.tools import doc_tag, doc_name
+from app.utils.lazy import lazy_import
+
+entity_engine = lazy_import("app.utils.entity_engine")
 
 
 @doc_tag("Contacts")
 @doc_name("Update Contact")
-def update_contact_tool(
+async def update_contact_tool(
     contact_id: Annotated[
         str, Field(description="The ID of the Contact record to update")
     ],
@@ -171,18 +170,6 @@ def update_contact_tool(
     - A structured dict containing the API response with keys: `status_code`, `ok`, `data`, `error`, `error_type`.
       The `data` object contains updated Contact fields similar to Read Contact.
     """
-    logger.info(f"Request received to update Contact with id: {contact_id}")
-
-    # Check api key and address are set in headers
-    auth_response = check_access(True)
-    if auth_response:
-        return auth_response
-
-    params = build_espo_params(locals(), exclude={"contact_id", "auth_response"})
-
-    api_key = global_state.get("api_key")
-    api_address = global_state.get("api_address")
-    client = EspoAPI(api_address, api_key)
-    result = client.call_api("PATCH", f"Contact/{contact_id}", params=params)
-    logger.debug(f"EspoCRM update contact result: {result}")
-    return result
+    return await entity_engine.update_record(
+        "Contact", locals(), "contact_id", tool="update_contact_tool"
+    )
@@ -1,15 +1,14 @@
 from typing import Dict, Any, List, Optional, Annotated
-from core.utils.logger import logger
-from core.utils.state import global_state
-from app.utils.espo_helpers import EspoAPI, build_espo_params
-from app.middleware.AuthenticationMiddleware import check_access
 from pydantic import Field
 from core.utils.tools import doc_tag, doc_name
+from app.utils.lazy import lazy_import
+
+entity_engine = lazy_import("app.utils.entity_engine")
 
 
 @doc_tag("Leads")
 @doc_name("Update Lead")
-def update_lead_tool(
+async def update_lead_tool(
     lead_id: str,
     salutation_name: Annotated[
         Optional[str], Field(description="Salutation (Mr., Ms., Dr., etc.)")
@@ -149,22 +148,6 @@ def update_lead_tool(
     - A structured dict containing the API response with keys:
     `status_code`, `ok`, `data`, `error`, and `error_type`.
     """
-    logger.info(f"Request received to update lead {lead_id} with params: {locals()}")
-
-    # Check api key and address are set in headers
-    auth_response = check_access(True)
-    if auth_response:
-        return auth_response
-
-    params = build_espo_params(locals(), exclude={"lead_id", "auth_response"})
-
-    if custom_fields:
-        params.update(custom_fields)
-
-    api_key = global_state.get("api_key")
-    api_address = global_state.get("api_address")
-    client = EspoAPI(api_address, api_key)
-
-    result = client.call_api("PATCH", f"Lead/{lead_id}", params=params)
-    logger.debug(f"EspoCRM update lead result: {result}")
-    return result
+    return await entity_engine.update_record(
+        "Lead", locals(), "lead_id", tool="update_lead_tool"
+    )
@@ -0,0 +1,45 @@
+from typing import Dict, Any, Annotated
+from pydantic import Field
+from core.utils.tools import doc_tag, doc_name
+from app.utils.lazy import lazy_import
+
+entity_engine = lazy_import("app.utils.entity_engine")
+
+
+@doc_tag("Records")
+@doc_name("Update Record")
+async def update_record_tool(
+    entity_type: Annotated[
+        str,
+        Field(
+            description="EspoCRM entity type, including custom entities (e.g. CProject)."
+        ),
+    ],
+    record_id: Annotated[str, Field(description="ID of the record to update")],
+    attributes: Annotated[
+        Dict[str, Any],
+        Field(description="Attributes to update using EspoCRM names (e.g. cStage)"),
+    ],
+) -> Dict:
+    """
+    Update a record of any EspoCRM entity type.
+
+    Only the given attributes are sent to EspoCRM. The entity type is checked
+    against the EspoCRM metadata of the instance and the attributes are validated
+    locally (enum options, max lengths).
+
+    Args:
+    - `entity_type` (str): EspoCRM entity type, e.g. `CProject` or `Opportunity`.
+    - `record_id` (str): ID of the record to update.
+    - `attributes` (Dict[str, Any]): Attributes to update, using EspoCRM attribute names.
+
+    Example Request:
+    - update_record_tool(entity_type="CProject", record_id="abc123", attributes={"cStage": "Done"})
+
+    Returns:
+    - A structured dict containing the API response with keys:
+    `status_code`, `ok`, `data`, `error`, and `error_type`.
+    """
+    return await entity_engine.update_record(
+        entity_type, locals(), "record_id", tool="update_record_tool"
+    )
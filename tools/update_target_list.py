@@ -1,15 +1,14 @@
 from typing import Dict, Any, List, Optional, Annotated
-from core.utils.logger import logger
-from core.utils.state import global_state
-from app.utils.espo_helpers import EspoAPI, build_espo_params
-from app.middleware.AuthenticationMiddleware import check_access
 from pydantic import Field
 from core.utils.tools import doc_tag, doc_name
+from app.utils.lazy import lazy_import
+
+entity_engine = lazy_import("app.utils.entity_engine")
 
 
 @doc_tag("TargetLists")
 @doc_name("Update TargetList")
-def update_target_list_tool(
+async def update_target_list_tool(
     target_list_id: str,
     name: Annotated[
         Optional[str], Field(description="TargetList name (<=255 chars)")
@@ -61,27 +60,6 @@ def update_target_list_tool(
     - A structured dict containing the API response with keys:
       `status_code`, `ok`, `data`, `error`, and `error_type`.
     """
-    logger.info(
-        f"Request received to update TargetList {target_list_id} with params: {locals()}"
+    return await entity_engine.update_record(
+        "TargetList", locals(), "target_list_id", tool="update_target_list_tool"
     )
-
-    # Verify API key and access
-    auth_response = check_access(True)
-    if auth_response:
-        return auth_response
-
-    # Build params excluding the ID and auth response
-    params = build_espo_params(locals(), exclude={"target_list_id", "auth_response"})
-
-    # Include custom fields if provided
-    if custom_fields:
-        params.update(custom_fields)
-
-    api_key = global_state.get("api_key")
-    api_address = global_state.get("api_address")
-    client = EspoAPI(api_address, api_key)
-
-    # Call PATCH API
-    result = client.call_api("PATCH", f"TargetList/{target_list_id}", params=params)
-    logger.debug(f"EspoCRM update TargetList result: {result}")
-    return result
@@ -0,0 +1,23 @@
+import hmac
+from fastapi import Header, HTTPException
+from core.utils.env import EnvConfig
+
+# Diagnostics endpoints are disabled unless a token is configured
+ESPO_ADMIN_TOKEN = EnvConfig.get("ESPO_ADMIN_TOKEN") or ""
+
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+
+
+def require_admin(x_admin_token: str = Header(default="")):
+    """FastAPI dependency guarding the admin diagnostics endpoints.
+
+    Without `ESPO_ADMIN_TOKEN` the endpoints answer 404 as if they did not
+    exist. The token is compared in constant time.
+    """
+    if not ESPO_ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    if not hmac.compare_digest(
+        x_admin_token.encode("utf-8"), ESPO_ADMIN_TOKEN.encode("utf-8")
+    ):
+        raise HTTPException(status_code=403, detail="Invalid admin token.")
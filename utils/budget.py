@@ -0,0 +1,158 @@
+import json
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Rough conversion used by most tokenizers for English/JSON text
+BYTES_PER_TOKEN = 4
+
+# Long text attributes (Email body, descriptions...) are cut to this many
+# characters once a result is over its budget, before any row is dropped.
+TEXT_FIELD_MAX_CHARS = 512
+TEXT_FIELD_MIN_CHARS = 64
+TRIM_MARKER = "…"
+
+
+def resolve_budget(
+    max_bytes: Optional[int] = None, max_tokens: Optional[int] = None
+) -> Optional[int]:
+    """Return the byte budget for a result, or None when unlimited."""
+    budgets = []
+    if max_bytes is not None:
+        budgets.append(max_bytes)
+    if max_tokens is not None:
+        budgets.append(max_tokens * BYTES_PER_TOKEN)
+
+    if not budgets:
+        return None
+
+    return max(min(budgets), 0)
+
+
+def encoded_size(value: Any) -> int:
+    return len(
+        json.dumps(
+            value, ensure_ascii=False, separators=(",", ":"), default=str
+        ).encode("utf-8")
+    )
+
+
+def trim_text_fields(
+    record: Dict[str, Any], max_chars: int
+) -> Tuple[Dict[str, Any], Set[str]]:
+    """Return a copy of `record` with strings longer than `max_chars` cut."""
+    trimmed = set()
+    out = {}
+
+    for key, value in record.items():
+        if isinstance(value, str) and len(value) > max_chars:
+            value = value[:max_chars] + TRIM_MARKER
+            trimmed.add(key)
+        out[key] = value
+
+    return out, trimmed
+
+
+def truncation_size(truncation: Dict[str, Any]) -> int:
+    """Bytes the `truncation` entry adds to a result, separating comma included."""
+    # Drop the braces of the wrapping object, add the comma
+    return encoded_size({"truncation": truncation}) - 1
+
+
+def apply_list_budget(
+    result: Dict, budget: Optional[int], offset: Optional[int] = None
+) -> Dict:
+    """Fit the `data.list` of a list tool result into `budget` bytes.
+
+    A result that already fits is returned untouched. Otherwise rows are
+    measured one at a time: long text fields are trimmed first, then trailing
+    rows that no longer fit are dropped. The oversized response is never
+    serialized as a whole. A `truncation` entry is added with `next_offset`,
+    the offset to pass to continue the listing, and its size counts against
+    the budget. At least one row is always returned so a continuation makes
+    progress.
+    """
+    if budget is None:
+        return result
+
+    data = result.get("data") if isinstance(result, dict) else None
+    if not isinstance(data, dict) or not isinstance(data.get("list"), list):
+        return result
+
+    records = data["list"]
+    data["list"] = []
+    base = encoded_size(result)
+
+    # +1 for the separating comma
+    used = base
+    for record in records:
+        used += encoded_size(record) + 1
+        if used > budget:
+            break
+    else:
+        data["list"] = records
+        return result
+
+    used = base
+    kept: List[Tuple[Dict[str, Any], int, Set[str]]] = []
+
+    for record in records:
+        if isinstance(record, dict):
+            record, trimmed = trim_text_fields(record, TEXT_FIELD_MAX_CHARS)
+        else:
+            trimmed = set()
+
+        size = encoded_size(record) + 1
+        if kept and used + size > budget:
+            break
+
+        used += size
+        kept.append((record, size, trimmed))
+
+    while True:
+        rows_dropped = len(records) - len(kept)
+        trimmed_fields = set().union(*(trimmed for _, _, trimmed in kept))
+        truncation = {
+            "budget_bytes": budget,
+            "rows_dropped": rows_dropped,
+            "trimmed_fields": sorted(trimmed_fields),
+            "next_offset": (offset or 0) + len(kept) if rows_dropped else None,
+        }
+        # Make room for the truncation entry itself
+        if len(kept) <= 1 or used + truncation_size(truncation) <= budget:
+            break
+        used -= kept.pop()[1]
+
+    data["list"] = [record for record, _, _ in kept]
+    if rows_dropped or trimmed_fields:
+        result["truncation"] = truncation
+
+    return result
+
+
+def apply_record_budget(result: Dict, budget: Optional[int]) -> Dict:
+    """Fit the `data` record of a get tool result into `budget` bytes by
+    trimming long text fields, halving the allowed length until the record
+    and its `truncation` entry fit.
+    """
+    if budget is None:
+        return result
+
+    data = result.get("data") if isinstance(result, dict) else None
+    if not isinstance(data, dict) or encoded_size(result) <= budget:
+        return result
+
+    max_chars = TEXT_FIELD_MAX_CHARS
+    while True:
+        record, trimmed = trim_text_fields(data, max_chars)
+        result["data"] = record
+        result.pop("truncation", None)
+        if trimmed:
+            result["truncation"] = {
+                "budget_bytes": budget,
+                "trimmed_fields": sorted(trimmed),
+                "max_chars": max_chars,
+            }
+        if encoded_size(result) <= budget or max_chars <= TEXT_FIELD_MIN_CHARS:
+            break
+        max_chars //= 2
+
+    return result
@@ -0,0 +1,253 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from typing import Dict, Optional
+from core.utils.env import EnvConfig
+from core.utils.logger import logger
+
+CREDENTIALS_CACHE_TTL = int(EnvConfig.get("ESPO_CREDENTIALS_CACHE_TTL") or 300)
+CREDENTIALS_FAILURE_TTL = int(EnvConfig.get("ESPO_CREDENTIALS_FAILURE_TTL") or 60)
+# Probes of unknown keys allowed per API address and window, so guessing keys
+# through the server cannot flood the customer's CRM.
+CREDENTIALS_MAX_PROBES = int(EnvConfig.get("ESPO_CREDENTIALS_MAX_PROBES") or 10)
+CREDENTIALS_PROBE_WINDOW = 60
+# Pairs (and probed addresses) remembered at most, least recently used first
+# out, so random key and address headers cannot grow memory without bound.
+CREDENTIALS_MAX_ENTRIES = int(EnvConfig.get("ESPO_CREDENTIALS_MAX_ENTRIES") or 10000)
+
+PROBE_ACTION = "App/user"
+
+VALID, INVALID = True, False
+# The pair could not be probed because the address is over its probe limit
+RATE_LIMITED = "rate_limited"
+
+
+def credentials_key(api_address: str, api_key: str) -> tuple:
+    # Only a digest of the key is kept in memory
+    digest = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()
+    return ((api_address or "").rstrip("/"), digest)
+
+
+class CredentialCache:
+    """Per (API address, API key) cache of the result of a cheap auth probe.
+
+    Verified pairs are trusted for `ttl` seconds and rejected ones for
+    `failure_ttl` seconds, so a tool call costs no extra round trip once the
+    pair is known and a bad key is refused without reaching the CRM. Probes
+    of unknown pairs are limited per API address; over the limit a pair is
+    reported as RATE_LIMITED and nothing is cached, so guessed keys cannot
+    get a valid one rejected. At most `max_entries` pairs and probed
+    addresses are kept; expired ones are dropped as they are met.
+    """
+
+    def __init__(
+        self,
+        ttl: int = CREDENTIALS_CACHE_TTL,
+        failure_ttl: int = CREDENTIALS_FAILURE_TTL,
+        max_probes: int = CREDENTIALS_MAX_PROBES,
+        probe_window: int = CREDENTIALS_PROBE_WINDOW,
+        max_entries: int = CREDENTIALS_MAX_ENTRIES,
+    ):
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.max_probes = max_probes
+        self.probe_window = probe_window
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._probes: "OrderedDict[str, deque]" = OrderedDict()
+        self._probing: Dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, api_address: str, api_key: str) -> Optional[bool]:
+        """Return VALID, INVALID or None if the pair is unknown or expired."""
+        key = credentials_key(api_address, api_key)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def is_known_invalid(self, api_address: str, api_key: str) -> bool:
+        return self.lookup(api_address, api_key) is INVALID
+
+    def store(self, api_address: str, api_key: str, valid: bool):
+        ttl = self.ttl if valid else self.failure_ttl
+        key = credentials_key(api_address, api_key)
+
+        now = time.monotonic()
+
+        with self._lock:
+            self._entries[key] = (now + ttl, valid)
+            self._entries.move_to_end(key)
+            # Drop expired pairs at the cold end, then the least recently used
+            while self._entries:
+                oldest = next(iter(self._entries.values()))
+                if oldest[0] > now and len(self._entries) <= self.max_entries:
+                    break
+                self._entries.popitem(last=False)
+
+    def invalidate(self, api_address: str | None = None, api_key: str | None = None):
+        with self._lock:
+            if api_address is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(credentials_key(api_address, api_key), None)
+
+    def _allow_probe(self, api_address: str) -> bool:
+        now = time.monotonic()
+
+        with self._lock:
+            probes = self._probes.get(api_address)
+            if probes is None:
+                probes = self._probes[api_address] = deque()
+            while probes and probes[0] <= now - self.probe_window:
+                probes.popleft()
+            if len(probes) >= self.max_probes:
+                if not probes:
+                    del self._probes[api_address]
+                return False
+            probes.append(now)
+            self._probes.move_to_end(api_address)
+
+            # Addresses are ordered by last probe: drop the ones whose window
+            # is over, then the least recently probed
+            while self._probes:
+                oldest = next(iter(self._probes.values()))
+                if (
+                    oldest[-1] > now - self.probe_window
+                    and len(self._probes) <= self.max_entries
+                ):
+                    break
+                self._probes.popitem(last=False)
+            return True
+
+    def is_rate_limited(self, api_address: str) -> bool:
+        """Return whether unknown keys of the address are over the probe limit."""
+        address = (api_address or "").rstrip("/")
+        cutoff = time.monotonic() - self.probe_window
+
+        with self._lock:
+            probes = self._probes.get(address) or ()
+            recent = sum(1 for probed_at in probes if probed_at > cutoff)
+
+        return recent >= self.max_probes
+
+    def verify(self, client):
+        """Return whether the client credentials are valid, probing if unknown.
+
+        Concurrent calls for the same pair share one probe. Returns None when
+        the CRM could not tell (network or server error), in which case the
+        call goes ahead and EspoCRM decides, and RATE_LIMITED when the address
+        is over its probe limit.
+        """
+        status = self.lookup(client.url, client.api_key)
+        if status is not None:
+            return status
+
+        key = credentials_key(client.url, client.api_key)
+        with self._lock:
+            future = self._probing.get(key)
+            probing = future is None
+            if probing:
+                future = self._probing[key] = Future()
+
+        # Another call is probing the same pair, wait for its answer
+        if not probing:
+            return future.result()
+
+        try:
+            status = self._probe(client, key)
+        except BaseException as e:
+            with self._lock:
+                self._probing.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._probing.pop(key, None)
+        future.set_result(status)
+        return status
+
+    def _probe(self, client, key: tuple):
+        # Another call may have finished probing the pair since the lookup
+        status = self.lookup(client.url, client.api_key)
+        if status is not None:
+            return status
+
+        if not self._allow_probe(key[0]):
+            logger.warning(
+                f"Credential probe limit reached for {client.url}, "
+                "deferring unverified API key"
+            )
+            return RATE_LIMITED
+
+        result = client.call_api("GET", PROBE_ACTION, allow_non_2xx=True)
+        status_code = result.get("status_code") if result else None
+
+        if status_code in (401, 403):
+            status = INVALID
+        elif result and result.get("ok"):
+            status = VALID
+        else:
+            return None
+
+        self.store(client.url, client.api_key, status)
+        return status
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of cached pairs, probe windows and running probes."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "probed_addresses": len(self._probes),
+                "probing": len(self._probing),
+            }
+
+
+credential_cache = CredentialCache()
+
+
+INVALID_CREDENTIALS_MESSAGE = "Invalid API key or API address."
+RATE_LIMITED_MESSAGE = "Too many unverified API keys for this API address, retry later."
+
+
+def verify_credentials(client) -> Optional[Dict]:
+    """Return a 401 result for invalid credentials, 429 over the probe limit."""
+    status = credential_cache.verify(client)
+
+    if status is RATE_LIMITED:
+        return {
+            "status_code": 429,
+            "ok": False,
+            "data": None,
+            "error": RATE_LIMITED_MESSAGE,
+            "error_type": "busy",
+        }
+    if status is not INVALID:
+        return None
+
+    return {
+        "status_code": 401,
+        "ok": False,
+        "data": None,
+        "error": INVALID_CREDENTIALS_MESSAGE,
+        "error_type": "auth",
+    }
+
+
+def record_api_result(client, result: Optional[Dict]):
+    """Remember credentials EspoCRM rejected on a regular call (revoked keys)."""
+    if result and result.get("status_code") == 401:
+        credential_cache.store(client.url, client.api_key, INVALID)
@@ -0,0 +1,181 @@
+import ipaddress
+import socket
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+from typing import Callable, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError
+from core.utils.env import EnvConfig
+from core.utils.logger import logger
+from app.utils.tracing import TracedConnectionMixin
+
+# getaddrinfo does not expose record TTLs, answers are kept for this long
+ESPO_DNS_CACHE_TTL = int(EnvConfig.get("ESPO_DNS_CACHE_TTL") or 60)
+ESPO_DNS_CACHE_MAX_ENTRIES = int(EnvConfig.get("ESPO_DNS_CACHE_MAX_ENTRIES") or 1024)
+
+
+class DNSCache:
+    """Cache of resolved CRM host addresses with expiry.
+
+    Every address of a lookup is kept, in resolver order, so a connection can
+    fall back to the next one like an uncached connect would. Only successful
+    lookups are cached; a failed lookup is left to urllib3 so the usual
+    connection error is reported. At most `max_entries` hosts are kept, least
+    recently used first out.
+    """
+
+    def __init__(
+        self,
+        ttl: int = ESPO_DNS_CACHE_TTL,
+        resolver: Callable = socket.getaddrinfo,
+        max_entries: int = ESPO_DNS_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl = ttl
+        self.resolver = resolver
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def resolve(self, host: str, port: int) -> Tuple[str, ...]:
+        """Return the IP addresses of `host`, or `host` itself if it cannot resolve."""
+        try:
+            ipaddress.ip_address(host)
+            return (host,)
+        except ValueError:
+            pass
+
+        key = (host, port)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry[1]
+            self._stats["misses"] += 1
+
+        try:
+            infos = self.resolver(host, port, 0, socket.SOCK_STREAM)
+        except OSError as e:
+            logger.warning(f"DNS lookup of {host} failed: {str(e)}")
+            return (host,)
+
+        addresses = tuple(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self._entries[key] = (now + self.ttl, addresses)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return addresses
+
+    def invalidate(self, host: str | None = None):
+        with self._lock:
+            if host is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == host]:
+                    del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "ttl": self.ttl, **self._stats}
+
+
+dns_cache = DNSCache()
+
+
+class CachedDNSConnectionMixin:
+    """Connect to the cached addresses of the host.
+
+    urllib3 resolves `_dns_host` when opening the socket and reads `host`
+    (derived from it) afterwards for TLS SNI and certificate checks, so the
+    resolved address is only swapped in while the socket is created. The
+    addresses are tried in order; a failed one drops the cache entry so the
+    next connection looks the host up again.
+    """
+
+    def _new_conn(self):
+        host = self._dns_host
+        name = host.rstrip(".")
+        addresses = dns_cache.resolve(name, self.port)
+        try:
+            for index, address in enumerate(addresses):
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                # Also catches NewConnectionError (refused, unreachable)
+                except ConnectTimeoutError as e:
+                    logger.warning(f"Connection to {name} at {address} failed: {e}")
+                    dns_cache.invalidate(name)
+                    if index == len(addresses) - 1:
+                        raise
+        finally:
+            self._dns_host = host
+
+
+class CachedDNSHTTPConnection(
+    TracedConnectionMixin, CachedDNSConnectionMixin, HTTPConnection
+):
+    pass
+
+
+class CachedDNSHTTPSConnection(
+    TracedConnectionMixin, CachedDNSConnectionMixin, HTTPSConnection
+):
+    pass
+
+
+class PoolTimeoutMixin:
+    """Bounds the wait for a free connection of a blocking pool.
+
+    requests never passes a pool timeout to urllib3, so a blocking pool would
+    otherwise wait forever. Past `pool_timeout` seconds `EmptyPoolError` is
+    raised.
+    """
+
+    def __init__(self, *args, pool_timeout=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool_timeout = pool_timeout
+
+    def _get_conn(self, timeout=None):
+        return super()._get_conn(self.pool_timeout if timeout is None else timeout)
+
+
+class CachedDNSHTTPConnectionPool(PoolTimeoutMixin, HTTPConnectionPool):
+    ConnectionCls = CachedDNSHTTPConnection
+
+
+class CachedDNSHTTPSConnectionPool(PoolTimeoutMixin, HTTPSConnectionPool):
+    ConnectionCls = CachedDNSHTTPSConnection
+
+
+class CachedDNSAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections resolve hosts through `dns_cache`.
+
+    `pool_timeout` bounds the wait for a free connection when `pool_block`
+    is set, None waits forever.
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["pool_timeout"]
+
+    def __init__(self, *args, pool_timeout=None, **kwargs):
+        # Set before super().__init__(), which builds the pool manager
+        self.pool_timeout = pool_timeout
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": partial(
+                CachedDNSHTTPConnectionPool, pool_timeout=self.pool_timeout
+            ),
+            "https": partial(
+                CachedDNSHTTPSConnectionPool, pool_timeout=self.pool_timeout
+            ),
+        }
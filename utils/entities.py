@@ -0,0 +1,15 @@
+# Entity types with dedicated tools. Others (custom entities) are checked
+# against the tenant's cached metadata, and share the `custom` metric label so
+# label sets stay bounded whatever entities tenants define.
+BUILTIN_ENTITIES = frozenset(
+    (
+        "Account",
+        "Call",
+        "Campaign",
+        "Contact",
+        "Email",
+        "Lead",
+        "TargetList",
+        "User",
+    )
+)
@@ -0,0 +1,385 @@
+import logging
+import time
+from functools import lru_cache, wraps
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+from app.utils.espo_helpers import ParamMapper, build_list_headers, get_request_client
+from app.utils.projections import build_select_params
+from app.utils.result_formats import apply_list_format, check_list_format
+from app.utils.budget import apply_list_budget, apply_record_budget, resolve_budget
+from app.utils.metadata import metadata_cache, validate_entity_params
+from app.utils.tool_pool import run_in_tool_pool
+from app.utils.credentials import record_api_result, verify_credentials
+from app.utils.entities import BUILTIN_ENTITIES
+from app.utils.metrics import record_tool_call
+from app.utils.slow_calls import log_slow_call, phase, track_call
+from app.utils.structured_log import ESPO_LOG_SAMPLE_RATE, log_event
+from app.utils.tracing import span
+from app.middleware.AuthenticationMiddleware import (
+    check_access,
+    get_tenant,
+    get_trace_context,
+)
+
+
+# Tool modules only hold the signature and documentation (used for the MCP
+# tool schema) and pass their arguments, with the name of their id argument,
+# to the operations below, so every entity shares one request path.
+
+# Tool arguments that control the tool itself and are never sent to EspoCRM
+LIST_CONTROL_PARAMS = (
+    "projection",
+    "format",
+    "max_bytes",
+    "max_tokens",
+    "no_total",
+    "x_no_total",
+)
+GET_CONTROL_PARAMS = ("attribute_select", "projection", "max_bytes", "max_tokens")
+
+# Tool arguments sent as headers on create
+CREATE_HEADER_PARAMS = {
+    "duplicate_source_id": "X-Duplicate-Source-Id",
+    "skip_duplicate_check": "X-Skip-Duplicate-Check",
+}
+
+# Tool arguments whose EspoCRM attribute name is not their camelCased name
+PARAM_ALIASES = {"from_": "from"}
+
+# Tool arguments holding already camelCased EspoCRM attributes, merged as is
+RAW_ATTRIBUTE_PARAMS = ("custom_fields", "attributes")
+
+OPERATION_CONTROL_PARAMS = {
+    "list": LIST_CONTROL_PARAMS,
+    "get": GET_CONTROL_PARAMS,
+    "create": (),
+    "update": (),
+    "delete": (),
+}
+
+
+@lru_cache(maxsize=256)
+def compile_param_mapper(
+    operation: str, id_param: Optional[str], names: tuple
+) -> ParamMapper:
+    """Compile the ParamMapper of a tool signature (its argument names)."""
+    control = OPERATION_CONTROL_PARAMS[operation]
+    return ParamMapper(
+        names,
+        aliases=PARAM_ALIASES,
+        headers=CREATE_HEADER_PARAMS if operation == "create" else None,
+        raw=RAW_ATTRIBUTE_PARAMS,
+        control=control + (id_param,) if id_param else control,
+        exclude=("entity_type",),
+    )
+
+
+def map_arguments(
+    operation: str, arguments: Dict[str, Any], id_param: Optional[str] = None
+):
+    """Map tool arguments to `(record_id, params, headers, control)`.
+
+    `id_param` is the name of the calling tool's record id argument.
+    """
+    with phase("param_build"):
+        mapper = compile_param_mapper(operation, id_param, tuple(arguments))
+        params, headers, control = mapper.map(arguments)
+    return control.pop(id_param, None), params, headers, control
+
+
+def validation_error(message: str) -> Dict:
+    return {
+        "status_code": None,
+        "ok": False,
+        "data": None,
+        "error": message,
+        "error_type": "validation",
+    }
+
+
+def check_entity_type(client, entity_type: str) -> Optional[Dict]:
+    """Reject entity types the tenant does not have.
+
+    Built-in entities are always accepted. Others must exist in the cached
+    metadata; if metadata is unavailable EspoCRM decides.
+    """
+    if entity_type in BUILTIN_ENTITIES:
+        return None
+
+    entity_defs = metadata_cache.get_entity_defs(client)
+    if entity_defs is None or entity_type in entity_defs:
+        return None
+
+    return validation_error(f"Unknown entity type '{entity_type}'.")
+
+
+def call_tenant_api(client, method: str, action: str, **kwargs) -> Dict:
+    result = client.call_api(method, action, **kwargs)
+    record_api_result(client, result)
+    return result
+
+
+def result_error_type(result) -> Optional[str]:
+    if not isinstance(result, dict):
+        return None
+    if result.get("status") == "error":
+        return "unauthenticated"
+    return result.get("error_type")
+
+
+def pooled(operation):
+    """Run an engine operation in the tool pool, queued under the caller's tenant.
+
+    The wrapped operation becomes a coroutine function: tools await it, so the
+    event loop keeps serving other sessions while the blocking work runs.
+
+    Records the call in the tool metrics, labeled with the `tool` name the
+    calling tool passes, and logs it with its phase timings when it is slower
+    than `ESPO_SLOW_CALL_MS`.
+    """
+    name = operation.__name__.split("_")[0]
+
+    @wraps(operation)
+    async def wrapper(
+        entity_type: str, arguments: Dict[str, Any], *args, tool: str
+    ) -> Dict:
+        entity = entity_type if entity_type in BUILTIN_ENTITIES else "custom"
+        started = time.perf_counter()
+
+        attributes = {"espo.tool": tool, "espo.operation": name, "espo.entity": entity}
+        with span(f"tool {tool}", attributes, context=get_trace_context()):
+            tenant = get_tenant().api_address or ""
+            with track_call() as timings:
+                result = await run_in_tool_pool(
+                    tenant, operation, entity_type, arguments, *args
+                )
+
+        error_type = result_error_type(result)
+        record_tool_call(tool, name, entity, time.perf_counter() - started, error_type)
+        log_slow_call(
+            "tool",
+            timings,
+            tool=tool,
+            operation=name,
+            entity=entity_type,
+            host=urlsplit(tenant).hostname,
+            error_type=error_type,
+        )
+        return result
+
+    return wrapper
+
+
+@pooled
+def list_records(entity_type: str, arguments: Dict[str, Any]) -> Dict:
+    auth_response = check_access(True)
+    if auth_response:
+        return auth_response
+
+    _, params, _, control = map_arguments("list", arguments)
+    no_total = control.get("x_no_total", control.get("no_total"))
+    offset = params.get("offset")
+
+    try:
+        check_list_format(control.get("format"))
+        select = build_select_params(
+            entity_type,
+            params.pop("attributeSelect", None),
+            control.get("projection"),
+            operation="list",
+        )
+    except ValueError as e:
+        return validation_error(str(e))
+    params.update(select)
+
+    client = get_request_client()
+    auth_error = verify_credentials(client)
+    if auth_error:
+        return auth_error
+
+    entity_error = check_entity_type(client, entity_type)
+    if entity_error:
+        return entity_error
+
+    result = call_tenant_api(
+        client,
+        "GET",
+        entity_type,
+        params=params,
+        extra_headers=build_list_headers(offset, no_total),
+    )
+
+    budget = resolve_budget(control.get("max_bytes"), control.get("max_tokens"))
+    result = apply_list_budget(result, budget, offset)
+    result = apply_list_format(result, control.get("format"))
+    log_event(
+        logging.DEBUG,
+        "tool.result",
+        ESPO_LOG_SAMPLE_RATE,
+        operation="list",
+        entity=entity_type,
+        arguments=arguments,
+        result=result,
+    )
+    return result
+
+
+@pooled
+def get_record(entity_type: str, arguments: Dict[str, Any], id_param: str) -> Dict:
+    auth_response = check_access(True)
+    if auth_response:
+        return auth_response
+
+    record_id, _, _, control = map_arguments("get", arguments, id_param)
+    try:
+        select = build_select_params(
+            entity_type, control.get("attribute_select"), control.get("projection")
+        )
+    except ValueError as e:
+        return validation_error(str(e))
+
+    client = get_request_client()
+    auth_error = verify_credentials(client)
+    if auth_error:
+        return auth_error
+
+    entity_error = check_entity_type(client, entity_type)
+    if entity_error:
+        return entity_error
+
+    result = call_tenant_api(client, "GET", f"{entity_type}/{record_id}", params=select)
+
+    budget = resolve_budget(control.get("max_bytes"), control.get("max_tokens"))
+    result = apply_record_budget(result, budget)
+    log_event(
+        logging.DEBUG,
+        "tool.result",
+        ESPO_LOG_SAMPLE_RATE,
+        operation="get",
+        entity=entity_type,
+        arguments=arguments,
+        result=result,
+    )
+    return result
+
+
+@pooled
+def create_record(entity_type: str, arguments: Dict[str, Any]) -> Dict:
+    log_event(
+        logging.INFO,
+        "tool.request",
+        operation="create",
+        entity=entity_type,
+        arguments=arguments,
+    )
+
+    auth_response = check_access(True)
+    if auth_response:
+        return auth_response
+
+    _, params, headers, _ = map_arguments("create", arguments)
+
+    client = get_request_client()
+    auth_error = verify_credentials(client)
+    if auth_error:
+        return auth_error
+
+    entity_error = check_entity_type(client, entity_type)
+    if entity_error:
+        return entity_error
+
+    # Validate locally against cached tenant metadata
+    invalid = validate_entity_params(client, entity_type, params, create=True)
+    if invalid:
+        return invalid
+
+    result = call_tenant_api(
+        client, "POST", entity_type, params=params, extra_headers=headers or None
+    )
+    log_event(
+        logging.DEBUG,
+        "tool.result",
+        operation="create",
+        entity=entity_type,
+        result=result,
+    )
+    return result
+
+
+@pooled
+def update_record(entity_type: str, arguments: Dict[str, Any], id_param: str) -> Dict:
+    log_event(
+        logging.INFO,
+        "tool.request",
+        operation="update",
+        entity=entity_type,
+        arguments=arguments,
+    )
+
+    auth_response = check_access(True)
+    if auth_response:
+        return auth_response
+
+    record_id, params, _, _ = map_arguments("update", arguments, id_param)
+
+    client = get_request_client()
+    auth_error = verify_credentials(client)
+    if auth_error:
+        return auth_error
+
+    entity_error = check_entity_type(client, entity_type)
+    if entity_error:
+        return entity_error
+
+    # Validate locally against cached tenant metadata
+    invalid = validate_entity_params(client, entity_type, params)
+    if invalid:
+        return invalid
+
+    result = call_tenant_api(
+        client, "PATCH", f"{entity_type}/{record_id}", params=params
+    )
+    log_event(
+        logging.DEBUG,
+        "tool.result",
+        operation="update",
+        entity=entity_type,
+        result=result,
+    )
+    return result
+
+
+@pooled
+def delete_record(entity_type: str, arguments: Dict[str, Any], id_param: str) -> Dict:
+    log_event(
+        logging.INFO,
+        "tool.request",
+        operation="delete",
+        entity=entity_type,
+        arguments=arguments,
+    )
+
+    auth_response = check_access(True)
+    if auth_response:
+        return auth_response
+
+    record_id, _, _, _ = map_arguments("delete", arguments, id_param)
+
+    client = get_request_client()
+    auth_error = verify_credentials(client)
+    if auth_error:
+        return auth_error
+
+    entity_error = check_entity_type(client, entity_type)
+    if entity_error:
+        return entity_error
+
+    result = call_tenant_api(client, "DELETE", f"{entity_type}/{record_id}")
+    log_event(
+        logging.DEBUG,
+        "tool.result",
+        operation="delete",
+        entity=entity_type,
+        result=result,
+    )
+    return result
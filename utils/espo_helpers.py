@@ -1,9 +1,28 @@
 import urllib
+import threading
+import time
 import requests
+from collections import OrderedDict
 from core.utils.env import EnvConfig
-from core.utils.state import global_state
 from core.utils.logger import logger
 from typing import Dict, Any
+from urllib3.exceptions import EmptyPoolError
+from app.middleware.AuthenticationMiddleware import get_tenant
+from app.utils.dns_cache import CachedDNSAdapter
+from app.utils.metrics import normalize_endpoint, record_api_call
+from app.utils.slow_calls import log_slow_call, note_request, phase, track_call
+from app.utils.tracing import inject_headers, set_attributes, span
+
+# Tenant HTTP sessions kept open, least recently used ones are closed first
+ESPO_MAX_TENANT_CLIENTS = int(EnvConfig.get("ESPO_MAX_TENANT_CLIENTS") or 256)
+# Pooled connections per tenant, further requests wait for a free one
+ESPO_MAX_CONNECTIONS_PER_TENANT = int(
+    EnvConfig.get("ESPO_MAX_CONNECTIONS_PER_TENANT") or 4
+)
+# Seconds a tenant session may stay unused before its connections are closed
+ESPO_CLIENT_IDLE_TIMEOUT = int(EnvConfig.get("ESPO_CLIENT_IDLE_TIMEOUT") or 120)
+# Seconds a request waits for a free pooled connection before failing as busy
+ESPO_POOL_TIMEOUT = float(EnvConfig.get("ESPO_POOL_TIMEOUT") or 10)
 
 class EspoAPIError(Exception):
     pass
@@ -33,6 +52,112 @@ def build_espo_params(
     return params
 
 
+# Kinds of tool arguments in a compiled ParamMapper table
+PARAM, HEADER, RAW, CONTROL = range(4)
+
+
+class ParamMapper:
+    """Mapping from tool arguments to EspoCRM params, compiled once per signature.
+
+    `build_espo_params(locals())` re-derives the camelCase name of every
+    argument on each call and leaves headers, aliases and raw attribute dicts
+    to be patched by hand. The mapper resolves all of that up front into a
+    table, so mapping a call is a single pass over the arguments:
+
+    - `aliases`: arguments sent under an explicit attribute name (`from_`).
+    - `headers`: arguments sent as request headers instead of params.
+    - `raw`: dicts of already camelCased attributes merged into the params.
+    - `control`: arguments used by the tool itself, returned untouched.
+    - `exclude`: arguments dropped altogether.
+    """
+
+    __slots__ = ("table",)
+
+    def __init__(
+        self,
+        names,
+        *,
+        aliases: Dict[str, str] | None = None,
+        headers: Dict[str, str] | None = None,
+        raw=(),
+        control=(),
+        exclude=(),
+    ):
+        aliases = aliases or {}
+        headers = headers or {}
+        table = {}
+
+        for name in names:
+            if name in exclude or name in ("self", "kwargs"):
+                continue
+            if name in headers:
+                table[name] = (HEADER, headers[name])
+            elif name in raw:
+                table[name] = (RAW, name)
+            elif name in control:
+                table[name] = (CONTROL, name)
+            else:
+                table[name] = (PARAM, aliases.get(name) or snake_to_camel(name))
+
+        self.table = table
+
+    def map(self, arguments: Dict[str, Any]):
+        """Return `(params, headers, control)` for the given tool arguments.
+
+        `None` values are skipped, as are empty header values. Raw attribute
+        dicts are merged last so they can override mapped params.
+        """
+        params: Dict[str, Any] = {}
+        headers: Dict[str, str] = {}
+        control: Dict[str, Any] = {}
+        raw = []
+        table = self.table
+
+        for key, value in arguments.items():
+            if value is None:
+                continue
+            entry = table.get(key)
+            if entry is None:
+                continue
+
+            kind, target = entry
+            if kind == PARAM:
+                params[target] = value
+            elif kind == CONTROL:
+                control[target] = value
+            elif kind == RAW:
+                if value:
+                    raw.append(value)
+            elif value != "":
+                if isinstance(value, bool):
+                    value = "true" if value else "false"
+                headers[target] = str(value)
+
+        for attributes in raw:
+            params.update(attributes)
+
+        return params, headers, control
+
+
+def build_list_headers(
+    offset: int | None = None,
+    no_total: bool | None = None,
+) -> Dict[str, str]:
+    """Build the headers for a list request.
+
+    EspoCRM runs a `COUNT(*)` for every list request unless `X-No-Total` is
+    sent. The total is only needed on the first page of a traversal, so when
+    the caller leaves `no_total` unset, follow-up pages (`offset > 0`) skip it.
+    An explicit `no_total` always wins.
+    """
+    if no_total is None:
+        if not offset:
+            return {}
+        no_total = True
+
+    return {"X-No-Total": "true" if no_total else "false"}
+
+
 def http_build_query(data):
     parents = list()
     pairs = dict()
@@ -64,11 +189,19 @@ def http_build_query(data):
     return urllib.parse.urlencode(r_urlencode(data))
 
 
+def retry_count(resp) -> int:
+    """Return how many times urllib3 retried the request of a response."""
+    retries = getattr(getattr(resp, "raw", None), "retries", None)
+    return len(getattr(retries, "history", None) or ())
+
+
 class EspoAPI:
-    def __init__(self, url, api_key, default_headers=None):
+    def __init__(self, url, api_key, default_headers=None, session=None):
         self.url = url.rstrip('/')
         self.api_key = api_key
         self.default_headers = default_headers or {}
+        # Pooled requests.Session of the tenant, None sends unpooled requests
+        self.session = session
 
     def normalize_url(self, action):
 
@@ -109,6 +242,38 @@ class EspoAPI:
 
         This matches the user's preferred usage: `client.call_api(...)`.
         """
+        endpoint = normalize_endpoint(action)
+        attributes = {"http.method": method.upper(), "espo.endpoint": endpoint}
+        with span("EspoAPI.call_api", attributes) as current, track_call() as timings:
+            result = self._call_api(
+                method,
+                action,
+                params=params,
+                extra_headers=extra_headers,
+                timeout=timeout,
+                force_query_params=force_query_params,
+                allow_non_2xx=allow_non_2xx,
+            )
+            set_attributes(
+                current,
+                **{
+                    "http.status_code": result["status_code"],
+                    "espo.error_type": result["error_type"],
+                },
+            )
+
+        # Requests made by a tool call are reported in the tool's record
+        log_slow_call(
+            "api",
+            timings,
+            method=method.upper(),
+            endpoint=endpoint,
+            host=urllib.parse.urlsplit(self.url).hostname,
+            status=result["status_code"],
+        )
+        return result
+
+    def _call_api(self, method: str, action: str, params=None, extra_headers=None, timeout: int = 10, force_query_params: bool = False, allow_non_2xx: bool = False):
         url = self.normalize_url(action)
         headers = {}
         headers.update(self.default_headers or {})
@@ -117,21 +282,51 @@ class EspoAPI:
             headers.update(extra_headers)
 
         headers["X-Api-Key"] = self.api_key
+        inject_headers(headers)
 
         kwargs = {"headers": headers, "timeout": timeout}
+        if self.session is not None:
+            # Return after the headers so the body download is timed on its own
+            kwargs["stream"] = True
 
         if method.upper() in ["POST", "PATCH", "PUT", "DELETE"] and not force_query_params:
             
             if params:
                 kwargs["json"] = params
         else:
-            query = http_build_query(params) if params else ""
+            with phase("query_encode"):
+                query = http_build_query(params) if params else ""
             if query:
                 url = url + "?" + query
 
+        started = time.perf_counter()
+        resp = None
         try:
-            resp = requests.request(method, url, **kwargs)
+            resp = (self.session or requests).request(method, url, **kwargs)
+            # Streamed bodies are read here, a connection lost mid-body is a
+            # network error too
+            with span("download"), phase("download"):
+                content = getattr(resp, "content", None)
+        except EmptyPoolError:
+            seconds = time.perf_counter() - started
+            logger.warning(
+                f"EspoAPI {method} {action}: no free connection to {self.url}"
+            )
+            record_api_call(method, action, None, seconds, 0, "busy")
+            note_request(method, normalize_endpoint(action), None, seconds, 0)
+            return {
+                "status_code": None,
+                "ok": False,
+                "data": None,
+                "error": "All connections to the CRM are busy, retry later.",
+                "error_type": "busy",
+            }
         except requests.exceptions.RequestException as e:
+            if resp is not None:
+                resp.close()
+            seconds = time.perf_counter() - started
+            record_api_call(method, action, None, seconds, 0, "network")
+            note_request(method, normalize_endpoint(action), None, seconds, 0)
             return {
                 "status_code": None,
                 "ok": False,
@@ -151,10 +346,11 @@ class EspoAPI:
                 logger.warning(msg)
 
         body = None
-        try:
-            body = resp.json()
-        except ValueError:
-            body = resp.text
+        with span("decode"), phase("decode"):
+            try:
+                body = resp.json()
+            except ValueError:
+                body = resp.text
 
         ok = 200 <= status < 300
         error = None
@@ -164,6 +360,13 @@ class EspoAPI:
             error = f"HTTP {status}"
             error_type = "api"
 
+        seconds = time.perf_counter() - started
+        size = len(content) if isinstance(content, bytes) else 0
+        record_api_call(method, action, status, seconds, size, error_type)
+        note_request(
+            method, normalize_endpoint(action), status, seconds, size, retry_count(resp)
+        )
+
         return {
             "status_code": status,
             "ok": ok,
@@ -190,6 +393,162 @@ def get_client(url: str | None = None, api_key: str | None = None):
     return EspoAPI(url, api_key)
 
 
+class TenantClientRegistry:
+    """Bounded registry of pooled HTTP sessions, one per tenant API address.
+
+    Sessions are kept in least recently used order. When `max_tenants` is
+    reached the least recently used session is closed (evicted), and sessions
+    unused for `idle_timeout` seconds are closed (reaped) on the next lookup,
+    so thousands of tenants never hold thousands of idle sockets. Each session
+    keeps at most `max_connections` connections to its CRM; a request waits
+    up to `pool_timeout` seconds for one of them to be free.
+    """
+
+    def __init__(
+        self,
+        max_tenants: int = ESPO_MAX_TENANT_CLIENTS,
+        max_connections: int = ESPO_MAX_CONNECTIONS_PER_TENANT,
+        idle_timeout: int = ESPO_CLIENT_IDLE_TIMEOUT,
+        pool_timeout: float = ESPO_POOL_TIMEOUT,
+    ):
+        self.max_tenants = max_tenants
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.pool_timeout = pool_timeout
+        self._sessions: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "reaped": 0}
+
+    def create_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = CachedDNSAdapter(
+            pool_connections=1,
+            pool_maxsize=self.max_connections,
+            pool_block=True,
+            pool_timeout=self.pool_timeout,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def get_session(self, api_address: str) -> requests.Session:
+        key = api_address.rstrip("/")
+        now = time.monotonic()
+        closing = []
+
+        with self._lock:
+            closing.extend(self._reap(now))
+            entry = self._sessions.get(key)
+
+            if entry is not None:
+                self._sessions.move_to_end(key)
+                entry[1] = now
+                self._stats["hits"] += 1
+            else:
+                closing.extend(self._make_room())
+                entry = [self.create_session(), now]
+                self._sessions[key] = entry
+                self._stats["misses"] += 1
+
+        # Close outside the lock, it may wait on sockets
+        for session in closing:
+            session.close()
+
+        return entry[0]
+
+    def adopt_session(
+        self, api_address: str, session: requests.Session
+    ) -> requests.Session:
+        """Register a session opened outside the registry (a prewarm probe).
+
+        If the tenant already has a session the given one is closed. Returns
+        the tenant session.
+        """
+        key = api_address.rstrip("/")
+        now = time.monotonic()
+        closing = []
+
+        with self._lock:
+            closing.extend(self._reap(now))
+            entry = self._sessions.get(key)
+
+            if entry is not None:
+                closing.append(session)
+            else:
+                closing.extend(self._make_room())
+                entry = [session, now]
+                self._sessions[key] = entry
+
+        for closed in closing:
+            closed.close()
+
+        return entry[0]
+
+    def _make_room(self):
+        """Pop least recently used sessions until a new one fits."""
+        evicted = []
+        while len(self._sessions) >= self.max_tenants:
+            _, entry = self._sessions.popitem(last=False)
+            evicted.append(entry[0])
+            self._stats["evictions"] += 1
+        return evicted
+
+    def _reap(self, now: float):
+        """Pop sessions idle for longer than `idle_timeout`, oldest first."""
+        reaped = []
+        while self._sessions:
+            key, entry = next(iter(self._sessions.items()))
+            if now - entry[1] < self.idle_timeout:
+                break
+            del self._sessions[key]
+            reaped.append(entry[0])
+            self._stats["reaped"] += 1
+        return reaped
+
+    def reap_idle(self) -> int:
+        """Close idle sessions now, returns how many were closed."""
+        with self._lock:
+            reaped = self._reap(time.monotonic())
+        for session in reaped:
+            session.close()
+        return len(reaped)
+
+    def close_all(self):
+        with self._lock:
+            sessions = [entry[0] for entry in self._sessions.values()]
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return occupancy and eviction counters."""
+        with self._lock:
+            return {
+                "tenants": len(self._sessions),
+                "max_tenants": self.max_tenants,
+                "max_connections": self.max_connections,
+                "idle_timeout": self.idle_timeout,
+                **self._stats,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+
+client_registry = TenantClientRegistry()
+
+
+def get_request_client() -> EspoAPI:
+    """Return an EspoAPI client for the credentials of the current request.
+
+    The client uses the pooled session of the tenant from `client_registry`.
+    """
+    tenant = get_tenant()
+    session = client_registry.get_session(tenant.api_address)
+    return EspoAPI(tenant.api_address, tenant.api_key, session=session)
+
+
 def call_api(
     client: EspoAPI,
     method: str,
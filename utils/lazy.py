@@ -0,0 +1,35 @@
+import importlib
+import threading
+
+
+class LazyModule:
+    """Module proxy that imports `name` on first attribute access.
+
+    Tool modules are all imported when the server starts, but most of their
+    dependencies (requests, configs, metadata cache) are only needed once a
+    tool is called. Accessing them through a `LazyModule` moves that cost
+    from startup to the first invocation.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._module is None:
+                self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        module = self._module or self._load()
+        return getattr(module, attr)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._module is not None
+
+
+def lazy_import(name: str) -> LazyModule:
+    return LazyModule(name)
@@ -0,0 +1,136 @@
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from core.utils.env import EnvConfig
+
+# Snapshots kept for diffs, the oldest is dropped first
+ESPO_MEMORY_MAX_SNAPSHOTS = int(EnvConfig.get("ESPO_MEMORY_MAX_SNAPSHOTS") or 4)
+# Frames stored per allocation when tracing is started without a value
+ESPO_TRACEMALLOC_FRAMES = int(EnvConfig.get("ESPO_TRACEMALLOC_FRAMES") or 10)
+
+KEY_TYPES = ("lineno", "filename", "traceback")
+
+# Allocations of tracemalloc itself and of the import machinery are noise
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class MemoryDiagnostics:
+    """Start and stop tracemalloc and keep numbered snapshots for comparison.
+
+    Tracing costs memory and CPU on every allocation while it is on, so it is
+    only started on request. Snapshots are kept in memory, at most
+    `max_snapshots` of them; they survive `stop()` so the last state can still
+    be inspected.
+    """
+
+    def __init__(self, max_snapshots: int = ESPO_MEMORY_MAX_SNAPSHOTS):
+        self.max_snapshots = max_snapshots
+        self._snapshots: "OrderedDict[int, tuple]" = OrderedDict()
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def start(self, frames: int = ESPO_TRACEMALLOC_FRAMES) -> Dict:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        return self.status()
+
+    def stop(self) -> Dict:
+        tracemalloc.stop()
+        return self.status()
+
+    def status(self) -> Dict:
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        with self._lock:
+            snapshots = [
+                {"id": snapshot_id, "taken_at": taken_at}
+                for snapshot_id, (taken_at, _) in self._snapshots.items()
+            ]
+        return {
+            "tracing": tracing,
+            "frames": tracemalloc.get_traceback_limit() if tracing else 0,
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "tracemalloc_bytes": tracemalloc.get_tracemalloc_memory(),
+            "snapshots": snapshots,
+        }
+
+    def take_snapshot(self) -> int:
+        """Store a snapshot and return its id. Raises RuntimeError if not tracing."""
+        snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+        with self._lock:
+            snapshot_id = self._next_id
+            self._next_id += 1
+            self._snapshots[snapshot_id] = (time.time(), snapshot)
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return snapshot_id
+
+    def get_snapshot(self, snapshot_id: Optional[int] = None):
+        """Return a stored snapshot (KeyError if unknown) or a fresh one for None."""
+        if snapshot_id is None:
+            return tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+        with self._lock:
+            return self._snapshots[snapshot_id][1]
+
+    def top(
+        self,
+        snapshot_id: Optional[int] = None,
+        key_type: str = "lineno",
+        limit: int = 20,
+    ) -> List[Dict]:
+        """Return the allocation sites holding the most memory."""
+        stats = self.get_snapshot(snapshot_id).statistics(key_type)
+        return [
+            {
+                "location": format_traceback(stat.traceback, key_type),
+                "size_bytes": stat.size,
+                "count": stat.count,
+            }
+            for stat in stats[:limit]
+        ]
+
+    def diff(
+        self,
+        old_id: int,
+        new_id: Optional[int] = None,
+        key_type: str = "lineno",
+        limit: int = 20,
+    ) -> List[Dict]:
+        """Return the allocation sites that grew (or shrank) the most."""
+        old = self.get_snapshot(old_id)
+        new = self.get_snapshot(new_id)
+        stats = new.compare_to(old, key_type)
+        return [
+            {
+                "location": format_traceback(stat.traceback, key_type),
+                "size_bytes": stat.size,
+                "size_diff_bytes": stat.size_diff,
+                "count": stat.count,
+                "count_diff": stat.count_diff,
+            }
+            for stat in stats[:limit]
+        ]
+
+
+def format_traceback(traceback, key_type: str):
+    """Return `file:line` (`file` when grouped by file), or a list for tracebacks."""
+    if key_type == "traceback":
+        return [f"{frame.filename}:{frame.lineno}" for frame in traceback]
+
+    frame = traceback[0]
+    if key_type == "filename":
+        return frame.filename
+    return f"{frame.filename}:{frame.lineno}"
+
+
+memory_diagnostics = MemoryDiagnostics()
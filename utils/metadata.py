@@ -0,0 +1,226 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+from core.utils.env import EnvConfig
+from core.utils.logger import logger
+from app.utils.budget import encoded_size
+
+METADATA_CACHE_TTL = int(EnvConfig.get("ESPO_METADATA_CACHE_TTL") or 300)
+METADATA_CACHE_MAX_TENANTS = int(
+    EnvConfig.get("ESPO_METADATA_CACHE_MAX_TENANTS") or 256
+)
+# Failed fetches are remembered for a short while so a CRM without metadata
+# access does not get one extra request per tool call.
+METADATA_FAILURE_TTL = 60
+
+# Fields that are not sent under their own name (links) or are filled in by
+# EspoCRM itself, so a missing value is not an error on create.
+REQUIRED_SKIP_TYPES = {
+    "link",
+    "linkMultiple",
+    "linkParent",
+    "linkOne",
+    "foreign",
+    "personName",
+    "autoincrement",
+    "number",
+}
+
+# Params that satisfy a required field under another name, per entity
+# (EspoCRM copies the Email `subject` into `name`).
+REQUIRED_ALIASES = {
+    "Email": {"name": ("subject",)},
+}
+
+
+class MetadataCache:
+    """Per-tenant cache of EspoCRM field definitions (`entityDefs.*.fields`).
+
+    Entries are keyed by the tenant API address and expire after `ttl`
+    seconds. Only the field definitions are kept, not the whole metadata.
+    At most `max_tenants` addresses are kept, least recently used first out,
+    and concurrent misses for the same address share one fetch.
+    """
+
+    def __init__(
+        self,
+        ttl: int = METADATA_CACHE_TTL,
+        max_tenants: int = METADATA_CACHE_MAX_TENANTS,
+    ):
+        self.ttl = ttl
+        self.max_tenants = max_tenants
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def get_fields(self, client, entity_type: str) -> Optional[Dict[str, Dict]]:
+        """Return the field definitions of `entity_type`, or None if unknown."""
+        entity_defs = self.get_entity_defs(client)
+        if entity_defs is None:
+            return None
+        return entity_defs.get(entity_type)
+
+    def get_entity_defs(self, client) -> Optional[Dict[str, Dict]]:
+        key = client.url
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+            future = self._pending.get(key)
+            fetching = future is None
+            if fetching:
+                future = self._pending[key] = Future()
+
+        # Another call is fetching the same address, wait for its result
+        if not fetching:
+            return future.result()
+
+        try:
+            entity_defs = self._fetch(client)
+        except BaseException as e:
+            with self._lock:
+                self._pending.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        ttl = self.ttl if entity_defs is not None else METADATA_FAILURE_TTL
+
+        with self._lock:
+            self._entries[key] = (now + ttl, entity_defs)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_tenants:
+                self._entries.popitem(last=False)
+            self._pending.pop(key, None)
+
+        future.set_result(entity_defs)
+        return entity_defs
+
+    def _fetch(self, client) -> Optional[Dict[str, Dict]]:
+        result = client.call_api("GET", "Metadata")
+        data = result.get("data") if result else None
+
+        if not result or not result.get("ok") or not isinstance(data, dict):
+            logger.warning(
+                f"Could not load EspoCRM metadata from {client.url}, "
+                "local validation disabled"
+            )
+            return None
+
+        return {
+            entity_type: defs.get("fields", {})
+            for entity_type, defs in data.get("entityDefs", {}).items()
+            if isinstance(defs, dict)
+        }
+
+    def invalidate(self, url: Optional[str] = None):
+        with self._lock:
+            if url is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(url.rstrip("/"), None)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of cached tenants and the encoded size of their fields."""
+        with self._lock:
+            entries = list(self._entries.values())
+        return {
+            "entries": len(entries),
+            "bytes": sum(encoded_size(entity_defs) for _, entity_defs in entries),
+        }
+
+
+metadata_cache = MetadataCache()
+
+
+def validate_params(
+    fields: Dict[str, Dict],
+    params: Dict[str, Any],
+    *,
+    create: bool = False,
+    aliases: Optional[Dict[str, tuple]] = None,
+) -> List[str]:
+    """Validate camelCase `params` against EspoCRM field definitions.
+
+    Checks enum options, varchar max lengths and, on create, required fields.
+    Params without a field definition are left for EspoCRM to handle.
+    """
+    errors = []
+
+    for key, value in params.items():
+        field = fields.get(key)
+        if not field or value is None:
+            continue
+
+        field_type = field.get("type")
+        options = field.get("options")
+
+        if field_type == "enum" and options and value not in options:
+            errors.append(
+                f"Invalid value '{value}' for `{key}`. "
+                f"Allowed: {', '.join(str(o) for o in options if o != '')}"
+            )
+        elif field_type == "multiEnum" and options and isinstance(value, list):
+            invalid = [v for v in value if v not in options]
+            if invalid:
+                errors.append(
+                    f"Invalid values {invalid} for `{key}`. "
+                    f"Allowed: {', '.join(str(o) for o in options if o != '')}"
+                )
+
+        max_length = field.get("maxLength")
+        if max_length and isinstance(value, str) and len(value) > max_length:
+            errors.append(f"`{key}` exceeds max length of {max_length} characters.")
+
+    if create:
+        aliases = aliases or {}
+        for key, field in fields.items():
+            if (
+                not field.get("required")
+                or field.get("readOnly")
+                or "default" in field
+                or field.get("type") in REQUIRED_SKIP_TYPES
+            ):
+                continue
+            provided = [params.get(k) for k in (key, *aliases.get(key, ()))]
+            if all(value in (None, "") for value in provided):
+                errors.append(f"`{key}` is required.")
+
+    return errors
+
+
+def validate_entity_params(
+    client, entity_type: str, params: Dict[str, Any], *, create: bool = False
+) -> Optional[Dict]:
+    """Validate params locally with the tenant's cached metadata.
+
+    Returns an error result shaped like `EspoAPI.call_api` output when
+    validation fails, otherwise None. When metadata is unavailable the
+    request is let through and EspoCRM validates it.
+    """
+    fields = metadata_cache.get_fields(client, entity_type)
+    if not fields:
+        return None
+
+    errors = validate_params(
+        fields, params, create=create, aliases=REQUIRED_ALIASES.get(entity_type)
+    )
+    if not errors:
+        return None
+
+    logger.info(f"Local validation failed for {entity_type}: {errors}")
+    return {
+        "status_code": None,
+        "ok": False,
+        "data": None,
+        "error": " ".join(errors),
+        "error_type": "validation",
+    }
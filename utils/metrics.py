@@ -0,0 +1,283 @@
+import re
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, List, Tuple
+from app.utils.entities import BUILTIN_ENTITIES
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def label_order(item) -> Tuple:
+    # Label values may mix types (e.g. an int status and "" for network errors)
+    return tuple(str(value) for value in item[0])
+
+
+def format_value(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, *labelvalues, amount: float = 1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues) -> float:
+        with self._lock:
+            return self._values.get(labelvalues, 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items(), key=label_order)
+        lines = self.header()
+        for labels, value in items:
+            lines.append(
+                f"{self.name}{format_labels(self.labelnames, labels)} "
+                f"{format_value(value)}"
+            )
+        return lines
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labelvalues):
+        # Bucket counts are stored per bucket and summed up on render
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labelvalues)
+            if entry is None:
+                entry = [[0] * (len(self.buckets) + 1), 0, 0]
+                self._values[labelvalues] = entry
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def count(self, *labelvalues) -> int:
+        with self._lock:
+            entry = self._values.get(labelvalues)
+            return entry[2] if entry else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(
+                (
+                    (labels, (list(entry[0]), entry[1], entry[2]))
+                    for labels, entry in self._values.items()
+                ),
+                key=label_order,
+            )
+
+        bounds = [format_value(float(bound)) for bound in self.buckets] + ["+Inf"]
+        lines = self.header()
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                label_str = format_labels(self.labelnames, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{label_str} {cumulative}")
+            label_str = format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {format_value(total)}")
+            lines.append(f"{self.name}_count{label_str} {count}")
+        return lines
+
+
+class GaugeFunction(Metric):
+    """Gauge read from a callback on every scrape.
+
+    The callback returns a number, or a dict of label value tuples to numbers.
+    """
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        fn: Callable,
+        labelnames: Tuple[str, ...] = (),
+    ):
+        super().__init__(name, help, labelnames)
+        self.fn = fn
+
+    def render(self) -> List[str]:
+        values = self.fn()
+        if not isinstance(values, dict):
+            values = {(): values}
+
+        lines = self.header()
+        for labels, value in sorted(values.items(), key=label_order):
+            lines.append(
+                f"{self.name}{format_labels(self.labelnames, labels)} "
+                f"{format_value(float(value))}"
+            )
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide set of metrics rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            # Re-registering (e.g. a reloaded module) keeps the existing metric
+            return self._metrics.setdefault(metric.name, metric)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines: List[str] = []
+        for metric in metrics:
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+tool_calls = registry.register(
+    Counter(
+        "espo_tool_calls_total",
+        "Tool calls by tool, operation, entity and error type (empty on success).",
+        ("tool", "operation", "entity", "error_type"),
+    )
+)
+tool_duration = registry.register(
+    Histogram(
+        "espo_tool_duration_seconds",
+        "Tool call latency in seconds, including the wait for a pool worker.",
+        ("tool", "operation", "entity"),
+    )
+)
+api_requests = registry.register(
+    Counter(
+        "espo_api_requests_total",
+        "EspoCRM API requests by method, endpoint and status.",
+        ("method", "endpoint", "status"),
+    )
+)
+api_duration = registry.register(
+    Histogram(
+        "espo_api_request_duration_seconds",
+        "EspoCRM API request latency in seconds.",
+        ("method", "endpoint"),
+    )
+)
+api_response_bytes = registry.register(
+    Histogram(
+        "espo_api_response_bytes",
+        "EspoCRM API response body size in bytes.",
+        ("method", "endpoint"),
+        buckets=BYTES_BUCKETS,
+    )
+)
+api_errors = registry.register(
+    Counter(
+        "espo_api_errors_total",
+        "EspoCRM API requests that failed, by method, endpoint and error type.",
+        ("method", "endpoint", "error_type"),
+    )
+)
+
+# Second path segments that are not record ids (`Entity/action/<name>`)
+ID_SEGMENT_EXCEPTIONS = {"action", "layout"}
+# Controllers that are not entities, their actions are kept as they are
+CONTROLLERS = {"App", "Metadata"}
+URL_PREFIX = re.compile(r"^https?://[^/]+(/api/v1)?", re.IGNORECASE)
+
+
+def normalize_endpoint(action) -> str:
+    """Return the API action with a bounded set of values, for metric labels.
+
+    EspoCRM actions are `Entity`, `Entity/<id>`, `Entity/<id>/<link>`,
+    `Entity/action/<name>` and a few controllers such as `App/user` or
+    `Metadata`. Entity types without dedicated tools become `custom`, like
+    the tool metrics do, the id position becomes `{id}` and any further
+    segments collapse into `*`, so labels stay bounded without guessing what
+    an id looks like.
+    """
+    if action is None:
+        return ""
+
+    path = URL_PREFIX.sub("", str(action)).split("?", 1)[0].strip("/")
+    parts = path.split("/")
+
+    if parts[0] in CONTROLLERS:
+        return path
+
+    if parts[0] not in BUILTIN_ENTITIES:
+        parts[0] = "custom"
+    if len(parts) >= 2 and parts[1] not in ID_SEGMENT_EXCEPTIONS:
+        parts[1] = "{id}"
+    if len(parts) > 2:
+        parts[2:] = ["*"]
+
+    return "/".join(parts)
+
+
+def record_api_call(
+    method: str, action, status, seconds: float, size: int, error_type
+):
+    endpoint = normalize_endpoint(action)
+    method = method.upper()
+
+    api_requests.inc(method, endpoint, status if status is not None else "")
+    api_duration.observe(seconds, method, endpoint)
+    api_response_bytes.observe(size, method, endpoint)
+    if error_type:
+        api_errors.inc(method, endpoint, error_type)
+
+
+def record_tool_call(
+    tool: str, operation: str, entity: str, seconds: float, error_type
+):
+    tool_calls.inc(tool, operation, entity, error_type or "")
+    tool_duration.observe(seconds, tool, operation, entity)
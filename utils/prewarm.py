@@ -0,0 +1,101 @@
+import threading
+import time
+from collections import OrderedDict
+from core.utils.env import EnvConfig
+from core.utils.logger import logger
+from app.utils.lazy import lazy_import
+from app.utils.credentials import VALID, credential_cache, credentials_key
+from app.utils.tool_pool import ToolPoolSaturatedError, tool_pool
+
+# espo_helpers imports the middleware, which imports this module
+espo_helpers = lazy_import("app.utils.espo_helpers")
+
+PREWARM_CONNECTIONS = str(
+    EnvConfig.get("ESPO_PREWARM_CONNECTIONS") or "true"
+).lower() in ("1", "true", "yes")
+
+# Addresses whose probe got no answer (unreachable host, server error) are
+# not prewarmed again for this long
+PREWARM_FAILURE_TTL = 60
+PREWARM_MAX_FAILED = 1024
+
+_pending = set()
+_failed: "OrderedDict[str, float]" = OrderedDict()
+_pending_lock = threading.Lock()
+
+
+def _recently_failed(address: str) -> bool:
+    with _pending_lock:
+        expires = _failed.get(address)
+        if expires is None:
+            return False
+        if expires <= time.monotonic():
+            del _failed[address]
+            return False
+        return True
+
+
+def _mark_failed(address: str):
+    with _pending_lock:
+        _failed[address] = time.monotonic() + PREWARM_FAILURE_TTL
+        _failed.move_to_end(address)
+        while len(_failed) > PREWARM_MAX_FAILED:
+            _failed.popitem(last=False)
+
+
+def prewarm_tenant(api_address: str, api_key: str) -> bool:
+    """Open a pooled connection for a new (address, key) pair in the background.
+
+    The warm-up request is the credential probe, so by the time the first
+    tool call runs DNS is cached, the TCP/TLS connection is in the tenant
+    session pool and the key is verified. Pairs already known to the
+    credential cache are skipped, and so are addresses over their probe limit
+    or whose last warm-up got no answer. The connection only joins the tenant
+    client registry once the key is verified, so unknown addresses cannot
+    evict real tenants. Returns whether a warm-up was scheduled.
+    """
+    if not PREWARM_CONNECTIONS:
+        return False
+
+    if credential_cache.lookup(api_address, api_key) is not None:
+        return False
+
+    key = credentials_key(api_address, api_key)
+    if _recently_failed(key[0]) or credential_cache.is_rate_limited(key[0]):
+        return False
+
+    with _pending_lock:
+        if key in _pending:
+            return False
+        _pending.add(key)
+
+    try:
+        tool_pool.submit(api_address, _prewarm, api_address, api_key, key)
+    except ToolPoolSaturatedError:
+        with _pending_lock:
+            _pending.discard(key)
+        return False
+
+    return True
+
+
+def _prewarm(api_address: str, api_key: str, key: tuple):
+    registry = espo_helpers.client_registry
+    session = registry.create_session()
+    adopted = False
+    try:
+        client = espo_helpers.EspoAPI(api_address, api_key, session=session)
+        status = credential_cache.verify(client)
+        if status is VALID:
+            registry.adopt_session(api_address, session)
+            adopted = True
+        elif status is None:
+            _mark_failed(key[0])
+    except Exception as e:
+        _mark_failed(key[0])
+        logger.warning(f"Connection prewarm for {api_address} failed: {str(e)}")
+    finally:
+        if not adopted:
+            session.close()
+        with _pending_lock:
+            _pending.discard(key)
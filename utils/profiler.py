@@ -0,0 +1,238 @@
+import html
+import marshal
+import os
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import Dict, List, Tuple
+from core.utils.env import EnvConfig
+
+# Upper bound of one profiling run and lower bound of the sampling interval
+ESPO_PROFILE_MAX_SECONDS = float(EnvConfig.get("ESPO_PROFILE_MAX_SECONDS") or 60)
+ESPO_PROFILE_MIN_INTERVAL = 0.001
+
+# Innermost Python frames of threads that are waiting, not running
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+}
+
+# (filename, first line, function name), the function key used by pstats
+Frame = Tuple[str, int, str]
+
+
+class ProfilerBusyError(Exception):
+    pass
+
+
+class Profile:
+    """Stacks sampled by `SamplingProfiler`, outermost frame first.
+
+    Every stack starts with a pseudo frame naming its thread.
+    """
+
+    def __init__(self, stacks: Counter, interval: float, seconds: float):
+        self.stacks = stacks
+        self.interval = interval
+        self.seconds = seconds
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def collapsed(self) -> str:
+        """Return the stacks in the collapsed format read by flamegraph.pl."""
+        lines = [
+            f"{';'.join(frame_label(frame) for frame in stack)} {count}"
+            for stack, count in sorted(self.stacks.items())
+        ]
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def pstats(self) -> bytes:
+        """Return the samples as a marshalled dict loadable by `pstats.Stats`.
+
+        Times are sample counts multiplied by the interval and call counts
+        are sample counts: a sampling profiler does not see calls.
+        """
+        stats: Dict[Frame, list] = {}
+
+        def entry(frame):
+            if frame not in stats:
+                stats[frame] = [0, 0, 0.0, 0.0, {}]
+            return stats[frame]
+
+        for stack, count in self.stacks.items():
+            frames = stack[1:]
+            seconds = count * self.interval
+            for frame in set(frames):
+                current = entry(frame)
+                current[0] += count
+                current[1] += count
+                current[3] += seconds
+            if frames:
+                entry(frames[-1])[2] += seconds
+            for caller, callee in set(zip(frames, frames[1:])):
+                callers = entry(callee)[4]
+                nc, cc, tt, ct = callers.get(caller, (0, 0, 0.0, 0.0))
+                leaf = callee == frames[-1]
+                callers[caller] = (
+                    nc + count,
+                    cc + count,
+                    tt + (seconds if leaf else 0.0),
+                    ct + seconds,
+                )
+
+        return marshal.dumps({frame: tuple(values) for frame, values in stats.items()})
+
+    def flamegraph(self, title: str = "EspoCRM MCP server") -> str:
+        return render_flamegraph(self.stacks, title, self.samples)
+
+
+class SamplingProfiler:
+    """Wall-clock sampling profiler for every thread of the process.
+
+    A background thread reads `sys._current_frames()` every `interval`
+    seconds; no trace or profile hooks are installed, so the threads being
+    profiled are not slowed down beyond the GIL time of the stack walk. Only
+    one run at a time is allowed. Idle threads (waiting on a lock, queue or
+    selector) are skipped unless `include_idle` is set.
+    """
+
+    _running = threading.Lock()
+
+    def __init__(self, interval: float = 0.01, include_idle: bool = False):
+        self.interval = max(interval, ESPO_PROFILE_MIN_INTERVAL)
+        self.include_idle = include_idle
+
+    def run(self, seconds: float) -> Profile:
+        seconds = min(max(seconds, 0.0), ESPO_PROFILE_MAX_SECONDS)
+        if not self._running.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already being taken.")
+
+        try:
+            return self._sample(seconds)
+        finally:
+            self._running.release()
+
+    def _sample(self, seconds: float) -> Profile:
+        stacks: Counter = Counter()
+        own = threading.get_ident()
+        started = time.perf_counter()
+        deadline = started + seconds
+
+        while True:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = self._stack(frame)
+                if stack is not None:
+                    thread = ("", 0, f"<thread {names.get(ident, ident)}>")
+                    stacks[(thread,) + stack] += 1
+
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            time.sleep(min(self.interval, deadline - now))
+
+        return Profile(stacks, self.interval, time.perf_counter() - started)
+
+    def _stack(self, frame):
+        code = frame.f_code
+        if not self.include_idle:
+            if (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+                return None
+
+        stack: List[Frame] = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+            frame = frame.f_back
+        stack.reverse()
+        return tuple(stack)
+
+
+def frame_label(frame: Frame) -> str:
+    filename, line, name = frame
+    if not filename:
+        return name
+    return f"{name} ({short_path(filename)}:{line})"
+
+
+def short_path(filename: str) -> str:
+    """Return the path from the package or module root, e.g. `app/utils/x.py`."""
+    for marker in ("site-packages", "dist-packages"):
+        head, sep, tail = filename.rpartition(f"{os.sep}{marker}{os.sep}")
+        if sep:
+            return tail
+    parts = filename.split(os.sep)
+    return os.sep.join(parts[-3:])
+
+
+FLAME_WIDTH = 1200
+FLAME_ROW = 16
+FLAME_MIN_WIDTH = 0.5
+
+
+def render_flamegraph(stacks: Counter, title: str, total: int) -> str:
+    """Render sampled stacks as a self-contained SVG flamegraph.
+
+    Frames are merged by position like flamegraph.pl; hovering a frame shows
+    its sample count in the title tooltip.
+    """
+    root: Dict = {"count": 0, "children": {}}
+    depth = 0
+    for stack, count in stacks.items():
+        root["count"] += count
+        node = root
+        for frame in stack:
+            node = node["children"].setdefault(
+                frame_label(frame), {"count": 0, "children": {}}
+            )
+            node["count"] += count
+        depth = max(depth, len(stack))
+
+    height = (depth + 2) * FLAME_ROW
+    scale = FLAME_WIDTH / max(root["count"], 1)
+    rects: List[str] = []
+
+    def layout(node, x: float, level: int):
+        for label, child in sorted(node["children"].items()):
+            width = child["count"] * scale
+            if width >= FLAME_MIN_WIDTH:
+                y = height - (level + 2) * FLAME_ROW
+                rects.append(flame_rect(label, child["count"], total, x, y, width))
+                layout(child, x, level + 1)
+            x += width
+
+    layout(root, 0.0, 0)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{FLAME_WIDTH}" '
+        f'height="{height}" font-family="monospace" font-size="11">'
+        f'<text x="4" y="12">{html.escape(title)}: {total} samples</text>'
+        + "".join(rects)
+        + "</svg>"
+    )
+
+
+def flame_rect(label: str, count: int, total: int, x, y, width) -> str:
+    # Stable warm colour per function name
+    hue = zlib.crc32(label.encode("utf-8")) % 60
+    share = 100 * count / max(total, 1)
+    text = label if len(label) * 7 < width else label[: int(width // 7) - 2] + ".."
+    escaped = html.escape(label)
+    return (
+        f"<g><title>{escaped} ({count} samples, {share:.1f}%)</title>"
+        f'<rect x="{x:.1f}" y="{y}" width="{width:.1f}" height="{FLAME_ROW - 1}" '
+        f'fill="hsl({hue},90%,60%)"/>'
+        + (
+            f'<text x="{x + 2:.1f}" y="{y + FLAME_ROW - 4}">{html.escape(text)}</text>'
+            if width > 21
+            else ""
+        )
+        + "</g>"
+    )
@@ -0,0 +1,101 @@
+import json
+import os
+from typing import Dict, List, Optional
+
+PROFILE_FULL = "full"
+PROFILE_SUMMARY = "summary"
+
+CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "config",
+    "projections.json",
+)
+
+
+def load_projection_config(path: str = CONFIG_PATH) -> Dict:
+    """Load projection profiles, keeping profile attributes as tuples."""
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+
+    for entity in config.get("entities", {}).values():
+        profiles = entity.get("profiles", {})
+        for name, attributes in profiles.items():
+            profiles[name] = tuple(attributes)
+
+    return config
+
+
+projection_config = load_projection_config()
+
+
+def default_profile(entity_type: str, operation: str) -> str:
+    """Return the configured default profile for an entity and operation
+    (`list` or `get`). Entity level `default_profiles` override the global ones.
+    """
+    entity = projection_config.get("entities", {}).get(entity_type, {})
+    profile = entity.get("default_profiles", {}).get(operation)
+
+    if profile is None:
+        profile = projection_config.get("default_profiles", {}).get(
+            operation, PROFILE_FULL
+        )
+
+    return profile
+
+
+def resolve_attribute_select(
+    entity_type: str,
+    attribute_select: Optional[List[str]] = None,
+    projection: Optional[str] = None,
+    *,
+    operation: str = "list",
+) -> Optional[List[str]]:
+    """Resolve the attributes to request for an entity.
+
+    An explicit `attribute_select` always wins. Otherwise the `projection`
+    profile (or the configured default for the operation) is used. The `full`
+    profile, and `summary` on entities that do not define it, return None,
+    which means no selection is sent and EspoCRM returns every attribute.
+    Raises ValueError for an unknown profile.
+    """
+    if attribute_select:
+        return attribute_select
+
+    profile = projection or default_profile(entity_type, operation)
+
+    if profile == PROFILE_FULL:
+        return None
+
+    profiles = (
+        projection_config.get("entities", {}).get(entity_type, {}).get("profiles", {})
+    )
+
+    if profile not in profiles:
+        if projection is None or profile == PROFILE_SUMMARY:
+            # A default, or the built-in summary profile, that is not defined
+            # for this entity means "everything"
+            return None
+        raise ValueError(
+            f"Unknown projection profile '{profile}' for {entity_type}. "
+            f"Available: {', '.join([PROFILE_FULL, *profiles])}"
+        )
+
+    return list(profiles[profile])
+
+
+def build_select_params(
+    entity_type: str,
+    attribute_select: Optional[List[str]] = None,
+    projection: Optional[str] = None,
+    *,
+    operation: str = "get",
+) -> Dict[str, str]:
+    """Build the comma-joined `select` query param for a list or record read."""
+    select = resolve_attribute_select(
+        entity_type, attribute_select, projection, operation=operation
+    )
+
+    if not select:
+        return {}
+
+    return {"select": ",".join(select)}
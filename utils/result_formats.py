@@ -0,0 +1,100 @@
+from typing import Any, Dict, List, Optional
+
+FORMAT_RECORDS = "records"
+FORMAT_COLUMNAR = "columnar"
+
+# A column is dictionary encoded when it only holds strings and has at most
+# this many distinct values, and fewer distinct values than half the rows.
+DICTIONARY_MAX_VALUES = 256
+
+
+def encode_columnar(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Encode a list of records as `{columns, rows, dictionaries}`.
+
+    Attribute names are sent once in `columns` and every row becomes a list
+    of values in the same order. Low-cardinality string columns (e.g.
+    `status`, `assignedUserName`) are dictionary encoded: their row values are
+    indexes into `dictionaries[column]`. Missing attributes and nulls stay None.
+    """
+    columns: Dict[str, int] = {}
+    for record in records:
+        for key in record:
+            if key not in columns:
+                columns[key] = len(columns)
+
+    names = list(columns)
+    rows = [[record.get(name) for name in names] for record in records]
+
+    dictionaries: Dict[str, List[str]] = {}
+    limit = min(DICTIONARY_MAX_VALUES, len(rows) // 2)
+
+    for index, name in enumerate(names):
+        values: Dict[str, int] = {}
+        for row in rows:
+            value = row[index]
+            if value is None:
+                continue
+            if not isinstance(value, str) or (
+                value not in values and len(values) >= limit
+            ):
+                values = None
+                break
+            if value not in values:
+                values[value] = len(values)
+
+        if not values:
+            continue
+
+        for row in rows:
+            value = row[index]
+            if value is not None:
+                row[index] = values[value]
+        dictionaries[name] = list(values)
+
+    return {"columns": names, "rows": rows, "dictionaries": dictionaries}
+
+
+def decode_columnar(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Rebuild records from `encode_columnar` output."""
+    names = data["columns"]
+    dictionaries = data.get("dictionaries", {})
+    lookups = [dictionaries.get(name) for name in names]
+
+    records = []
+    for row in data["rows"]:
+        record = {}
+        for name, lookup, value in zip(names, lookups, row):
+            if lookup is not None and value is not None:
+                value = lookup[value]
+            record[name] = value
+        records.append(record)
+
+    return records
+
+
+def check_list_format(format: Optional[str] = None):
+    """Raise ValueError for a list format that is not supported."""
+    if format not in (None, FORMAT_RECORDS, FORMAT_COLUMNAR):
+        raise ValueError(
+            f"Unknown list format '{format}'. "
+            f"Available: {FORMAT_RECORDS}, {FORMAT_COLUMNAR}"
+        )
+
+
+def apply_list_format(result: Dict, format: Optional[str] = None) -> Dict:
+    """Re-encode the `data.list` of a list tool result in the requested format.
+
+    Error results and results without a list are returned untouched.
+    """
+    check_list_format(format)
+    if format is None or format == FORMAT_RECORDS:
+        return result
+
+    data = result.get("data") if isinstance(result, dict) else None
+    if not isinstance(data, dict) or not isinstance(data.get("list"), list):
+        return result
+
+    encoded = {key: value for key, value in data.items() if key != "list"}
+    encoded.update(encode_columnar(data["list"]))
+    result["data"] = encoded
+    return result
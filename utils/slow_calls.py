@@ -0,0 +1,140 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+from core.utils.env import EnvConfig
+from app.utils.structured_log import log_event
+
+# Tool calls and API requests slower than this are logged with their phases
+ESPO_SLOW_CALL_MS = float(EnvConfig.get("ESPO_SLOW_CALL_MS") or 1000)
+
+# Phases in the order they happen, reported as `<phase>_ms`
+PHASES = (
+    "param_build",
+    "query_encode",
+    "connect",
+    "send",
+    "ttfb",
+    "download",
+    "decode",
+)
+
+
+class CallTimings:
+    """Phase durations, response sizes and retries of one call.
+
+    A tool call and each EspoCRM request it makes get their own timings; the
+    request timings add up into the tool call's through `parent`, so one slow
+    call record shows where the time of all its requests went.
+    """
+
+    def __init__(self, parent: Optional["CallTimings"] = None):
+        self.parent = parent
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.api_calls = 0
+        self.retries = 0
+        self.response_bytes = 0
+        # (seconds, method, endpoint, status) of the slowest request
+        self.slowest: Optional[tuple] = None
+
+    def add_phase(self, name: str, seconds: float):
+        timings = self
+        while timings is not None:
+            timings.phases[name] = timings.phases.get(name, 0.0) + seconds
+            timings = timings.parent
+
+    def add_request(
+        self, method: str, endpoint: str, status, seconds: float, size: int, retries
+    ):
+        timings = self
+        while timings is not None:
+            timings.api_calls += 1
+            timings.retries += retries
+            timings.response_bytes += size
+            if timings.slowest is None or seconds > timings.slowest[0]:
+                timings.slowest = (seconds, method, endpoint, status)
+            timings = timings.parent
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def fields(self) -> Dict:
+        fields = {"duration_ms": round(self.elapsed() * 1000, 1)}
+        for name in PHASES:
+            if name in self.phases:
+                fields[f"{name}_ms"] = round(self.phases[name] * 1000, 1)
+        fields.update(
+            api_calls=self.api_calls,
+            retries=self.retries,
+            response_bytes=self.response_bytes,
+        )
+        if self.slowest is not None:
+            seconds, method, endpoint, status = self.slowest
+            fields.update(
+                slowest_request=f"{method} {endpoint}",
+                slowest_status=status,
+                slowest_ms=round(seconds * 1000, 1),
+            )
+        return fields
+
+
+_current: ContextVar[Optional[CallTimings]] = ContextVar(
+    "espo_call_timings", default=None
+)
+
+
+@contextmanager
+def track_call():
+    """Collect the timings of the code in the block, nested in the current call."""
+    timings = CallTimings(_current.get())
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def phase(name: str):
+    """Add the duration of the block to the phase of the current call, if any."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add_phase(name, time.perf_counter() - started)
+
+
+def note_request(
+    method: str, endpoint: str, status, seconds: float, size: int, retries: int = 0
+):
+    timings = _current.get()
+    if timings is not None:
+        timings.add_request(method, endpoint, status, seconds, size, retries)
+
+
+def log_slow_call(kind: str, timings: CallTimings, **fields) -> bool:
+    """Log one `slow_call` record if the call took longer than the threshold.
+
+    Calls nested in another tracked call are reported by the outer one.
+    """
+    if timings.parent is not None:
+        return False
+
+    if timings.elapsed() * 1000 < ESPO_SLOW_CALL_MS:
+        return False
+
+    return log_event(
+        logging.WARNING,
+        "slow_call",
+        kind=kind,
+        threshold_ms=ESPO_SLOW_CALL_MS,
+        **fields,
+        **timings.fields(),
+    )
@@ -0,0 +1,126 @@
+import json
+import random
+from typing import Any, Dict
+from core.utils.env import EnvConfig
+from core.utils.logger import logger
+from app.utils.budget import encoded_size
+
+# Share of high-volume events (reads, tool results) that are logged
+ESPO_LOG_SAMPLE_RATE = float(EnvConfig.get("ESPO_LOG_SAMPLE_RATE") or 0.1)
+
+# Strings and collections above these sizes are logged as their size only
+MAX_FIELD_CHARS = 128
+MAX_FIELD_ITEMS = 32
+
+
+class StructuredMessage:
+    """Log message rendered as `event key=value ...` when a handler emits it.
+
+    The fields are also passed as `extra` (`record.event`, `record.fields`)
+    for handlers that format records as JSON.
+    """
+
+    __slots__ = ("event", "fields")
+
+    def __init__(self, event: str, fields: Dict[str, Any]):
+        self.event = event
+        self.fields = fields
+
+    def __str__(self):
+        pairs = [f"{key}={format_field(value)}" for key, value in self.fields.items()]
+        return " ".join([self.event] + pairs)
+
+
+def format_field(value) -> str:
+    if value is None or isinstance(value, (bool, int, float)):
+        return str(value)
+    if isinstance(value, str) and value and not any(
+        char.isspace() or char in '="' for char in value
+    ):
+        return value
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def is_api_result(value) -> bool:
+    return isinstance(value, dict) and "status_code" in value and "ok" in value
+
+
+def summarize_result(result: Dict) -> Dict:
+    """Return the status, row count and encoded size of a tool result."""
+    summary = {
+        "status_code": result.get("status_code"),
+        "ok": result.get("ok"),
+    }
+    if result.get("error_type"):
+        summary["error_type"] = result["error_type"]
+    if result.get("error"):
+        summary["error"] = summarize(str(result["error"]))
+
+    data = result.get("data")
+    if isinstance(data, dict):
+        rows = data.get("list", data.get("rows"))
+        if isinstance(rows, list):
+            summary["rows"] = len(rows)
+            if "total" in data:
+                summary["total"] = data["total"]
+
+    summary["bytes"] = encoded_size(data) if data is not None else 0
+    return summary
+
+
+def summarize(value, depth: int = 1):
+    """Return `value` if it is small, or a description of its size.
+
+    Dicts are summarized key by key down to `depth` levels, so the arguments
+    of a call keep their names and short values.
+    """
+    if is_api_result(value):
+        return summarize_result(value)
+
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+
+    if isinstance(value, str):
+        if len(value) <= MAX_FIELD_CHARS:
+            return value
+        return f"<{len(value)} chars>"
+
+    if isinstance(value, dict):
+        if depth > 0 and len(value) <= MAX_FIELD_ITEMS:
+            return {
+                key: summarize(item, depth - 1)
+                for key, item in value.items()
+                if item is not None
+            }
+        return f"<{len(value)} keys, {encoded_size(value)} bytes>"
+
+    if isinstance(value, (list, tuple, set)):
+        return f"<{len(value)} items, {encoded_size(list(value))} bytes>"
+
+    return summarize(str(value), 0)
+
+
+def log_event(level: int, event: str, sample_rate: float = 1.0, **fields) -> bool:
+    """Log a structured event, doing no work unless it is going to be emitted.
+
+    Field values are only summarized once the level is enabled and the event
+    survives sampling: a `sample_rate` below 1 keeps that share of events and
+    adds it to the fields, so counts can be scaled back. Returns whether the
+    event was logged.
+    """
+    if not logger.isEnabledFor(level):
+        return False
+
+    if sample_rate < 1:
+        if random.random() >= sample_rate:
+            return False
+        fields["sample_rate"] = sample_rate
+
+    summarized = {key: summarize(value) for key, value in fields.items()}
+    logger.log(
+        level,
+        "%s",
+        StructuredMessage(event, summarized),
+        extra={"event": event, "fields": summarized},
+    )
+    return True
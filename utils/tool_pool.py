@@ -0,0 +1,196 @@
+import asyncio
+import contextvars
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict
+from core.utils.env import EnvConfig
+from core.utils.logger import logger
+
+TOOL_POOL_WORKERS = int(EnvConfig.get("ESPO_TOOL_POOL_WORKERS") or 16)
+TOOL_POOL_MAX_QUEUE = int(EnvConfig.get("ESPO_TOOL_POOL_MAX_QUEUE") or 256)
+# Calls of one tenant running at the same time; the rest wait their turn so a
+# slow CRM cannot take every worker.
+TOOL_POOL_MAX_PER_TENANT = int(EnvConfig.get("ESPO_TOOL_POOL_MAX_PER_TENANT") or 4)
+
+
+class ToolPoolSaturatedError(Exception):
+    pass
+
+
+class ToolPool:
+    """Bounded thread pool for blocking tool work with per-tenant fairness.
+
+    Calls are queued per tenant and workers take them round-robin across
+    tenants, skipping tenants that already have `max_per_tenant` calls
+    running. At most `max_queue` calls wait; beyond that `submit` raises
+    `ToolPoolSaturatedError` instead of letting latency grow unbounded.
+    Worker threads are started on the first call.
+    """
+
+    def __init__(
+        self,
+        workers: int = TOOL_POOL_WORKERS,
+        max_queue: int = TOOL_POOL_MAX_QUEUE,
+        max_per_tenant: int = TOOL_POOL_MAX_PER_TENANT,
+    ):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.max_per_tenant = max_per_tenant
+        self._queues: "OrderedDict[str, deque]" = OrderedDict()
+        self._running: Dict[str, int] = {}
+        self._queued = 0
+        self._threads = []
+        self._local = threading.local()
+        self._condition = threading.Condition()
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "peak_queued": 0,
+            "wait_seconds_total": 0.0,
+        }
+
+    def submit(self, tenant: str, fn: Callable, *args, **kwargs) -> Future:
+        future = Future()
+        task = (future, fn, args, kwargs, time.monotonic())
+
+        with self._condition:
+            if self._queued >= self.max_queue:
+                self._stats["rejected"] += 1
+                raise ToolPoolSaturatedError(
+                    f"Tool pool saturated: {self._queued} calls waiting"
+                )
+
+            self._queues.setdefault(tenant, deque()).append(task)
+            self._queued += 1
+            self._stats["submitted"] += 1
+            self._stats["peak_queued"] = max(self._stats["peak_queued"], self._queued)
+
+            if len(self._threads) < self.workers:
+                self._start_worker()
+            self._condition.notify()
+
+        return future
+
+    def run(self, tenant: str, fn: Callable, *args, **kwargs) -> Any:
+        """Run `fn` in the pool with the caller's context and wait for it."""
+        if getattr(self._local, "in_worker", False):
+            # Already on a pool worker, waiting on another one could deadlock
+            return fn(*args, **kwargs)
+
+        context = contextvars.copy_context()
+        return self.submit(tenant, context.run, fn, *args, **kwargs).result()
+
+    async def run_async(self, tenant: str, fn: Callable, *args, **kwargs) -> Any:
+        """Run `fn` in the pool with the caller's context and await it.
+
+        The event loop is free while the call waits and runs. Cancelling the
+        awaiting task drops the call if no worker has taken it yet.
+        """
+        context = contextvars.copy_context()
+        future = self.submit(tenant, context.run, fn, *args, **kwargs)
+        return await asyncio.wrap_future(future)
+
+    def _start_worker(self):
+        thread = threading.Thread(
+            target=self._work, name=f"espo-tool-{len(self._threads)}", daemon=True
+        )
+        self._threads.append(thread)
+        thread.start()
+
+    def _next_task(self):
+        """Pop the next task round-robin across tenants under their limit."""
+        for tenant, queue in self._queues.items():
+            if self._running.get(tenant, 0) >= self.max_per_tenant:
+                continue
+
+            task = queue.popleft()
+            if queue:
+                self._queues.move_to_end(tenant)
+            else:
+                del self._queues[tenant]
+            self._queued -= 1
+            self._running[tenant] = self._running.get(tenant, 0) + 1
+            return tenant, task
+
+        return None, None
+
+    def _work(self):
+        self._local.in_worker = True
+
+        while True:
+            with self._condition:
+                tenant, task = self._next_task()
+                while task is None:
+                    self._condition.wait()
+                    tenant, task = self._next_task()
+
+            future, fn, args, kwargs, queued_at = task
+            wait = time.monotonic() - queued_at
+            running = future.set_running_or_notify_cancel()
+            result = error = None
+
+            if running:
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as e:
+                    error = e
+
+            with self._condition:
+                self._running[tenant] -= 1
+                if not self._running[tenant]:
+                    del self._running[tenant]
+                self._stats["completed" if error is None else "failed"] += 1
+                self._stats["wait_seconds_total"] += wait
+                # A slot of this tenant is free, its queued calls may be runnable
+                self._condition.notify()
+
+            # Settle the future last so the caller sees the updated stats
+            if not running:
+                continue
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of pool occupancy and counters."""
+        with self._condition:
+            busy = sum(self._running.values())
+            return {
+                "workers": self.workers,
+                "threads": len(self._threads),
+                "busy": busy,
+                "queued": self._queued,
+                "max_queue": self.max_queue,
+                "max_per_tenant": self.max_per_tenant,
+                "saturation": busy / self.workers if self.workers else 0.0,
+                "tenants_running": len(self._running),
+                "tenants_queued": len(self._queues),
+                **self._stats,
+            }
+
+
+tool_pool = ToolPool()
+
+
+async def run_in_tool_pool(tenant: str, fn: Callable, *args, **kwargs) -> Any:
+    """Run a blocking tool call in the shared pool without blocking the event loop.
+
+    Returns an `error_type: "busy"` result instead of raising when the pool
+    queue is full.
+    """
+    try:
+        return await tool_pool.run_async(tenant, fn, *args, **kwargs)
+    except ToolPoolSaturatedError as e:
+        logger.warning(f"{str(e)}, rejecting call for {tenant}")
+        return {
+            "status_code": None,
+            "ok": False,
+            "data": None,
+            "error": "Server is busy, retry later.",
+            "error_type": "busy",
+        }
@@ -0,0 +1,113 @@
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Optional
+from app.utils.slow_calls import phase
+
+try:
+    from opentelemetry import context as otel_context, propagate, trace
+except ImportError:  # OpenTelemetry is optional, spans are skipped without it
+    otel_context = propagate = trace = None
+
+TRACER_NAME = "easy-mcp-espocrm"
+REQUEST_ID_HEADER = "X-Request-Id"
+
+_tracer = None
+_memory_exporter = None
+
+
+def get_tracer():
+    global _tracer
+    if _tracer is None and trace is not None:
+        _tracer = trace.get_tracer(TRACER_NAME)
+    return _tracer
+
+
+@contextmanager
+def span(name: str, attributes: Optional[Dict] = None, context=None):
+    """Start a span as the current span, or do nothing without OpenTelemetry.
+
+    `context` sets the parent explicitly, for work that runs outside the
+    context of the request that caused it (MCP tools run in the session task).
+    """
+    tracer = get_tracer()
+    if tracer is None:
+        yield None
+        return
+
+    with tracer.start_as_current_span(
+        name, context=context, attributes=attributes
+    ) as current:
+        yield current
+
+
+def set_attributes(current, **attributes):
+    if current is not None:
+        current.set_attributes(
+            {key: value for key, value in attributes.items() if value is not None}
+        )
+
+
+def current_context():
+    return otel_context.get_current() if otel_context is not None else None
+
+
+def inject_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    """Add the trace context and a request id to outgoing EspoCRM headers.
+
+    The request id is the trace id, so a CRM access log line can be matched
+    with its trace. Without an active trace a random id is sent.
+    """
+    if trace is not None:
+        propagate.inject(headers)
+        span_context = trace.get_current_span().get_span_context()
+        if span_context.is_valid:
+            headers[REQUEST_ID_HEADER] = format(span_context.trace_id, "032x")
+            return headers
+
+    headers[REQUEST_ID_HEADER] = uuid.uuid4().hex
+    return headers
+
+
+def use_in_memory_exporter():
+    """Export spans to memory and return the exporter, for tests.
+
+    Requires opentelemetry-sdk. The tracer provider can only be set once per
+    process, so later calls return the same (cleared) exporter.
+    """
+    global _memory_exporter, _tracer
+
+    if _memory_exporter is None:
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+            InMemorySpanExporter,
+        )
+
+        _memory_exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(_memory_exporter))
+        trace.set_tracer_provider(provider)
+        _tracer = None
+
+    _memory_exporter.clear()
+    return _memory_exporter
+
+
+class TracedConnectionMixin:
+    """urllib3 connection with spans and slow-call phases for connect, send and wait."""
+
+    def connect(self):
+        attributes = {"net.peer.name": self.host, "net.peer.port": self.port}
+        with span("connect", attributes), phase("connect"):
+            return super().connect()
+
+    def request(self, *args, **kwargs):
+        # Plain HTTP connections connect lazily on send, keep the phases apart
+        if self.sock is None:
+            self.connect()
+        with span("send"), phase("send"):
+            return super().request(*args, **kwargs)
+
+    def getresponse(self, *args, **kwargs):
+        with span("wait"), phase("ttfb"):
+            return super().getresponse(*args, **kwargs)